@@ -0,0 +1,76 @@
+# clock_test.py
+# src/clock.py 보정 시계 검증: 드리프트가 있는 가상 단조 시계에 GPS/RTC 샘플을 넣고 추정값 확인 (하드웨어 불필요)
+#
+# 사용법:
+#   python3 clock_test.py            # 기본 +40 ppm 드리프트
+#   python3 clock_test.py -25        # 드리프트(ppm, 양수 = Pi 시계가 빠름) 지정
+import pathlib
+import random
+import sys
+import time as _time
+from datetime import datetime, timezone
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import clock  # noqa: E402
+
+DRIFT_PPM = float(sys.argv[1]) if len(sys.argv) > 1 else 40.0
+UTC0 = datetime(2026, 10, 17, 4, 45, 0, tzinfo=timezone.utc).timestamp()
+
+
+class FakeTime:
+    """time.monotonic()이 실제 UTC보다 DRIFT_PPM만큼 느리게/빠르게 가는 가상 시계"""
+
+    def __init__(self):
+        self.mono = 1000.0
+
+    def monotonic(self):
+        return self.mono
+
+    def time(self):
+        return UTC0  # 시스템 시계는 틀린 값에 멈춰 있다고 가정
+
+    def true_utc(self):
+        return UTC0 + (self.mono - 1000.0) / (1 + DRIFT_PPM * 1e-6)
+
+
+fake = FakeTime()
+clock.time = fake  # ClockService 내부의 time 모듈만 교체
+rtc_value = [None]
+service = clock.ClockService(rtc_reader=lambda: rtc_value[0])
+random.seed(1)
+
+# 1) 시작 직후: GPS 없음 → RTC (1초 분해능)로 보정
+rtc_value[0] = datetime.fromtimestamp(int(fake.true_utc()), timezone.utc)
+service.maintain()
+print(
+    f"RTC 보정 후: source={service.source}, 오차 추정 ±{service.error_estimate():.2f}초, "
+    f"실제 오차 {service.time() - fake.true_utc():+.2f}초"
+)
+
+# 2) 6시간 동안 GPS 시각 수신 (수신 지연 0~0.3초)
+for _ in range(6 * 3600):
+    fake.mono += 1.0
+    utc = datetime.fromtimestamp(fake.true_utc() - random.uniform(0, 0.3), timezone.utc)
+    service.add_gps(utc)
+status = service.status()
+print(
+    f"GPS 6시간 후: drift {status['drift_ppm']:+.2f} ppm (실제 {DRIFT_PPM:+.2f}), 오차 추정 "
+    f"±{status['error_estimate']:.3f}초, 실제 오차 {service.time() - fake.true_utc():+.3f}초"
+)
+assert abs(status["drift_ppm"] - DRIFT_PPM) < 2.0, "드리프트 추정 실패"
+
+# 3) GPS 끊김 12시간: 추정 드리프트로 외삽
+fake.mono += 12 * 3600
+error = service.time() - fake.true_utc()
+print(
+    f"GPS 12시간 끊김: 오차 추정 ±{service.error_estimate():.3f}초, 실제 오차 {error:+.3f}초"
+)
+assert abs(error) <= service.error_estimate(), "실제 오차가 추정 오차를 넘음"
+
+# 4) 핫패스 비용
+clock.time = _time
+start = _time.perf_counter()
+for _ in range(100_000):
+    service.time()
+print(f"now()/time() 호출 비용: {(_time.perf_counter() - start) * 10:.2f} µs")
+print("✓ clock 검증 통과")
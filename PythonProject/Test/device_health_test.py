@@ -0,0 +1,131 @@
+# device_health_test.py
+# src/device_health.py 검증: 연속 실패 시 차단(open) → 지수 백오프 재시도(half_open) → 복구(closed) 전환,
+# 차단 중에는 INA219 버스를 건드리지 않는지, 늦게 연결되거나 전원이 끊겼다 돌아온 INA219를 다시 설정(캘리브레이션)하는지
+# (가짜 시계/가짜 SMBus, 하드웨어 불필요)
+#
+# 사용법:
+#   python3 device_health_test.py
+import pathlib
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import device_health, i2c_bus, ina219  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+clock = FakeClock()
+
+# --- 상태 전환과 백오프 ---
+breaker = device_health.CircuitBreaker(
+    "test", failure_threshold=3, base_backoff=5, max_backoff=40, clock=clock
+)
+for _ in range(2):
+    breaker.failure("timeout")
+assert breaker.state == device_health.CLOSED, "임계값 전에는 차단하지 않음"
+breaker.failure("timeout")
+assert breaker.state == device_health.OPEN and not breaker.allow()
+backoffs = []
+for _ in range(5):
+    backoffs.append(round(breaker.retry_in()))
+    clock.now += breaker.retry_in()
+    assert breaker.allow() and breaker.state == device_health.HALF_OPEN
+    breaker.failure("timeout")  # 재시도 실패 → 백오프 2배
+print(f"재시도 간격: {backoffs} 초 (최대 {breaker.max_backoff:g}초)")
+assert backoffs == [5, 10, 20, 40, 40]
+clock.now += breaker.retry_in()
+assert breaker.allow()
+breaker.success()
+assert breaker.state == device_health.CLOSED and breaker.backoff == 5
+print(f"상태: {breaker.status()}")
+
+
+# --- INA219: 늦게 연결 / 전원 재인가 ---
+class FakeINA219:
+    """연결이 끊기면 OSError(121)를 내고, 전원이 다시 들어오면 캘리브레이션이 0으로 돌아가는 INA219"""
+
+    def __init__(self):
+        self.present = False
+        self.cal = 0
+        self.accesses = 0
+
+    def _check(self):
+        self.accesses += 1
+        if not self.present:
+            raise OSError(121, "Remote I/O error")
+
+    def power_cycle(self):
+        self.present = True
+        self.cal = 0
+
+    def read_word_data(self, address, reg):
+        self._check()
+        bus = int(6.0 / ina219.BUS_LSB_V)
+        current = (25000 * self.cal) // 4096  # 0.25 V 션트 전압 (10 µV LSB)
+        value = {
+            ina219.REG_BUS_VOLTAGE: (bus << 3) | ina219.BUS_CNVR,
+            ina219.REG_CURRENT: current & 0xFFFF,
+            ina219.REG_POWER: current * bus // 5000,
+        }.get(reg, 0)
+        return ((value & 0xFF) << 8) | (value >> 8)
+
+    def write_word_data(self, address, reg, value):
+        self._check()
+        if reg == ina219.REG_CALIBRATION:
+            self.cal = ((value & 0xFF) << 8) | (value >> 8)
+
+
+fake = FakeINA219()
+i2c_bus._buses[90] = i2c_bus.I2CBus(90, opener=lambda n: fake)
+health = device_health._breakers["ina219"] = device_health.CircuitBreaker(
+    "ina219", clock=clock
+)
+reader = ina219.INA219Reader((90,), burst=False)
+assert reader.mode is None
+
+# 차단 전까지만 버스 접근, 차단 후에는 읽기가 버스를 건드리지 않음
+for _ in range(5):
+    assert reader.read() == (None, None, None)
+assert health.state == device_health.OPEN
+before = fake.accesses
+start = time.perf_counter()
+for _ in range(1000):
+    reader.read()
+blocked_us = (time.perf_counter() - start) / 1000 * 1e6
+print(
+    f"\n미연결 INA219: 버스 접근 {before}회 후 차단, 차단 중 read() 1000회 버스 접근 "
+    f"{fake.accesses - before}회 ({blocked_us:.1f} µs/회)"
+)
+assert fake.accesses == before
+
+fake.power_cycle()  # 나중에 연결됨
+clock.now += health.retry_in()
+voltage, current, _ = reader.read()
+print(
+    f"연결 후 재시도: mode={reader.mode}, {voltage:.2f} V, {current:.3f} A, 상태 {health.state}"
+)
+assert (
+    reader.mode == "smbus"
+    and health.state == device_health.CLOSED
+    and abs(current - 2.5) < 0.01
+)
+
+fake.present = False  # 전원 끊김
+for _ in range(3):
+    reader.read()
+assert health.state == device_health.OPEN
+fake.power_cycle()  # 캘리브레이션이 지워진 채 복귀
+clock.now += health.retry_in()
+voltage, current, _ = reader.read()
+print(f"전원 재인가 후: cal={fake.cal}, {current:.3f} A (캘리브레이션 재설정)")
+assert fake.cal == reader.cal_value and abs(current - 2.5) < 0.01
+
+print(f"\n/health devices: {device_health.status()}")
+print("✓ 장치 상태 관리 검증 통과")
@@ -0,0 +1,117 @@
+# dht_service_test.py
+# src/dht_service.py 검증: 센서 객체를 한 번만 생성하는지, 실패 시 백오프 재시도, 캐시 값과 경과 시간(age) 제공,
+# 오래된 값 폐기, 비정상 오류 후 재생성 (가짜 DHT11, 시간 상수 축소, 하드웨어 불필요)
+#
+# 사용법:
+#   python3 dht_service_test.py
+import pathlib
+import random
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import dht_service  # noqa: E402
+
+# 실제 상수(초 단위)를 1/100로 줄여 빠르게 실행
+SCALE = 0.01
+dht_service.MIN_INTERVAL *= SCALE
+dht_service.RETRY_MIN *= SCALE
+dht_service.RETRY_MAX *= SCALE
+
+
+class FakeDHT11:
+    """adafruit_dht.DHT11처럼 가끔 RuntimeError(체크섬/타이밍)를 내는 센서"""
+
+    opened = 0
+
+    def __init__(self, fail_rate):
+        FakeDHT11.opened += 1
+        self.fail_rate = fail_rate
+        self.reads = 0
+        self.exited = False
+        self.broken = False
+
+    @property
+    def temperature(self):
+        self.reads += 1
+        if self.broken:
+            raise OSError("pulseio helper died")
+        if random.random() < self.fail_rate:
+            raise RuntimeError("Checksum did not validate. Try again.")
+        return 24.0 + random.uniform(-0.5, 0.5)
+
+    @property
+    def humidity(self):
+        return 55.0
+
+    def exit(self):
+        self.exited = True
+
+
+random.seed(1)
+devices = []
+
+
+def opener():
+    device = FakeDHT11(fail_rate=0.4)
+    devices.append(device)
+    return device
+
+
+service = dht_service.DHTService(opener, interval=10 * SCALE)
+for _ in range(40):
+    service.read_once()
+print(
+    f"40회 시도: 성공 {service.reads}회, 실패 {service.errors}회, 센서 생성 {FakeDHT11.opened}회"
+)
+assert FakeDHT11.opened == 1, "센서를 매번 새로 생성함"
+
+# 연속 실패 시 다음 시도 간격이 RETRY_MIN부터 두 배씩 늘어 RETRY_MAX에서 멈춰야 함
+devices[0].fail_rate = 1.0
+service.failures = 0
+backoff = [round(service.read_once() / SCALE, 3) for _ in range(8)]
+print("연속 실패 시 재시도 간격(초, 실제 단위):", [round(b, 1) for b in backoff])
+assert backoff[:5] == sorted(backoff[:5]) and backoff[0] == 2.0 and backoff[-1] == 60.0
+
+temperature, humidity, age = service.latest()
+print(
+    f"실패 중에도 캐시 값 제공: {temperature:.1f}°C {humidity:.0f}% (age {age * 1000:.1f} ms)"
+)
+assert temperature is not None
+assert service.latest(max_age=0.0)[0] is None, "max_age보다 오래된 값은 None이어야 함"
+
+# RuntimeError가 아닌 오류 → 장치를 닫고 다음 시도에서 새로 생성
+devices[0].broken = True
+service.read_once()
+assert devices[0].exited and service.device is None
+devices_before = FakeDHT11.opened
+service.read_once()
+print(f"비정상 오류 후 재생성: 생성 {devices_before}회 → {FakeDHT11.opened}회")
+assert FakeDHT11.opened == devices_before + 1
+
+# 스레드 동작: 간격에 맞춰 읽는지
+devices[-1].fail_rate = 0.3
+service.failures = 0
+service.start()
+time.sleep(2.0)
+service.close()
+status = service.status()
+reads_per_s = devices[-1].reads / 2.0
+print(
+    f"스레드 2초 실행: 센서 접근 {reads_per_s:.0f}회/s (간격 {service.interval * 1000:.0f} ms), 상태 "
+    f"{status}"
+)
+assert reads_per_s <= 1.5 / service.interval, "간격보다 자주 읽음"
+assert not service.running() and devices[-1].exited
+
+shared = dht_service.get_service("D99")
+assert dht_service.get_service("D99") is shared, "같은 핀은 서비스 하나를 공유해야 함"
+assert dht_service.get_service("D99", "DHT11", shared.interval) is shared
+for kind, interval in (("DHT22", None), ("DHT11", shared.interval + 5)):
+    try:
+        dht_service.get_service("D99", kind, interval)
+    except ValueError as exc:
+        print(f"같은 핀, 다른 설정 거부: {exc}")
+    else:
+        raise AssertionError("같은 핀을 다른 종류/주기로 요청하면 거부해야 함")
+print("✓ DHT 서비스 검증 통과")
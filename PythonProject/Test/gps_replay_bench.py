@@ -0,0 +1,231 @@
+# gps_replay_bench.py
+# GPS 수신 데이터를 pty로 재생하며 파서별 처리량(문장/s)과 Fix 지연 측정 (하드웨어 불필요, Linux)
+#
+# 사용법:
+#   python3 gps_replay_bench.py                      # 합성 NEO-6M NMEA/UBX 트레이스 사용
+#   python3 gps_replay_bench.py trace.gps [...]      # src.gps_trace record 로 녹화한 트레이스
+#   SPEED=20 python3 gps_replay_bench.py             # 지연 측정 재생 배속 (기본 10배)
+import bisect
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import reduce
+from operator import xor
+
+import serial
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import gps_trace, nmea, ubx  # noqa: E402
+
+try:
+    import pynmea2
+except ImportError:
+    pynmea2 = None
+
+SECONDS = 120  # 합성 트레이스 길이 (1 Hz epoch 수)
+SPEED = float(os.getenv("SPEED", "10"))
+START = datetime(2026, 10, 17, 4, 45, 0, tzinfo=timezone.utc)
+
+
+# --- 합성 트레이스 ---
+def sentence(body):
+    return b"$%s*%02X\r\n" % (body, reduce(xor, body, 0))
+
+
+def nmea_epoch(when):
+    t = when.strftime("%H%M%S.00").encode()
+    d = when.strftime("%d%m%y").encode()
+    return [
+        sentence(b"GPRMC,%s,A,3506.99520,N,12858.09216,E,0.046,,%s,,,A" % (t, d)),
+        sentence(b"GPVTG,,T,,M,0.046,N,0.085,K,A"),
+        sentence(b"GPGGA,%s,3506.99520,N,12858.09216,E,1,08,1.02,21.3,M,26.4,M,," % t),
+        sentence(b"GPGSA,A,3,10,07,05,02,29,04,08,13,,,,,1.72,1.02,1.38"),
+        sentence(b"GPGSV,3,1,11,02,45,055,31,04,13,310,26,05,70,185,33,07,22,112,28"),
+        sentence(b"GPGSV,3,2,11,08,34,273,30,10,61,022,35,13,18,040,24,16,05,160,"),
+        sentence(b"GPGSV,3,3,11,26,02,210,,29,40,300,32,30,09,080,"),
+        sentence(b"GPGLL,3506.99520,N,12858.09216,E,%s,A,A" % t),
+    ]
+
+
+def ubx_epoch(when):
+    gps_week_start = datetime(2026, 10, 11, tzinfo=timezone.utc)  # 일요일 00:00
+    itow = int((when - gps_week_start).total_seconds() * 1000) + 18000  # GPS-UTC 18초
+    sol = (
+        struct.pack("<IihBB", itow, 0, 2388, 3, 0x0D)
+        + bytes(35)
+        + bytes([8])
+        + bytes(4)
+    )
+    tu = struct.pack(
+        "<IIiHBBBBBB",
+        itow,
+        25,
+        0,
+        when.year,
+        when.month,
+        when.day,
+        when.hour,
+        when.minute,
+        when.second,
+        0x07,
+    )
+    pos = struct.pack("<IiiiiII", itow, 1289682026, 351165866, 47700, 21300, 2500, 3500)
+    return [
+        ubx.frame(ubx.CLS_NAV, ubx.ID_NAV_SOL, sol),
+        ubx.frame(ubx.CLS_NAV, ubx.ID_NAV_TIMEUTC, tu),
+        ubx.frame(ubx.CLS_NAV, ubx.ID_NAV_POSLLH, pos),
+    ]
+
+
+def is_ubx_trace(path):
+    head = b"".join(
+        data for _, data in zip(range(50), (d for _, d in gps_trace.read_trace(path)))
+    )
+    return b"\xb5\x62\x01" in head and b"$GP" not in head
+
+
+# --- 파서 ---
+class CountingPort:
+    """읽은 바이트 수를 세는 시리얼 래퍼 (Fix 지연 계산용)"""
+
+    def __init__(self, port):
+        self.port = port
+        self.consumed = 0
+
+    @property
+    def in_waiting(self):
+        return self.port.in_waiting
+
+    def readline(self):
+        line = self.port.readline()
+        self.consumed += len(line)
+        return line
+
+    def readinto(self, buffer):
+        n = self.port.readinto(buffer) or 0
+        self.consumed += n
+        return n
+
+
+def run_nmea(port, fixes):
+    line = port.readline()
+    if not line:
+        return 0
+    fix = nmea.parse(line, ("RMC", "GGA"))
+    if fix is not None and fix.valid and fix.kind in ("RMC", "GGA"):
+        fixes.append((port.consumed, time.monotonic()))
+    return 1
+
+
+def run_pynmea2(port, fixes):
+    line = port.readline()
+    if not line:
+        return 0
+    text = line.decode("ascii", errors="replace").strip()
+    if text[3:6] in ("RMC", "GGA"):
+        try:
+            msg = pynmea2.parse(text, check=True)
+            if getattr(msg, "status", "A") == "A" and msg.latitude:
+                fixes.append((port.consumed, time.monotonic()))
+        except pynmea2.ParseError:
+            pass
+    return 1
+
+
+def make_run_ubx():
+    stream = ubx.UBXStream()
+
+    def run_ubx(port, fixes):
+        before = stream.frames
+        for fix in stream.read(port):
+            if fix.valid:
+                fixes.append((port.consumed, time.monotonic()))
+        return stream.frames - before
+
+    return run_ubx
+
+
+# --- 재생 + 측정 ---
+def measure(path, run, speed):
+    master, name = gps_trace.open_pty()
+    port = CountingPort(serial.Serial(name, 9600, timeout=0.2))
+    sent_bytes, sent_times, fixes = [], [], []
+    done = threading.Event()
+
+    def on_write(total, when):
+        sent_bytes.append(total)
+        sent_times.append(when)
+
+    def writer():
+        gps_trace.replay(path, master, speed, on_write=on_write)
+        done.set()
+
+    thread = threading.Thread(target=writer, daemon=True)
+    start = time.monotonic()
+    thread.start()
+    messages = 0
+    idle = 0
+    last = start
+    while idle < 3:
+        count = run(port, fixes)
+        if count:
+            messages += count
+            last = time.monotonic()
+        # 재생이 끝났고 더 읽을 게 없으면 종료 (마지막 메시지 이후 대기 시간은 제외)
+        idle = idle + 1 if (count == 0 and done.is_set() and not port.in_waiting) else 0
+    elapsed = last - start
+    port.port.close()
+    os.close(master)
+
+    latencies = []
+    for consumed, when in fixes:
+        i = bisect.bisect_left(sent_bytes, consumed)
+        if i < len(sent_times):
+            latencies.append((when - sent_times[i]) * 1000)
+    latencies.sort()
+    return messages, len(fixes), elapsed, latencies
+
+
+def report(path, parsers):
+    chunks, size, duration = gps_trace.trace_stats(path)
+    print(
+        f"\n트레이스: {os.path.basename(path)}  ({chunks} 청크, {size} 바이트, {duration:.0f}초)"
+    )
+    for name, factory in parsers:
+        messages, count, elapsed, _ = measure(path, factory(), 0)
+        _, _, _, lat = measure(path, factory(), SPEED)
+        p50 = lat[len(lat) // 2] if lat else float("nan")
+        p95 = lat[int(len(lat) * 0.95)] if lat else float("nan")
+        print(
+            f"  {name:8s}: {messages / elapsed:9.0f} 메시지/s (최대 속도, Fix {count})"
+            f"  | x{SPEED:g} 재생 Fix 지연 p50 {p50:6.2f} ms, p95 {p95:6.2f} ms"
+        )
+
+
+NMEA_PARSERS = [("src.nmea", lambda: run_nmea)] + (
+    [("pynmea2", lambda: run_pynmea2)] if pynmea2 else []
+)
+UBX_PARSERS = [("src.ubx", make_run_ubx)]
+
+if len(sys.argv) > 1:
+    for trace in sys.argv[1:]:
+        report(trace, UBX_PARSERS if is_ubx_trace(trace) else NMEA_PARSERS)
+else:
+    with tempfile.TemporaryDirectory() as tmp:
+        epochs = [START + timedelta(seconds=i) for i in range(SECONDS)]
+        nmea_trace = os.path.join(tmp, "neo6m_nmea.gps")
+        ubx_trace = os.path.join(tmp, "neo6m_ubx.gps")
+        gps_trace.synthesize(nmea_trace, (nmea_epoch(t) for t in epochs))
+        gps_trace.synthesize(ubx_trace, (ubx_epoch(t) for t in epochs))
+        print("합성 NEO-6M 트레이스 (9600 baud, 1 Hz)")
+        report(nmea_trace, NMEA_PARSERS)
+        report(ubx_trace, UBX_PARSERS)
+    print(
+        "\n※ NMEA 최대 속도는 pyserial readline()이 좌우 (파싱은 문장당 수 µs)"
+        " → 파서 간 차이는 실행마다 뒤바뀌는 잡음 수준"
+    )
@@ -0,0 +1,99 @@
+# hardware_config_test.py
+# src/hardware_config.py 검증: 저장소 루트 src/(Motor_GPS)와 PythonProject/src/(solar_tracker)가
+# 같은 config.json(기본 PythonProject/config/config.json, 또는 HARDWARE_CONFIG)을 읽는지,
+# tracking.correction_threshold와 TRACK_CORRECTION_THRESHOLD 덮어쓰기가
+# 두 트리에서 같게 동작하는지 (하드웨어 불필요)
+#
+# 사용법:
+#   python3 hardware_config_test.py
+import json
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+
+PROJECT = pathlib.Path(__file__).resolve().parent.parent  # PythonProject/
+ROOT_SRC = PROJECT.parent / "src"
+
+# 각 트리에서 실제 추적 모듈을 불러 설정값을 출력 (별도 프로세스: 설정은 프로세스당 한 번 읽음)
+TREES = {
+    "src/Motor_GPS": (ROOT_SRC, "import Motor_GPS as m"),
+    "PythonProject/src/solar_tracker": (PROJECT, "from src import solar_tracker as m"),
+}
+PROBE = "; print(m.hardware_config.HARDWARE_CONFIG); print(m.CORRECTION_THRESHOLD)"
+
+
+def probe(tree, config=None, override=None):
+    cwd, statement = TREES[tree]
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if k not in ("HARDWARE_CONFIG", "TRACK_CORRECTION_THRESHOLD")
+    }
+    env["USE_SENSOR_MOCK"] = "1"
+    if config is not None:
+        env["HARDWARE_CONFIG"] = str(config)
+    if override is not None:
+        env["TRACK_CORRECTION_THRESHOLD"] = str(override)
+    out = subprocess.run(
+        [sys.executable, "-c", statement + PROBE],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert out.returncode == 0, out.stderr
+    path, threshold = out.stdout.strip().splitlines()[-2:]
+    return path, float(threshold)
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    tmp = pathlib.Path(tmp)
+    example = json.loads(
+        (PROJECT / "config" / "config.example.json").read_text(encoding="utf-8")
+    )
+    example.setdefault("tracking", {})["correction_threshold"] = 2.5
+    config = tmp / "config.json"
+    config.write_text(json.dumps(example), encoding="utf-8")
+
+    # 1) HARDWARE_CONFIG로 지정한 실제 설정 파일을 두 트리 모두 읽음
+    for tree in TREES:
+        path, threshold = probe(tree, config)
+        print(f"{tree}: {path} → correction_threshold {threshold}")
+        assert path == str(config) and threshold == 2.5
+
+    # 2) 환경 변수가 설정 파일보다 우선
+    for tree in TREES:
+        assert probe(tree, config, override=7)[1] == 7.0
+    print("TRACK_CORRECTION_THRESHOLD=7 → 두 트리 모두 7.0")
+
+    # 3) HARDWARE_CONFIG 없이: 두 트리의 기본 경로가 같은 파일 (PythonProject/config/config.json)
+    layout = tmp / "repo"
+    for tree_src in ("src", "PythonProject/src"):
+        (layout / tree_src).mkdir(parents=True)
+        shutil.copy(
+            ROOT_SRC / "hardware_config.py", layout / tree_src / "hardware_config.py"
+        )
+    (layout / "PythonProject" / "config").mkdir()
+    shutil.copy(config, layout / "PythonProject" / "config" / "config.json")
+    statement = (
+        "import hardware_config as h; print(h.HARDWARE_CONFIG); "
+        "print(h.setting('tracking.correction_threshold'))"
+    )
+    env = {k: v for k, v in os.environ.items() if k != "HARDWARE_CONFIG"}
+    for tree_src in ("src", "PythonProject/src"):
+        out = subprocess.run(
+            [sys.executable, "-c", statement],
+            cwd=layout / tree_src,
+            env=env,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        shown = pathlib.Path(out[0]).relative_to(layout)
+        print(f"기본 경로 ({tree_src}): {shown} → {out[1]}")
+        assert out == [str(layout / "PythonProject" / "config" / "config.json"), "2.5"]
+
+print("✓ 하드웨어 설정 검증 통과")
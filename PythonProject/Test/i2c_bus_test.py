@@ -0,0 +1,96 @@
+# i2c_bus_test.py
+# src/i2c_bus.py 공유 버스 검증: 느린 RTC/진단 읽기가 몰려도 INA219(우선순위 CRITICAL) 대기 시간이 짧은지 확인
+#
+# 사용법:
+#   python3 i2c_bus_test.py            # 가짜 SMBus (비트뱅 버스 3 지연 모사, 하드웨어 불필요)
+#   python3 i2c_bus_test.py 1          # 실제 /dev/i2c-1 에서 DS3231(0x68) 읽기 지연 측정
+import pathlib
+import sys
+import threading
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import i2c_bus  # noqa: E402
+
+WORD_DELAY = 0.0004  # 비트뱅 I2C 16비트 레지스터 읽기 (~100 kHz 미만)
+BLOCK_DELAY = 0.003  # DS3231 7바이트 블록 읽기
+DURATION = 2.0
+
+
+class FakeSMBus:
+    opened = 0
+
+    def __init__(self, bus_num):
+        FakeSMBus.opened += 1
+
+    def read_word_data(self, address, register):
+        time.sleep(WORD_DELAY)
+        return 0x1234
+
+    def write_word_data(self, address, register, value):
+        time.sleep(WORD_DELAY)
+
+    def read_i2c_block_data(self, address, register, length):
+        time.sleep(BLOCK_DELAY)
+        return [0] * length
+
+    def close(self):
+        pass
+
+
+def run(priority_critical, background_threads=4):
+    bus = i2c_bus.I2CBus(3, opener=FakeSMBus)
+    stop = threading.Event()
+
+    def background():
+        while not stop.is_set():
+            bus.read_block("ds3231", 0x68, 0x00, 7, i2c_bus.PRIORITY_BACKGROUND)
+
+    threads = [
+        threading.Thread(target=background, daemon=True)
+        for _ in range(background_threads)
+    ]
+    for thread in threads:
+        thread.start()
+    priority = (
+        i2c_bus.PRIORITY_CRITICAL if priority_critical else i2c_bus.PRIORITY_BACKGROUND
+    )
+    end = time.monotonic() + DURATION
+    while time.monotonic() < end:
+        bus.read_word("ina219", 0x40, 0x02, priority)
+        time.sleep(0.01)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return bus.stats()
+
+
+if len(sys.argv) > 1:
+    bus = i2c_bus.get_bus(int(sys.argv[1]))
+    for _ in range(100):
+        bus.read_block("ds3231", 0x68, 0x00, 7)
+    print(i2c_bus.stats())
+    sys.exit(0)
+
+for critical in (False, True):
+    stats = run(critical)
+    ina, rtc = stats["ina219"], stats["ds3231"]
+    label = "CRITICAL" if critical else "BACKGROUND(FIFO와 동일)"
+    print(
+        f"INA219 우선순위 {label:24s}: 대기 평균 {ina['mean_wait_ms']:6.3f} ms, 최대 "
+        f"{ina['max_wait_ms']:6.3f} ms  | RTC {rtc['count']}회, 평균 {rtc['mean_ms']:.2f} "
+        "ms"
+    )
+    if critical:
+        # 진행 중인 트랜잭션 하나만 기다려야 함 (최대값은 GIL 전환 지연 포함)
+        assert (
+            ina["mean_wait_ms"] < BLOCK_DELAY * 1000 * 1.5
+        ), "우선순위 읽기가 대기열 뒤에서 기다림"
+
+# 핸들은 버스당 한 번만 열림
+FakeSMBus.opened = 0
+bus = i2c_bus.I2CBus(1, opener=FakeSMBus)
+for _ in range(50):
+    bus.read_block("ds3231", 0x68, 0x00, 7)
+assert FakeSMBus.opened == 1
+print("✓ i2c_bus 검증 통과 (버스 핸들 1회 오픈)")
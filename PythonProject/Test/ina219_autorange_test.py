@@ -0,0 +1,120 @@
+# ina219_autorange_test.py
+# src/ina219.py 자동 범위(PGA/캘리브레이션) 검증: 새벽 mA ~ 정오 수백 mA 전류에서 고정 범위(/8, cal 4096)와 오차 비교,
+# 경계 부근 잡음에서 범위가 떨지 않는지(히스테리시스) 확인 (가짜 SMBus, 하드웨어 불필요)
+#
+# 사용법:
+#   python3 ina219_autorange_test.py
+import pathlib
+import random
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import i2c_bus, ina219  # noqa: E402
+
+SHUNT_OHMS = 0.1
+BUS_V = 6.2
+
+
+class FakeINA219:
+    """PGA마다 12비트 ADC 분해능(전체 범위/4096)이 달라지는 INA219 모델"""
+
+    def __init__(self):
+        self.config = 0x399F
+        self.cal = 0
+        self.true_current = 0.0
+        self.pointer = 0
+
+    def _registers(self):
+        pga = (self.config >> ina219.PGA_SHIFT) & 0x3
+        full_scale = ina219.SHUNT_RANGES[pga]
+        shunt = self.true_current * SHUNT_OHMS + random.gauss(0, 4e-6)
+        overflow = abs(shunt) > full_scale
+        step = full_scale / 4096  # 12비트 ADC 한 단계
+        shunt_q = round(shunt / step) * step
+        shunt_reg = int(shunt_q / 10e-6)  # 10 µV LSB
+        current = (shunt_reg * self.cal) // 4096
+        bus = int(BUS_V / ina219.BUS_LSB_V)
+        power = abs(current) * bus // 5000
+        bus_reg = (bus << 3) | ina219.BUS_CNVR | (ina219.BUS_OVF if overflow else 0)
+        return {
+            ina219.REG_BUS_VOLTAGE: bus_reg,
+            ina219.REG_CURRENT: current & 0xFFFF,
+            ina219.REG_POWER: power,
+        }
+
+    def read_word_data(self, address, reg):
+        value = self._registers().get(reg, 0)
+        return ((value & 0xFF) << 8) | (value >> 8)
+
+    def write_word_data(self, address, reg, value):
+        value = ((value & 0xFF) << 8) | (value >> 8)
+        if reg == ina219.REG_CONFIG:
+            self.config = value
+        elif reg == ina219.REG_CALIBRATION:
+            self.cal = value
+
+    def i2c_rdwr(self, *messages):
+        registers = self._registers()
+        for msg in messages:
+            if msg.flags & 1:
+                value = registers.get(self.pointer, 0)
+                msg.buf[0] = bytes([value >> 8])
+                msg.buf[1] = bytes([value & 0xFF])
+            else:
+                self.pointer = list(msg)[0]
+
+    def close(self):
+        pass
+
+
+def make_reader(bus_num, autorange):
+    fake = FakeINA219()
+    i2c_bus._buses[bus_num] = i2c_bus.I2CBus(bus_num, opener=lambda n: fake)
+    reader = ina219.INA219Reader(
+        (bus_num,), calibration=4096, shunt_ohms=SHUNT_OHMS, autorange=autorange
+    )
+    reader.conversion_time = 0  # 가짜 칩은 읽을 때마다 새 변환
+    return fake, reader
+
+
+random.seed(3)
+fixed_fake, fixed = make_reader(90, autorange=False)
+auto_fake, auto = make_reader(91, autorange=True)
+
+print(
+    f"{'실제 전류':>10s} | {'고정 /8 오차':>12s} | {'자동 범위 오차':>14s} (PGA, LSB)"
+)
+for true_ma in (2.0, 5.0, 12.0, 35.0, 80.0, 150.0, 400.0, 900.0, 150.0, 12.0, 2.0):
+    errors = {}
+    for fake, reader, name in ((fixed_fake, fixed, "fixed"), (auto_fake, auto, "auto")):
+        fake.true_current = true_ma / 1000
+        samples = []
+        for _ in range(20):  # 범위 전환이 자리잡을 시간 포함
+            reading = reader.read()
+            if reading[1] is not None:
+                samples.append(reading[1])
+        last = samples[-10:]
+        errors[name] = sum(abs(x * 1000 - true_ma) for x in last) / len(last)
+    info = auto.range_info
+    print(
+        f"{true_ma:8.1f}mA | {errors['fixed']:10.3f}mA | {errors['auto']:12.3f}mA "
+        f"(/{info['pga']}, {info['current_lsb_ua']:.1f} µA)"
+    )
+
+# 히스테리시스: /1 범위 상한(0.9 × 40 mV = 360 mA) 부근 잡음 → 한 번 올라간 뒤 160 mA 아래로 내려가기 전까지 유지
+auto_fake.true_current = 0.15
+for _ in range(10):
+    auto.read()
+switches = auto.range_switches
+for _ in range(500):
+    auto_fake.true_current = 0.36 + random.gauss(0, 0.01)
+    auto.read()
+print(
+    f"\n경계(360 mA ± 10 mA) 잡음 500회 읽기 동안 범위 전환 {auto.range_switches - switches}회 (현재 "
+    f"/{auto.range_info['pga']})"
+)
+assert auto.range_switches - switches <= 4, "범위가 경계에서 떨림"
+
+reading = auto.read()
+print(f"측정값에 포함된 범위 정보: {reading.range}, overflow={reading.overflow}")
+print("✓ INA219 자동 범위 검증 통과")
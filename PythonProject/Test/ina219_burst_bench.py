@@ -0,0 +1,128 @@
+# ina219_burst_bench.py
+# src/ina219.py 버스트 읽기(1 트랜잭션) vs 레지스터별 읽기(3 트랜잭션) 비교: 초당 읽기 수, 서로 다른 변환이 섞인 읽기 비율
+# 가짜 SMBus가 INA219 변환 주기(CNVR/전력 레지스터 규칙, ADC 평균 설정)와 I2C 전송 시간을 흉내냄 (하드웨어 불필요)
+#
+# 사용법:
+#   python3 ina219_burst_bench.py
+import pathlib
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import i2c_bus, ina219  # noqa: E402
+
+DURATION = 1.5
+PROFILES = [
+    # (이름, ioctl 오버헤드 s, 바이트당 전송 시간 s, ADC 평균 샘플 수: None = 칩 기본 12비트 532 µs)
+    ("Python 오버헤드만", 0.0, 0.0, None),
+    ("하드웨어 I2C 400kHz", 0.00005, 0.0000225, None),
+    ("비트뱅 i2c-gpio 버스3, 기본 변환", 0.00006, 0.00018, None),
+    ("비트뱅 i2c-gpio 버스3, 8회 평균", 0.00006, 0.00018, 8),
+]
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class FakeINA219Bus:
+    """변환마다 (전압, 전류, 전력)이 바뀌는 INA219 + 전송 시간 모델"""
+
+    def __init__(self, ioctl_s, byte_s):
+        self.ioctl_s = ioctl_s
+        self.byte_s = byte_s
+        self.t0 = time.perf_counter()
+        self.conversion_s = ina219.ADC_AVERAGING[1][1]
+        self.read_conversion = -1  # 전력 레지스터를 마지막으로 읽은 시점의 변환 번호
+        self.pointer = 0
+        self.log = []  # 읽기마다 사용된 변환 번호
+
+    def _conversion(self):
+        return int((time.perf_counter() - self.t0) / self.conversion_s)
+
+    def _register(self, reg):
+        k = self._conversion()
+        current = 1000 + (k * 37) % 900  # 전류 레지스터 값 (변환마다 다름)
+        bus = 1500 + (k * 13) % 300  # 4mV 단위 → 6.0~7.2 V
+        self.log.append(k)
+        if reg == ina219.REG_BUS_VOLTAGE:
+            cnvr = ina219.BUS_CNVR if k > self.read_conversion else 0
+            return (bus << 3) | cnvr
+        if reg == ina219.REG_CURRENT:
+            return current
+        if reg == ina219.REG_POWER:
+            self.read_conversion = k
+            return current * bus // 5000
+        return 0
+
+    # smbus2 SMBus 인터페이스
+    def read_word_data(self, address, reg):
+        spin(self.ioctl_s + 5 * self.byte_s)
+        value = self._register(reg)
+        return ((value & 0xFF) << 8) | (value >> 8)  # SMBus는 little-endian
+
+    def write_word_data(self, address, reg, value):
+        spin(self.ioctl_s + 4 * self.byte_s)
+        if reg == ina219.REG_CONFIG:
+            config = ((value & 0xFF) << 8) | (value >> 8)
+            badc = (config >> 7) & 0xF
+            times = {code: t for code, t in ina219.ADC_AVERAGING.values()}
+            self.conversion_s = 2 * times[badc]  # 전류(션트) + 버스 전압 변환
+
+    def i2c_rdwr(self, *messages):
+        spin(self.ioctl_s)
+        for msg in messages:
+            if msg.flags & 1:  # I2C_M_RD
+                spin((1 + msg.len) * self.byte_s)
+                value = self._register(self.pointer)
+                msg.buf[0] = bytes([value >> 8])
+                msg.buf[1] = bytes([value & 0xFF])
+            else:
+                spin(2 * self.byte_s)
+                self.pointer = list(msg)[0]
+
+    def close(self):
+        pass
+
+
+def bench(profile, burst):
+    name, ioctl_s, byte_s, samples = profile
+    fake = FakeINA219Bus(ioctl_s, byte_s)
+    i2c_bus._buses[99] = i2c_bus.I2CBus(99, opener=lambda n: fake)
+    reader = ina219.INA219Reader((99,), burst=burst, samples=samples)
+    count = mixed = fresh = 0
+    end = time.perf_counter() + DURATION
+    while time.perf_counter() < end:
+        fake.log.clear()
+        voltage, current, power = reader.read()
+        if voltage is None:
+            continue
+        count += 1
+        fresh += reader.fresh
+        if not burst and len(set(fake.log)) > 1:
+            mixed += 1
+    del i2c_bus._buses[99]
+    return count / DURATION, fresh / DURATION, mixed / max(count, 1), reader
+
+
+for profile in PROFILES:
+    legacy_rate, _, mixed, _ = bench(profile, burst=False)
+    burst_rate, fresh_rate, _, reader = bench(profile, burst=True)
+    print(f"[{profile[0]}]")
+    coherent = legacy_rate * (1 - mixed)
+    print(
+        f"  레지스터별 3회 : 호출 {legacy_rate:7.0f}/s, 한 변환으로 일관된 값 {coherent:7.0f}/s "
+        f"({mixed * 100:5.1f}% 섞임)"
+    )
+    print(
+        f"  버스트         : 호출 {burst_rate:7.0f}/s, 새로운 일관된 변환 {fresh_rate:7.0f}/s "
+        f"(CNVR 없음 {reader.stale}회, 변환 경계 재시도 {reader.incoherent}회)"
+    )
+print(
+    "\n※ INA219는 레지스터 자동 증가가 없어 버스트도 전송 바이트 수는 같음 → 이득은 ioctl/잠금 횟수와 일관성"
+)
+print(
+    "※ 버스트 한 번이 변환 주기보다 길면(비트뱅 + 기본 532 µs) 일관된 값을 얻을 수 없음 → samples(ADC 평균)로 주기를 늘릴 것"
+)
@@ -0,0 +1,179 @@
+# ina219_oversample_test.py
+# src/ina219.py 오버샘플링(중앙값/MAD 이상치 제거) 검증: 잡음 + 가끔 튀는 값(글리치) + I2C 오류가 섞인 INA219에서
+# 1회 읽기와 oversample() 오차 비교, 읽기 1회당 비용(벽시계 시간, 버스 점유 시간,
+# 요약 계산 시간) 측정 (가짜 SMBus, 하드웨어 불필요)
+#
+# 사용법:
+#   python3 ina219_oversample_test.py
+import pathlib
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import i2c_bus, ina219  # noqa: E402
+
+TRUE_CURRENT = 0.250  # A
+BUS_V = 6.2
+NOISE_A = 0.004  # 변환마다 전류 잡음(σ)
+GLITCH_RATE = 0.03  # 변환 중 튀는 값 비율
+ERROR_RATE = 0.03  # I2C 전송 실패 비율
+PROFILES = [
+    # (이름, ioctl 오버헤드 s, 바이트당 전송 시간 s)
+    ("하드웨어 I2C 400kHz (버스 1)", 0.00005, 0.0000225),
+    ("비트뱅 i2c-gpio (버스 3)", 0.00006, 0.00018),
+]
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class NoisyINA219:
+    """실제 시간으로 변환이 끝나는 INA219: 잡음, 글리치, 전송 오류 포함"""
+
+    def __init__(self, ioctl_s, byte_s):
+        self.ioctl_s = ioctl_s
+        self.byte_s = byte_s
+        self.t0 = time.perf_counter()
+        self.conversion_s = 2 * ina219.ADC_AVERAGING[1][1]
+        self.cal = 4096
+        self.read_conversion = -1
+        self.pointer = 0
+        self.values = {}
+
+    def _conversion(self):
+        k = int((time.perf_counter() - self.t0) / self.conversion_s)
+        if k not in self.values:
+            current = TRUE_CURRENT + random.gauss(0, NOISE_A)
+            if random.random() < GLITCH_RATE:
+                current += random.choice((-1, 1)) * random.uniform(0.2, 1.0)
+            self.values = {k: current}
+        return k, self.values[k]
+
+    def _register(self, reg):
+        k, current = self._conversion()
+        lsb = 0.04096 / (self.cal * 0.1)
+        current_reg = int(round(current / lsb))
+        bus = int(BUS_V / ina219.BUS_LSB_V)
+        if reg == ina219.REG_BUS_VOLTAGE:
+            return (bus << 3) | (ina219.BUS_CNVR if k > self.read_conversion else 0)
+        if reg == ina219.REG_CURRENT:
+            return current_reg & 0xFFFF
+        if reg == ina219.REG_POWER:
+            self.read_conversion = k
+            return abs(current_reg) * bus // 5000
+        return 0
+
+    def _fail(self):
+        if random.random() < ERROR_RATE:
+            raise OSError(121, "Remote I/O error")
+
+    def read_word_data(self, address, reg):
+        spin(self.ioctl_s + 5 * self.byte_s)
+        self._fail()
+        value = self._register(reg)
+        return ((value & 0xFF) << 8) | (value >> 8)
+
+    def write_word_data(self, address, reg, value):
+        spin(self.ioctl_s + 4 * self.byte_s)
+        value = ((value & 0xFF) << 8) | (value >> 8)
+        if reg == ina219.REG_CONFIG:
+            times = {code: t for code, t in ina219.ADC_AVERAGING.values()}
+            self.conversion_s = 2 * times[(value >> 7) & 0xF]
+        elif reg == ina219.REG_CALIBRATION:
+            self.cal = value
+
+    def i2c_rdwr(self, *messages):
+        spin(self.ioctl_s)
+        self._fail()
+        for msg in messages:
+            if msg.flags & 1:
+                spin((1 + msg.len) * self.byte_s)
+                value = self._register(self.pointer)
+                msg.buf[0] = bytes([value >> 8])
+                msg.buf[1] = bytes([value & 0xFF])
+            else:
+                spin(2 * self.byte_s)
+                self.pointer = list(msg)[0]
+
+    def close(self):
+        pass
+
+
+def error_stats(values):
+    errors = [abs(v - TRUE_CURRENT) * 1000 for v in values if v is not None]
+    return statistics.mean(errors), max(errors), len(values) - len(errors)
+
+
+random.seed(7)
+for bus_num, (name, ioctl_s, byte_s) in enumerate(PROFILES, start=80):
+    fake = NoisyINA219(ioctl_s, byte_s)
+    i2c_bus._buses[bus_num] = i2c_bus.I2CBus(bus_num, opener=lambda n: fake)
+    reader = ina219.INA219Reader((bus_num,), samples=8)
+
+    singles = []
+    for _ in range(300):
+        singles.append(reader.read()[1])
+        time.sleep(reader.conversion_time)
+
+    bus_before = sum(
+        s["mean_ms"] * s["count"] for s in i2c_bus.get_bus(bus_num).stats().values()
+    )
+    summaries = [reader.oversample(16, 0.25) for _ in range(30)]
+    bus_after = sum(
+        s["mean_ms"] * s["count"] for s in i2c_bus.get_bus(bus_num).stats().values()
+    )
+
+    mean_err, max_err, failed = error_stats(singles)
+    o_mean, o_max, o_failed = error_stats([s[1] for s in summaries])
+    print(f"[{name}]")
+    print(
+        f"  1회 읽기        : 평균 오차 {mean_err:6.2f} mA, 최대 {max_err:7.2f} mA, 실패 "
+        f"{failed}회/300"
+    )
+    print(
+        f"  oversample(16)  : 평균 오차 {o_mean:6.2f} mA, 최대 {o_max:7.2f} mA, 실패 "
+        f"{o_failed}회/30"
+    )
+    print(
+        f"    샘플 수 평균 {statistics.mean(s.count for s in summaries):.1f}, 제외 "
+        f"{sum(s.rejected for s in summaries)}개, 오류 "
+        f"{sum(s.errors for s in summaries)}회, spread(전류) "
+        f"{statistics.mean(s.spread[1] for s in summaries) * 1000:.2f} mA"
+    )
+    print(
+        f"    비용: 벽시계 {statistics.mean(s.elapsed for s in summaries) * 1000:.1f} "
+        f"ms/읽기, 버스 점유 {(bus_after - bus_before) / len(summaries):.2f} ms/읽기"
+    )
+    assert o_max < max_err and o_max < 5 * NOISE_A * 1000, "이상치가 결과에 남음"
+    assert all(s.elapsed < 0.25 + 0.02 for s in summaries), "시간 예산 초과"
+
+# 변환 주기보다 빨리 읽을 때: read()는 이전 변환을 다시 주지만 read_new()는 None (샘플러가 중복 저장 안 함)
+polls = new = 0
+start = time.perf_counter()
+while time.perf_counter() - start < 0.2:
+    polls += 1
+    new += reader.read_new() is not None
+conversions = 0.2 / reader.conversion_time
+print(f"\n0.2초 동안 read_new() {polls}회 → 새 변환 {new}개 (변환 {conversions:.0f}개)")
+assert new <= conversions + 1 < polls
+
+# 샘플링 스레드의 최근 값처럼 양자화된 샘플: 대부분 같은 값이면 MAD가 0 → LSB 하한 없이는 1 LSB 계단도 제외됨
+bus_v, lsb = 1200 * ina219.BUS_LSB_V, reader.current_lsb
+steps = [(bus_v, 100 * lsb, 2000 * lsb)] * 12 + [
+    (bus_v + ina219.BUS_LSB_V, 101 * lsb, 2020 * lsb)
+] * 4
+assert ina219.summarize(steps).rejected == 4
+assert ina219.summarize(steps, reader.resolution).rejected == 0
+print("1 LSB 계단 16개: 하한 없음 → 4개 제외, reader.resolution 하한 → 제외 0개")
+
+samples = [(BUS_V, TRUE_CURRENT + random.gauss(0, NOISE_A), None) for _ in range(16)]
+start = time.perf_counter()
+for _ in range(1000):
+    ina219.summarize(samples, (ina219.BUS_LSB_V, 1e-4, 2e-3))
+print(f"summarize(16개) 계산 시간: {(time.perf_counter() - start) * 1000:.0f} µs/회")
+print("✓ INA219 오버샘플링 검증 통과")
@@ -0,0 +1,97 @@
+# motion_executor_test.py
+# src/motion_executor.py 검증: 이동 요청이 호출부를 막지 않는지, 두 축이 동시에 움직이는지(축별 순차 0.8초 → 0.4초),
+# 슬라이더 드래그처럼 몰려온 목표가 하나로 합쳐지는지, Future가 실제 이동한 목표로 끝나는지 (가짜 PWM, 하드웨어 불필요)
+#
+# 사용법:
+#   python3 motion_executor_test.py
+import pathlib
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src.motion_executor import MotionExecutor  # noqa: E402
+
+SETTLE = 0.4  # ServoController의 SERVO_SETTLE_SECONDS
+
+
+class FakePWM:
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def ChangeDutyCycle(self, duty):
+        self.log.append((time.perf_counter(), self.name, duty))
+
+
+log = []
+pwm_az, pwm_alt = FakePWM(log, "az"), FakePWM(log, "alt")
+driven = []
+
+
+def sequential(azimuth, altitude):
+    """기존 방식: 축마다 펄스 → 대기 → 정지"""
+    for pwm, angle in ((pwm_az, azimuth), (pwm_alt, altitude)):
+        pwm.ChangeDutyCycle(2.5 + angle / 18)
+        time.sleep(SETTLE)
+        pwm.ChangeDutyCycle(0)
+
+
+def both_axes(azimuth, altitude):
+    pwm_az.ChangeDutyCycle(2.5 + azimuth / 18)
+    pwm_alt.ChangeDutyCycle(2.5 + altitude / 18)
+    time.sleep(SETTLE)
+    pwm_az.ChangeDutyCycle(0)
+    pwm_alt.ChangeDutyCycle(0)
+    driven.append((azimuth, altitude))
+
+
+start = time.perf_counter()
+sequential(120, 30)
+blocking = time.perf_counter() - start
+
+executor = MotionExecutor(both_axes)
+start = time.perf_counter()
+future = executor.submit(120, 30)
+submit_us = (time.perf_counter() - start) * 1e6
+assert future.result(timeout=2) == (120, 30)
+move = time.perf_counter() - start
+print(
+    f"이동 1회: 기존 호출부 대기 {blocking * 1000:.0f} ms → submit {submit_us:.0f} µs, 이동 완료 "
+    f"{move * 1000:.0f} ms (두 축 동시)"
+)
+assert submit_us < 5000 and move < blocking * 0.7
+
+# 슬라이더 드래그: 1초 동안 50개 목표
+driven.clear()
+futures = []
+start = time.perf_counter()
+for i in range(50):
+    futures.append(executor.submit(60 + i, 20 + i // 2))
+    time.sleep(0.02)
+executor.wait_idle(timeout=5)
+elapsed = time.perf_counter() - start
+results = [f.result(timeout=1) for f in futures]
+print(
+    f"드래그 50개 요청 → 실제 이동 {len(driven)}회 (합쳐짐 {executor.coalesced}회), 마지막 이동 "
+    f"{driven[-1]}, 총 {elapsed:.2f}초"
+)
+assert driven[-1] == (109, 44), "마지막 목표로 끝나야 함"
+assert len(driven) <= 50 * 0.02 / SETTLE + 2, "합쳐지지 않은 이동이 남음"
+assert (
+    results[-1] == (109, 44)
+    and sum(r != (60 + i, 20 + i // 2) for i, r in enumerate(results)) > 40
+)
+
+# 시작 전에 취소된 요청은 이동하지 않음
+driven.clear()
+first = executor.submit(10, 10)
+time.sleep(0.05)  # 첫 요청이 이동 중
+cancelled = executor.submit(20, 20)
+assert cancelled.cancel()
+executor.wait_idle(timeout=2)
+print(f"취소된 대기 목표: 이동 {driven}")
+assert driven == [(10, 10)]
+
+print(f"통계: {executor.stats()}")
+executor.stop()
+print("✓ 모션 실행기 검증 통과")
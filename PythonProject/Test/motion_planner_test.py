@@ -0,0 +1,124 @@
+# motion_planner_test.py
+# src/motion_planner.py 검증: 사다리꼴 궤적이 속도/가속도 제한을 지키고 두 축이 함께 도착하는지,
+# 절대 시각 타이머가 time.sleep 누적 방식보다 어긋나지 않는지, 이동 중 새 목표가 오면 끊김 없이(속도 연속) 방향을 바꾸는지
+# (가짜 PWM, 하드웨어 불필요)
+#
+# 사용법:
+#   python3 motion_planner_test.py
+import pathlib
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import motion_planner, pwm_backend  # noqa: E402
+from src.motion_executor import MotionExecutor  # noqa: E402
+
+MOVE_STEPS, MOVE_DELAY = 20, 0.05  # config.example.json motors.*
+SPEED, ACCEL = motion_planner.limits(MOVE_STEPS, MOVE_DELAY)
+print(
+    f"제한: {SPEED:.0f} °/s, {ACCEL:.0f} °/s² (move_steps={MOVE_STEPS}, "
+    f"move_delay={MOVE_DELAY})"
+)
+
+
+def check(profiles, targets, dt=0.001):
+    """샘플링해서 속도/가속도 제한과 도착 위치 확인"""
+    total = max(p.duration for p in profiles)
+    for p, target in zip(profiles, targets):
+        t, prev_v = 0.0, p.velocity
+        while t < total:
+            t += dt
+            _, v = p.sample(t)
+            assert abs(v) <= SPEED + 1e-6, f"속도 초과 {v}"
+            assert abs(v - prev_v) <= ACCEL * dt + 1e-6, "가속도 초과"
+            prev_v = v
+        x, v = p.sample(total)
+        assert abs(x - target) < 1e-6 and abs(v) < 1e-6, (x, target, v)
+    return total
+
+
+# 정지 상태에서 출발: 두 축이 같은 시간에 직선으로 도착
+profiles = motion_planner.plan((90, 45), (0, 0), (170, 30), SPEED, ACCEL)
+total = check(profiles, (170, 30))
+assert abs(profiles[0].duration - profiles[1].duration) < 1e-9
+mid_az, _ = profiles[0].sample(total / 3)
+mid_alt, _ = profiles[1].sample(total / 3)
+assert abs((mid_az - 90) / 80 - (mid_alt - 45) / -15) < 1e-9, "직선 이동이 아님"
+print(f"90→170 / 45→30: {total:.3f} 초 (두 축 동시 도착)")
+for span in (0.5, 5, 45, 180):
+    p = motion_planner.plan_axis(0, 0, span, SPEED, ACCEL)
+    print(f"  {span:5.1f}° 이동: {p.duration * 1000:6.0f} ms")
+
+# 반대 방향으로 움직이는 중에 새 목표: 먼저 감속 후 되돌아옴
+p = motion_planner.plan_axis(100, -SPEED, 120, SPEED, ACCEL)
+check([p], [120])
+print(
+    f"-{SPEED:.0f} °/s로 이동 중 100→120: {p.duration:.3f} 초 (감속 {SPEED / ACCEL:.3f} 초 포함)"
+)
+
+
+# 실제 타이머로 실행 (가짜 PWM 채널에 기록)
+pwm = pwm_backend.RecordingChannel()
+
+
+def angle(duty):
+    return (duty - 2.5) / 10 * 180
+
+
+planner = motion_planner.MotionPlanner((0, 0), SPEED, ACCEL, MOVE_DELAY)
+executor = MotionExecutor(
+    lambda az, alt: planner.move(
+        (az, alt), lambda a, _: pwm.set_duty(2.5 + a / 18), executor.preempted
+    ),
+    position=lambda: planner.position,
+)
+start = time.perf_counter()
+assert executor.submit(180, 0).result(timeout=5) == (180, 0)
+times = [t for t, _ in pwm.log]
+gaps = [b - a for a, b in zip(times, times[1:])]
+print(
+    f"\n0→180 실제 {planner.last_actual_s:.3f} 초 / 계획 {planner.last_planned_s:.3f} 초, 틱 "
+    f"{len(times)}회, 틱 간격 {min(gaps) * 1000:.1f}~{max(gaps[:-1]) * 1000:.1f} ms, 최대 지연 "
+    f"{planner.max_late_s * 1000:.2f} ms"
+)
+assert (
+    planner.last_actual_s - planner.last_planned_s < 0.01
+), "절대 시각 타이머가 어긋남"
+
+
+# 기존 방식: 단계마다 time.sleep(move_delay) (+ 쓰기/계산 2 ms)
+start = time.perf_counter()
+for step in range(MOVE_STEPS):
+    time.sleep(0.002)
+    time.sleep(MOVE_DELAY)
+naive = time.perf_counter() - start
+print(
+    f"time.sleep 누적 {MOVE_STEPS}단계: {naive:.3f} 초 (목표 {MOVE_STEPS * MOVE_DELAY:.3f}, "
+    f"어긋남 {(naive - MOVE_STEPS * MOVE_DELAY) * 1000:.0f} ms)"
+)
+
+
+# 이동 중 새 목표
+pwm.log.clear()
+first = executor.submit(20, 0)
+time.sleep(0.35)
+second = executor.submit(150, 0)
+assert second.result(timeout=5) == (150, 0)
+stopped_at = first.result(timeout=5)  # 중단된 이동은 새 목표가 아니라 멈춘 위치로 완료
+assert 20 < stopped_at[0] < 180 and stopped_at != (150, 0), stopped_at
+angles = [angle(d) for _, d in pwm.log]
+times = [t for t, _ in pwm.log]
+speeds = [
+    abs(b - a) / (tb - ta) for a, b, ta, tb in zip(angles, angles[1:], times, times[1:])
+]
+turn = min(range(len(angles)), key=lambda i: angles[i])
+print(
+    f"180→20 이동 중 150으로 변경: 최저 {angles[turn]:.1f}°에서 반전, 틱 사이 최대 속도 {max(speeds):.0f} "
+    f"°/s (제한 {SPEED:.0f}), 도착 {angles[-1]:.1f}°, 중단 {executor.interrupted}회 (첫 요청 결과 "
+    f"{stopped_at[0]:.1f}°)"
+)
+assert executor.interrupted == 1 and abs(angles[-1] - 150) < 1e-6
+assert max(speeds) <= SPEED * 1.1, "중단 시 각도가 튐"
+executor.stop()
+print(f"통계: {planner.stats()}")
+print("✓ 모션 플래너 검증 통과")
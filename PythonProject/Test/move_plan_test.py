@@ -0,0 +1,134 @@
+# move_plan_test.py
+# src/move_plan.py 검증: 하루 태양 궤적에서 추가 코사인 손실 허용치를 지키는 최소 이동 계획(탐욕 구간 덮기)을 만들고
+# 동적 계획법(DP) 최적해와 이동 횟수가 같은지, 샘플 사이(10초 간격)에서도 손실이 허용치 이내인지,
+# 매 주기 이동/서보 5° 임계값 보정과 이동 횟수·손실 비교, 스케줄러가 다음 계획 시각에 깨우는지 (하드웨어 불필요)
+#
+# 사용법:
+#   python3 move_plan_test.py
+import pathlib
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import move_plan  # noqa: E402
+from src.solar_position import solar_position  # noqa: E402
+from src.solar_tracker import SolarTracker  # noqa: E402
+from src.tracker_schedule import TrackerScheduler  # noqa: E402
+
+LAT, LON = 37.5665, 126.9780  # 서울
+to_servo, from_servo = SolarTracker._convert_to_servo, SolarTracker._servo_to_sun
+
+for az, alt in ((100, 10), (180, 60), (250, 35)):
+    back = from_servo(*to_servo(az, alt))
+    assert abs(back[0] - az) < 1e-9 and abs(back[1] - alt) < 1e-9, "역변환 불일치"
+
+
+def loss(sun_az, sun_alt, pose):
+    """패널이 pose(서보 각도)일 때 코사인 손실"""
+    cos = move_plan._unit(sun_az, sun_alt) @ move_plan._unit(*from_servo(*pose))
+    return 1 - max(cos, 0.0)
+
+
+def excess(sun_az, sun_alt, pose):
+    return loss(sun_az, sun_alt, pose) - loss(
+        sun_az, sun_alt, to_servo(sun_az, sun_alt)
+    )
+
+
+def min_moves_dp(times, az, alt, tolerance):
+    """같은 후보 자세(샘플 시각의 태양 위치)로 구간을 덮는 최소 이동 횟수 (O(n³) DP)"""
+    n = len(times)
+    poses = [to_servo(a, b) for a, b in zip(az, alt)]
+    bad = np.array(
+        [
+            [excess(az[i], alt[i], poses[j]) > tolerance for j in range(n)]
+            for i in range(n)
+        ]
+    )
+    # 샘플 사이 구간까지 덮으려면 이웃한 이동이 경계 샘플을 공유해야 함
+    best = [1] + [n + 1] * (n - 1)  # best[e]: 샘플 0..e를 덮는 최소 이동 수
+    for e in range(1, n):
+        for s in range(e):
+            if best[s] + (s > 0) < best[e] and (~bad[s : e + 1].any(axis=0)).any():
+                best[e] = best[s] + (s > 0)
+    return best[n - 1]
+
+
+# 1) 탐욕 구간 덮기 = DP 최적 (10분 간격으로 작게)
+for day in ("2026-03-20", "2026-06-21", "2026-12-21"):
+    stamps = datetime.fromisoformat(day + "T00:00:00+09:00").timestamp() + np.arange(
+        0, 86400, 600.0
+    )
+    az, alt = solar_position(stamps, LAT, LON)
+    up = alt > 0
+    plan = move_plan.plan_moves(
+        stamps[up], az[up], alt[up], to_servo, from_servo, 0.005
+    )
+    dp = min_moves_dp(stamps[up], az[up].tolist(), alt[up].tolist(), 0.005)
+    print(f"{day} (10분 간격 {up.sum()}개): 탐욕 {len(plan.moves)}회, DP 최적 {dp}회")
+    assert len(plan.moves) == dp
+
+# 2) 하루 전체 (1분 간격 계획), 10초 간격으로 실제 손실 확인
+print()
+for day in ("2026-03-20", "2026-06-21", "2026-12-21"):
+    dawn = datetime.fromisoformat(day + "T04:00:00+09:00")
+    start = time.perf_counter()
+    plan = move_plan.plan_day(LAT, LON, dawn, to_servo, from_servo, 0.005)
+    took = time.perf_counter() - start
+
+    fine = np.arange(plan.moves[0].time, plan.end, 10.0)
+    az, alt = solar_position(fine, LAT, LON)
+    up = alt > 0
+    fine, az, alt = fine[up], az[up], alt[up]
+    planned = [
+        excess(a, b, plan.active(t)[1:])
+        for t, a, b in zip(fine, az.tolist(), alt.tolist())
+    ]
+
+    # 기존 방식: 서보 기준 5° 임계값을 넘으면 이동
+    pose, threshold_moves, threshold_loss = None, 0, []
+    for a, b in zip(az.tolist(), alt.tolist()):
+        target = to_servo(a, b)
+        if pose is None or max(abs(target[0] - pose[0]), abs(target[1] - pose[1])) > 5:
+            pose, threshold_moves = target, threshold_moves + 1
+        threshold_loss.append(excess(a, b, pose))
+
+    print(
+        f"{day}: 계획 {len(plan.moves)}회 ({took * 1000:.0f} ms), 추가 손실 최대 "
+        f"{max(planned) * 100:.3f}% / 평균 {np.mean(planned) * 100:.3f}% | 5° 임계값 "
+        f"{threshold_moves}회, 최대 {max(threshold_loss) * 100:.3f}% | 매 주기(60초) "
+        f"{plan.samples}회"
+    )
+    assert max(planned) <= 0.0052, "샘플 사이에서 허용치 초과"
+    assert len(plan.moves) < threshold_moves and len(plan.moves) * 10 < plan.samples
+
+# 3) 허용치에 따른 이동 횟수
+dawn = datetime(2026, 6, 21, 19, 0, tzinfo=timezone.utc)  # 한국 04:00
+counts = {
+    tol: len(move_plan.plan_day(LAT, LON, dawn, to_servo, from_servo, tol).moves)
+    for tol in (0.001, 0.005, 0.02)
+}
+print(
+    "\n하지 허용치별 이동 횟수: "
+    f"{', '.join(f'{tol * 100:g}% → {n}회' for tol, n in counts.items())}"
+)
+assert counts[0.001] > counts[0.005] > counts[0.02]
+
+# 4) 스케줄러: 계획된 다음 이동 시각에 정확히 깨움
+plan = move_plan.plan_day(LAT, LON, dawn, to_servo, from_servo, 0.005)
+scheduler = TrackerScheduler(60, max_interval=86400)
+now = datetime.fromtimestamp(plan.moves[0].time, timezone.utc)
+wakes = [now.timestamp()]
+while plan.covers(now.timestamp()):
+    delay = scheduler.follow_plan(plan, now)
+    now = datetime.fromtimestamp(now.timestamp() + delay, timezone.utc)
+    wakes.append(now.timestamp())
+assert (
+    wakes[: len(plan.moves)] == [m.time for m in plan.moves] and wakes[-1] == plan.end
+)
+print(f"스케줄러 깨우기 {len(wakes)}회 = 계획 이동 {len(plan.moves)}회 + 일몰 1회")
+print(f"계획: {plan.as_dict()['times'][:3]} … 종료 {plan.as_dict()['end']}")
+print("✓ 이동 계획 검증 통과")
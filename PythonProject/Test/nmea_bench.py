@@ -0,0 +1,93 @@
+# nmea_bench.py
+# src/nmea.py 파서와 pynmea2 속도 비교
+#
+# 사용법:
+#   python3 nmea_bench.py                 # 내장 NEO-6M 기본 출력 1초분 반복
+#   python3 nmea_bench.py gps_log.nmea    # 실제 수신 로그 (한 줄에 한 문장)
+import pathlib
+import sys
+import time
+
+import pynmea2
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import nmea  # noqa: E402
+
+# NEO-6M 기본 설정(9600 baud, 1 Hz)에서 매 초 나오는 문장 묶음
+SAMPLE_EPOCH = [
+    b"$GPRMC,044512.00,A,3506.99520,N,12858.09216,E,0.046,,171026,,,A*7A\r\n",
+    b"$GPVTG,,T,,M,0.046,N,0.085,K,A*2C\r\n",
+    b"$GPGGA,044512.00,3506.99520,N,12858.09216,E,1,08,1.02,21.3,M,26.4,M,,*6C\r\n",
+    b"$GPGSA,A,3,10,07,05,02,29,04,08,13,,,,,1.72,1.02,1.38*0B\r\n",
+    b"$GPGSV,3,1,11,02,45,055,31,04,13,310,26,05,70,185,33,07,22,112,28*7B\r\n",
+    b"$GPGSV,3,2,11,08,34,273,30,10,61,022,35,13,18,040,24,16,05,160,*7E\r\n",
+    b"$GPGSV,3,3,11,26,02,210,,29,40,300,32,30,09,080,*43\r\n",
+    b"$GPGLL,3506.99520,N,12858.09216,E,044512.00,A,A*62\r\n",
+]
+REPEAT = 5000
+TYPES = ("RMC", "GGA", "GSA", "VTG")
+
+
+def load_lines():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            lines = [line for line in f if line.startswith(b"$")]
+        print(f"로그 파일: {sys.argv[1]} ({len(lines)} 문장)")
+        return lines * max(1, 40000 // max(1, len(lines)))
+    print("내장 NEO-6M 샘플 사용")
+    return SAMPLE_EPOCH * REPEAT
+
+
+def run_pynmea2(lines):
+    count = 0
+    for raw in lines:
+        line = raw.decode("ascii", errors="replace").strip()
+        if line[3:6] in TYPES:
+            try:
+                pynmea2.parse(line, check=True)
+                count += 1
+            except pynmea2.ParseError:
+                pass
+    return count
+
+
+def run_nmea(lines):
+    count = 0
+    for raw in lines:
+        if nmea.parse(raw) is not None:
+            count += 1
+    return count
+
+
+lines = load_lines()
+print(f"총 {len(lines)} 문장\n")
+
+
+def run_nmea_rmc_gga(lines):
+    # 추적기처럼 필요한 문장만: 나머지는 형식 확인만 하고 체크섬/분할 없이 건너뜀
+    count = 0
+    for raw in lines:
+        if nmea.parse(raw, ("RMC", "GGA")) is not None:
+            count += 1
+    return count
+
+
+results = {}
+runs = (("pynmea2", run_pynmea2), ("src.nmea", run_nmea), ("RMC+GGA", run_nmea_rmc_gga))
+for name, func in runs:
+    elapsed = float("inf")
+    for _ in range(5):  # 가장 빠른 회차 (다른 프로세스로 인한 잡음 제거)
+        start = time.perf_counter()
+        parsed = func(lines)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    results[name] = elapsed
+    print(
+        f"{name:9s}: {elapsed * 1e6 / len(lines):6.2f} µs/문장  "
+        f"{len(lines) / elapsed:10.0f} 문장/s  (파싱 {parsed})"
+    )
+
+print(f"\n속도 향상: x{results['pynmea2'] / results['src.nmea']:.1f} (같은 4종류 파싱)")
+print(
+    "필요한 RMC/GGA만 지정(kinds): src.nmea 전체 대비 "
+    f"x{results['src.nmea'] / results['RMC+GGA']:.1f}"
+)
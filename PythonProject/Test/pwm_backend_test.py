@@ -0,0 +1,125 @@
+# pwm_backend_test.py
+# src/pwm_backend.py 검증: /sys/class/pwm 하드웨어 PWM 백엔드를 가짜 sysfs 디렉터리로 확인
+# (export → pwmN 생성 대기, period/duty_cycle/enable 값, 종료 시 unexport),
+# 같은 채널을 쓰는 핀 조합(Pi 4의 GPIO 12/18) 거부, 가짜(기록) 백엔드와 쓰기 비용 비교
+# (하드웨어 불필요)
+#
+# 사용법:
+#   python3 pwm_backend_test.py
+import os
+import pathlib
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import pwm_backend  # noqa: E402
+
+
+def read(path):
+    with open(path) as f:
+        return f.read().strip()
+
+
+class FakeSysfs:
+    """export에 채널 번호가 쓰이면 잠시 뒤 pwmN 디렉터리를 만드는 커널/udev 흉내"""
+
+    def __init__(self, root, npwm=4):
+        self.chip = os.path.join(root, "pwmchip0")
+        os.makedirs(self.chip)
+        for name in ("export", "unexport"):
+            open(os.path.join(self.chip, name), "w").close()
+        with open(os.path.join(self.chip, "npwm"), "w") as f:
+            f.write(f"{npwm}\n")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        export = os.path.join(self.chip, "export")
+        while not self._stop.wait(0.005):
+            value = read(export)
+            if value:
+                time.sleep(0.02)  # udev 지연
+                channel = os.path.join(self.chip, f"pwm{value}")
+                os.makedirs(channel, exist_ok=True)
+                for name in ("period", "duty_cycle", "enable"):
+                    with open(os.path.join(channel, name), "w") as f:
+                        f.write("0\n")
+                open(export, "w").close()
+
+    def close(self):
+        self._stop.set()
+
+
+with tempfile.TemporaryDirectory() as root:
+    sysfs = FakeSysfs(root)
+    start = time.perf_counter()
+    az = pwm_backend.SysfsChannel(18, 50, root=root)
+    alt = pwm_backend.SysfsChannel(12, 50, root=root)
+    print(
+        f"export 후 채널 준비: {(time.perf_counter() - start) * 1000:.0f} ms "
+        f"(GPIO 18 → pwm{az.channel}, GPIO 12 → pwm{alt.channel})"
+    )
+    assert (
+        read(os.path.join(az.path, "period")) == "20000000"
+        and read(os.path.join(az.path, "enable")) == "1"
+    )
+
+    az.set_duty(7.5)  # 90° → 1.5 ms
+    alt.set_duty(2.5)  # 0° → 0.5 ms
+    assert read(os.path.join(az.path, "duty_cycle")) == "1500000"
+    assert read(os.path.join(alt.path, "duty_cycle")) == "500000"
+    az.set_duty(0)
+    assert read(os.path.join(az.path, "duty_cycle")) == "0"
+
+    n = 2000
+    start = time.perf_counter()
+    for i in range(n):
+        az.set_duty(2.5 + (i % 100) / 10)
+    sysfs_us = (time.perf_counter() - start) / n * 1e6
+    az.close()
+    alt.close()
+    assert read(os.path.join(az.path, "enable")) == "0"
+    assert read(os.path.join(az.chip_path, "unexport")) == str(alt.channel)
+    sysfs.close()
+
+# 미리 export된 채널은 그대로 사용하고 종료 시 unexport하지 않음
+with tempfile.TemporaryDirectory() as root:
+    channel = os.path.join(root, "pwmchip0", "pwm2")
+    os.makedirs(channel)
+    for name in ("period", "duty_cycle", "enable", "../export", "../unexport"):
+        open(os.path.join(channel, name), "w").close()
+    pwm = pwm_backend.SysfsChannel(18, 50, root=root)
+    pwm.close()
+    assert (
+        read(os.path.join(root, "pwmchip0", "export")) == ""
+        and read(os.path.join(root, "pwmchip0", "unexport")) == ""
+    )
+
+# Pi 4: GPIO 12와 18은 둘 다 PWM0
+try:
+    pwm_backend.check_channels((18, 12), {12: 0, 13: 1, 18: 0, 19: 1})
+    raise AssertionError("같은 채널을 쓰는 핀 조합을 허용함")
+except ValueError as e:
+    print(f"Pi 4 채널 배치: {e}")
+pwm_backend.check_channels((18, 12))  # 기본(Pi 5) 배치는 통과
+
+fake = pwm_backend.open_channel(18, 50, "fake")
+start = time.perf_counter()
+for i in range(n):
+    fake.set_duty(2.5 + (i % 100) / 10)
+fake_us = (time.perf_counter() - start) / n * 1e6
+assert len(fake.log) == n and fake.backend == "fake"
+print(
+    f"set_duty 비용: sysfs(가짜 디렉터리) {sysfs_us:.1f} µs, 기록 백엔드 {fake_us:.2f} µs "
+    f"(20 Hz × 2축 궤적에서 sysfs 쓰기 CPU {sysfs_us * 40 / 1e4:.3f}%)"
+)
+
+try:
+    pwm_backend.open_channel(18, 50, "gpio")
+    print("RPi.GPIO 백엔드 사용 가능")
+except ImportError:
+    print("RPi.GPIO 없음 (Pi가 아님) → gpio 백엔드 생략")
+print("✓ PWM 백엔드 검증 통과")
@@ -0,0 +1,81 @@
+# read_all_deadline_test.py
+# src/sensor_reader.py read_all() 마감 시간 검증: GPS readline이 1초씩 막히고 DHT가 가끔 실패해도
+# SENSOR_READ_DEADLINE 안에 끝나는지, 늦은 센서는 마지막 정상 값 + stale 표시, 늦게 끝난 값은 다음 호출에서 새 값으로 쓰는지,
+# DhtService 캐시 값은 측정 시각(dht_age 전)으로 표시되고 오래되면 stale인지 (모의 모드, 하드웨어 불필요)
+#
+# 사용법:
+#   python3 read_all_deadline_test.py
+import os
+import pathlib
+import random
+import sys
+import time
+
+os.environ["USE_SENSOR_MOCK"] = "1"
+os.environ["SENSOR_READ_DEADLINE"] = "0.3"
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src.sensor_reader import SensorReader  # noqa: E402
+
+random.seed(5)
+reader = SensorReader()
+mock_gps, mock_dht = reader._read_gps, reader._read_dht
+gps_calls = []
+
+
+def slow_gps():
+    gps_calls.append(time.monotonic())
+    if len(gps_calls) % 3 == 0:
+        time.sleep(1.0)  # 시리얼 타임아웃
+    return mock_gps()
+
+
+def flaky_dht():
+    if random.random() < 0.3:
+        raise RuntimeError("Checksum did not validate")
+    return mock_dht()
+
+
+reader._read_gps = slow_gps
+reader._read_dht = flaky_dht
+
+durations = []
+stale_gps = stale_dht = 0
+for _ in range(20):
+    start = time.perf_counter()
+    data = reader.read_all()
+    durations.append(time.perf_counter() - start)
+    stale_gps += data["stale"]["latitude"]
+    stale_dht += data["stale"]["temperature"]
+    assert (
+        data["latitude"] is not None and data["temperature"] is not None
+    ), "마지막 정상 값이 없음"
+    assert data["sample_time"]["voltage"] is not None
+    time.sleep(0.1)
+
+print(
+    f"read_all 20회: 최대 {max(durations) * 1000:.0f} ms (마감 "
+    f"{reader.read_deadline * 1000:.0f} ms), 평균 "
+    f"{sum(durations) / len(durations) * 1000:.0f} ms"
+)
+print(
+    f"  GPS stale {stale_gps}회 (GPS 읽기 시작 {len(gps_calls)}회, 막힌 읽기 중에는 새로 시작하지 않음)"
+)
+print(f"  DHT stale {stale_dht}회 (실패 시 마지막 정상 값 사용)")
+print(f"  마지막 결과 stale 표시: {data['stale']}")
+assert max(durations) < reader.read_deadline + 0.05, "마감 시간 초과"
+assert stale_gps > 0 and stale_dht > 0
+assert len(gps_calls) < 20, "막힌 GPS 읽기 위에 읽기를 쌓음"
+
+# DhtService 캐시: 방금 읽었어도 측정 시각은 dht_age 전
+for cache_age, expect_stale in ((2.0, False), (45.0, True)):
+    reader._read_dht = lambda: dict(mock_dht(), dht_age=cache_age)
+    data = reader.read_all()
+    offset = data["timestamp"] - data["sample_time"]["temperature"]
+    print(
+        f"  DHT 캐시 {cache_age:.0f}초 전 측정: 측정 시각 {offset:.1f}초 전, "
+        f"stale={data['stale']['temperature']} (주기 {reader.dht_interval:.0f}초 + 마감)"
+    )
+    assert (
+        abs(offset - cache_age) < 0.5 and data["stale"]["temperature"] == expect_stale
+    )
+print("✓ read_all 마감 시간 검증 통과")
@@ -0,0 +1,108 @@
+# sensor_scheduler_test.py
+# src/sensor_scheduler.py 검증: 센서별 주기(빠른 INA219 / 느린 DHT / 가끔 1초씩 막히는 GPS)가 서로 간섭하지 않는지,
+# 놓친 주기(missed)와 지터 집계, 최신 값 테이블 조회가 막히지 않는지, 순차 읽기와 비교 (가짜 센서, 하드웨어 불필요)
+#
+# 사용법:
+#   python3 sensor_scheduler_test.py
+import os
+import pathlib
+import sys
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src.sensor_scheduler import SensorScheduler  # noqa: E402
+
+RUN_SECONDS = 3.0
+
+
+class FakeSensor:
+    def __init__(self, cost, block_every=0, block_seconds=0.0):
+        self.cost = cost
+        self.block_every = block_every
+        self.block_seconds = block_seconds
+        self.calls = 0
+
+    def read(self):
+        self.calls += 1
+        blocked = self.block_every and self.calls % self.block_every == 0
+        time.sleep(self.block_seconds if blocked else self.cost)
+        return {"value": self.calls}
+
+
+sensors = {
+    # 이름: (주기 s, 센서)
+    "ina219": (0.05, FakeSensor(0.005)),
+    "dht11": (0.5, FakeSensor(0.02)),
+    "gps": (
+        0.2,
+        FakeSensor(0.01, block_every=3, block_seconds=1.0),
+    ),  # readline 타임아웃 흉내
+}
+
+# 순차 읽기: 한 번 읽을 때마다 모든 센서를 기다림
+start = time.perf_counter()
+worst = 0.0
+while time.perf_counter() - start < RUN_SECONDS:
+    t = time.perf_counter()
+    for _, sensor in sensors.values():
+        sensor.read()
+    worst = max(worst, time.perf_counter() - t)
+sequential_ina = sensors["ina219"][1].calls
+print(
+    f"순차 읽기 {RUN_SECONDS:.0f}초: INA219 {sequential_ina}회 (목표 "
+    f"{RUN_SECONDS / 0.05:.0f}회), read_all 최악 {worst * 1000:.0f} ms"
+)
+
+for _, sensor in sensors.values():
+    sensor.calls = 0
+scheduler = SensorScheduler()
+for name, (interval, sensor) in sensors.items():
+    scheduler.add(name, interval, sensor.read)
+scheduler.start()
+lookup_worst = 0.0
+end = time.perf_counter() + RUN_SECONDS
+while time.perf_counter() < end:
+    t = time.perf_counter()
+    scheduler.table.snapshot()
+    lookup_worst = max(lookup_worst, time.perf_counter() - t)
+    time.sleep(0.01)
+scheduler.stop()
+
+stats = scheduler.stats()
+print(
+    f"\n스케줄러 {RUN_SECONDS:.0f}초 (최신 값 조회 최악 {lookup_worst * 1e6:.0f} µs):"
+)
+for name, (interval, sensor) in sensors.items():
+    s = stats[name]
+    print(
+        f"  {name:7s} 주기 {interval * 1000:4.0f} ms: 읽기 {s['runs']:3d}회 (목표 "
+        f"{RUN_SECONDS / interval:.0f}), 놓침 {s['missed']:2d}, 지터 평균 "
+        f"{s['mean_jitter_ms']:.2f} ms / 최대 {s['max_jitter_ms']:.2f} ms"
+    )
+
+ina = stats["ina219"]
+assert ina["runs"] >= 0.9 * RUN_SECONDS / 0.05, "느린 센서가 빠른 센서를 막음"
+assert ina["missed"] <= 2 and ina["max_jitter_ms"] < 20
+assert stats["gps"]["missed"] > 0, "막힌 GPS 읽기 동안의 주기는 놓침으로 집계되어야 함"
+assert lookup_worst < 0.005
+
+# SensorReader(모의 모드)에 연결
+os.environ["USE_SENSOR_MOCK"] = "1"
+from src.sensor_reader import SensorReader  # noqa: E402
+
+reader = SensorReader()
+reader.start()
+time.sleep(0.2)
+t = time.perf_counter()
+data = reader.read_all()
+elapsed = time.perf_counter() - t
+reader.stop()
+print(
+    f"\nSensorReader.read_all (스케줄러 사용): {elapsed * 1e6:.0f} µs, 필드 {sorted(data)}"
+)
+assert (
+    data.get("voltage") is not None
+    and data.get("temperature") is not None
+    and data.get("latitude") is not None
+)
+print("✓ 센서 스케줄러 검증 통과")
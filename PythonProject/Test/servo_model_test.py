@@ -0,0 +1,102 @@
+# servo_model_test.py
+# src/servo_model.py 검증: 이동 거리에 따른 펄스 유지 시간(고정 0.4초 대비), 작은 보정이 수십 ms에 끝나는지,
+# 실측 이동 시간으로 속도 학습, ServoController(가짜 PWM)가 지령한 궤적/유지 시간 기록과
+# 유지 중 새 목표가 와도 펄스를 끄고 기록하는지, 이동 중 수동 목표에 밀린 추적 이동이 False인지 (하드웨어 불필요)
+#
+# 사용법:
+#   python3 servo_model_test.py
+import pathlib
+import random
+import sys
+import threading
+import time
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import servo_model, solar_tracker  # noqa: E402
+
+FIXED = 0.4  # 기존 고정 대기
+
+az = servo_model.ServoModel(servo_model.MG996R_SPEED_DPS)
+print(f"MG996R 모델: {az.speed_dps:.0f} °/s + {az.settle_s * 1000:.0f} ms")
+for distance in (0.5, 2, 5, 30, 90, 180):
+    hold = az.hold_time(distance)
+    note = "  ← 고정 0.4초로는 도착 전에 펄스 정지" if hold > FIXED else ""
+    print(
+        f"  {distance:5.1f}° 점프: 유지 {hold * 1000:4.0f} ms (고정 {FIXED * 1000:.0f} "
+        f"ms){note}"
+    )
+assert az.hold_time(0.5) < 0.05 and az.hold_time(180) > FIXED
+assert (
+    az.hold_time(90, commanded_s=1.0) == az.settle_s
+), "궤적이 더 느리면 안정화 시간만 남음"
+
+# 실측 이동으로 속도 학습 (부하가 커서 실제로는 150 °/s)
+random.seed(3)
+learner = servo_model.ServoModel(servo_model.MG996R_SPEED_DPS)
+for _ in range(30):
+    distance = random.uniform(5, 120)
+    learner.observe(
+        distance, distance / 150.0 + learner.settle_s + random.gauss(0, 0.01)
+    )
+print(
+    f"실측 30회 학습: {servo_model.MG996R_SPEED_DPS:.0f} → {learner.speed_dps:.0f} °/s (실제 "
+    "150)"
+)
+assert abs(learner.speed_dps - 150) < 15
+
+# ServoController (가짜 PWM): 부드러운 이동 / 점프
+for smooth in (True, False):
+    solar_tracker.SMOOTH_MOVE = smooth
+    servo = solar_tracker.ServoController(18, 12, backend="fake")
+    timings = []
+    for target in ((90.5, 45), (92, 45.5), (120, 30), (30, 60)):
+        start = time.perf_counter()
+        servo.move_to_position(*target)
+        timings.append(time.perf_counter() - start)
+    servo.cleanup()
+    stats = servo.timing()["moves"]
+    label = "부드러운 이동" if smooth else "점프"
+    print(
+        f"\n{label}: 0.5° 보정 {timings[0] * 1000:.0f} ms, 1.5° {timings[1] * 1000:.0f} "
+        f"ms, 28°/15° {timings[2] * 1000:.0f} ms, 90°/30° {timings[3] * 1000:.0f} ms"
+    )
+    print(f"  지령 시간: {stats}")
+    assert stats["moves"] == 4 and stats["cut_short"] == 0
+    assert timings[0] < (0.1 if smooth else 0.06), "작은 보정이 수십 ms에 끝나야 함"
+
+# 펄스 유지 중 새 목표: 펄스를 끄고 중단된 이동으로 기록
+solar_tracker.SMOOTH_MOVE = False
+servo = solar_tracker.ServoController(18, 12, backend="fake")
+servo.move_to_position(0, 45)
+first = servo.move_async(180, 45)  # 180° 점프, 유지 약 0.76초
+time.sleep(0.2)
+second = servo.move_async(170, 45)
+assert first.result(timeout=5) == (180, 45) and second.result(timeout=5) == (170, 45)
+duties = [d for _, d in servo.pwm_az.log]
+stats = servo.timing()["moves"]
+servo.cleanup()
+print(f"\n유지 중 새 목표: {stats}")
+assert duties[-1] == 0 and duties.count(0) == 3, "이동마다 펄스를 꺼야 함"
+assert stats["moves"] == 3 and stats["cut_short"] == 1
+
+# 추적기의 이동(대기 중) 도중 수동 목표: 추적기 쪽은 수동 목표에 도달했다고 받지 않음
+solar_tracker.SMOOTH_MOVE = True
+servo = solar_tracker.ServoController(18, 12, backend="fake")
+servo.move_to_position(0, 45)
+results = []
+tracker = threading.Thread(
+    target=lambda: results.append(servo.move_to_position(180, 45))
+)
+tracker.start()
+time.sleep(0.3)
+manual = servo.move_async(100, 45)
+tracker.join(timeout=5)
+assert manual.result(timeout=5) == (100, 45)
+servo.cleanup()
+print(
+    f"추적 이동 중 수동 목표: 추적기 결과 {results[0]} (중단 {servo.motion.interrupted}회), 최종 "
+    f"{servo.current_az}°"
+)
+assert results == [False] and servo.motion.interrupted == 1 and servo.current_az == 100
+
+print("\n✓ 서보 모델 검증 통과")
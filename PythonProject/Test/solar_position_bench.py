@@ -0,0 +1,57 @@
+# solar_position_bench.py
+# 벡터화 태양 위치 엔진(src/solar_position.py)과 pysolar 비교 + 속도 측정
+import pathlib
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from pysolar.solar import get_altitude, get_azimuth
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src.solar_position import PYSOLAR_TOLERANCE_DEG, solar_position  # noqa: E402
+
+# 부산 위치
+LATITUDE = 35.116452
+LONGITUDE = 128.967377
+STEP_SECONDS = 60
+
+print("=== 태양 위치 엔진 비교 (하루, 1분 간격) ===\n")
+
+day_start = datetime.now(timezone.utc).replace(
+    hour=0, minute=0, second=0, microsecond=0
+)
+stamps = [day_start + timedelta(seconds=s) for s in range(0, 86400, STEP_SECONDS)]
+
+start = time.perf_counter()
+ref = [
+    (get_azimuth(LATITUDE, LONGITUDE, t), get_altitude(LATITUDE, LONGITUDE, t))
+    for t in stamps
+]
+pysolar_elapsed = time.perf_counter() - start
+
+start = time.perf_counter()
+azimuth, altitude = solar_position(stamps, LATITUDE, LONGITUDE)
+numpy_elapsed = time.perf_counter() - start
+
+ref_az = np.array([r[0] for r in ref])
+ref_alt = np.array([r[1] for r in ref])
+up = ref_alt > 0
+az_err = np.abs((azimuth - ref_az + 180) % 360 - 180) * np.cos(np.radians(ref_alt))
+alt_err = np.abs(altitude - ref_alt)
+
+print(f"샘플 수: {len(stamps)}")
+print(f"pysolar: {pysolar_elapsed * 1000:.1f} ms")
+print(
+    f"numpy  : {numpy_elapsed * 1000:.1f} ms  (x{pysolar_elapsed / numpy_elapsed:.0f})"
+)
+print(f"최대 방위각 오차(낮): {az_err[up].max():.4f}°")
+print(f"최대 고도각 오차(낮): {alt_err[up].max():.4f}°")
+
+if (
+    az_err[up].max() <= PYSOLAR_TOLERANCE_DEG
+    and alt_err[up].max() <= PYSOLAR_TOLERANCE_DEG
+):
+    print(f"✓ 허용 오차 {PYSOLAR_TOLERANCE_DEG}° 이내")
+else:
+    print(f"✗ 허용 오차 {PYSOLAR_TOLERANCE_DEG}° 초과")
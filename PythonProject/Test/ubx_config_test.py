@@ -0,0 +1,84 @@
+# ubx_config_test.py
+# src/ubx.py 설정 명령이 정확한 바이트로 전송되는지 확인 (수신기 없이 FakeSerial 사용)
+#
+# 사용법:
+#   python3 ubx_config_test.py            # 바이트 검증
+#   python3 ubx_config_test.py /dev/serial0  # 실제 NEO-6M에 설정 전송
+import pathlib
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
+from src import ubx  # noqa: E402
+
+# u-blox 6 Receiver Description 기준 기대 프레임
+EXPECTED = {
+    "CFG-MSG GGA on": "B5 62 06 01 03 00 F0 00 01 FB 10",
+    "CFG-MSG GLL off": "B5 62 06 01 03 00 F0 01 00 FB 11",
+    "CFG-MSG GSV off": "B5 62 06 01 03 00 F0 03 00 FD 15",
+    "CFG-MSG RMC on": "B5 62 06 01 03 00 F0 04 01 FF 18",
+    "CFG-RATE 1000ms": "B5 62 06 08 06 00 E8 03 01 00 01 00 01 39",
+    "CFG-RXM power save": "B5 62 06 11 02 00 08 01 22 92",
+}
+
+
+def hexs(data):
+    return " ".join(f"{b:02X}" for b in data)
+
+
+def check_frames():
+    built = {
+        "CFG-MSG GGA on": ubx.cfg_msg(ubx.CLS_NMEA, 0x00, 1),
+        "CFG-MSG GLL off": ubx.cfg_msg(ubx.CLS_NMEA, 0x01, 0),
+        "CFG-MSG GSV off": ubx.cfg_msg(ubx.CLS_NMEA, 0x03, 0),
+        "CFG-MSG RMC on": ubx.cfg_msg(ubx.CLS_NMEA, 0x04, 1),
+        "CFG-RATE 1000ms": ubx.cfg_rate(1000),
+        "CFG-RXM power save": ubx.cfg_rxm(True),
+    }
+    for name, frame in built.items():
+        assert (
+            hexs(frame) == EXPECTED[name]
+        ), f"{name}: {hexs(frame)} != {EXPECTED[name]}"
+        print(f"✓ {name:20s} {hexs(frame)}")
+
+    pm2 = ubx.cfg_pm2(1000)
+    assert len(pm2) == 8 + 44, "CFG-PM2 payload must be 44 bytes"
+    assert pm2[2:6] == bytes((0x06, 0x3B, 44, 0))
+    assert (
+        int.from_bytes(pm2[10:14], "little") == 0x00021800
+    ), "cyclic tracking + updateRTC + updateEPH"
+    assert bytes(ubx.checksum(pm2[2:-2])) == pm2[-2:]
+    print(f"✓ {'CFG-PM2 cyclic':20s} {hexs(pm2[:14])} ...")
+
+
+def check_configure():
+    # 모든 명령에 ACK → 전송 순서와 바이트 확인
+    port = ubx.FakeSerial()
+    result = ubx.configure(port)
+    assert (
+        port.frames == ubx.config_commands()
+    ), "sent frames differ from config_commands()"
+    assert result == {"ack": len(port.frames), "nak": 0, "timeout": 0}, result
+    enabled = [f[7] for f in port.frames if f[3] == ubx.ID_CFG_MSG and f[8] == 1]
+    assert enabled == [0x00, 0x04], f"only GGA/RMC enabled, got {enabled}"
+
+    # CFG-PM2 거부(NAK) → 나머지는 계속 전송
+    port = ubx.FakeSerial(nak=[(ubx.CLS_CFG, ubx.ID_CFG_PM2)])
+    result = ubx.configure(port)
+    assert result["nak"] == 1 and result["ack"] == len(port.frames) - 1, result
+
+    # 응답 없음(u-blox 아님) → 첫 명령 이후 중단
+    port = ubx.FakeSerial(silent=True)
+    result = ubx.configure(port, timeout=0.05)
+    assert len(port.frames) == 1 and result["timeout"] == 1, result
+    print("✓ configure(): ACK / NAK / 응답 없음 처리 확인")
+
+
+if len(sys.argv) > 1:
+    import serial
+
+    with serial.Serial(sys.argv[1], 9600, timeout=1) as gps:
+        print(ubx.configure(gps))
+else:
+    check_frames()
+    check_configure()
+    print("\n모든 UBX 설정 검증 통과")
@@ -0,0 +1,150 @@
+"""Per-device circuit breakers with exponential reprobe backoff.
+
+Missing hardware used to cost every cycle: a register access that fails
+and prints, a serial port that is never there, a sensor that times out
+each time. Each device gets a ``CircuitBreaker`` (``breaker("gps")``)
+that callers consult before touching it:
+
+* ``closed`` -- healthy; every call goes through.
+* ``open`` -- ``failure_threshold`` consecutive failures; calls are skipped
+  (``allow()`` is False) until the reprobe time.
+* ``half_open`` -- the reprobe time has come; one probe call is let
+  through. Success (and the caller's reconnect) closes the breaker, failure
+  reopens it with the backoff doubled up to ``max_backoff``.
+
+Only state changes are printed, so a dead device logs once rather than
+every cycle. ``status()`` collects every breaker for ``/health``.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_BASE_BACKOFF = 5.0  # seconds before the first reprobe
+DEFAULT_MAX_BACKOFF = 300.0
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.state = CLOSED
+        self.failures = 0  # consecutive
+        self.backoff = base_backoff
+        self.next_probe: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.total_failures = 0
+        self.skipped = 0  # calls not made while open
+        self.opened = 0  # times the breaker tripped
+        self.since = clock()  # when the current state began
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self.since = self._clock()
+
+    def allow(self) -> bool:
+        """True if the device may be used now (closed, or due for a reprobe)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._clock() >= self.next_probe:
+                self._set_state(HALF_OPEN)
+                return True
+            self.skipped += 1
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until the device may be used again (0 when closed)."""
+        if self.state != OPEN or self.next_probe is None:
+            return 0.0
+        return max(self.next_probe - self._clock(), 0.0)
+
+    def success(self) -> None:
+        with self._lock:
+            recovered = self.state != CLOSED
+            self.failures = 0
+            self.backoff = self.base_backoff
+            self.next_probe = None
+            if recovered:
+                self._set_state(CLOSED)
+        if recovered:
+            print(f"✓ {self.name} 장치 복구")
+
+    def failure(self, error: Any = None) -> None:
+        with self._lock:
+            self.failures += 1
+            self.total_failures += 1
+            if error is not None:
+                self.last_error = str(error)
+            if self.state == HALF_OPEN:
+                self.backoff = min(self.backoff * 2, self.max_backoff)
+            elif self.state == OPEN or self.failures < self.failure_threshold:
+                return
+            else:
+                self.opened += 1
+            self._set_state(OPEN)
+            self.next_probe = self._clock() + self.backoff
+            backoff = self.backoff
+        print(
+            f"⚠ {self.name} 장치 응답 없음 → {backoff:.0f}초 후 재시도 ({self.last_error})"
+        )
+
+    def call(self, fn: Callable[[], Any], default: Any = None) -> Any:
+        """``fn()`` guarded by the breaker; ``default`` when skipped or failed."""
+        if not self.allow():
+            return default
+        try:
+            result = fn()
+        except Exception as exc:
+            self.failure(exc)
+            return default
+        self.success()
+        return result
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "since_s": round(self._clock() - self.since, 1),
+            "consecutive_failures": self.failures,
+            "total_failures": self.total_failures,
+            "opened": self.opened,
+            "skipped": self.skipped,
+            "retry_in_s": round(self.retry_in(), 1),
+            "last_error": self.last_error,
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker(name: str, **options) -> CircuitBreaker:
+    """The process-wide breaker for ``name`` (options apply on first use)."""
+    with _breakers_lock:
+        found = _breakers.get(name)
+        if found is None:
+            found = _breakers[name] = CircuitBreaker(name, **options)
+        return found
+
+
+def status() -> Dict[str, dict]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.status() for b in breakers}
@@ -0,0 +1,214 @@
+"""Process-wide DHT11/DHT22 service: one device, read on its own thread.
+
+Constructing an ``adafruit_dht`` sensor claims the GPIO line (libgpiod or
+the pulseio helper process) and takes a while; doing it for every reading
+costs that each time and can leak the line. ``get_service(pin)`` opens the
+device once per process and a daemon thread reads it every ``interval``
+seconds (``sensors.dht11.sample_interval`` in the hardware config).
+
+The DHT11 misses reads routinely (checksum/timing errors) and must not be
+polled faster than about once a second. A failed read is retried after
+``RETRY_MIN`` seconds, doubling per consecutive failure up to
+``RETRY_MAX``; anything other than the driver's usual ``RuntimeError``
+closes the device so the next attempt reopens it. Callers never touch the
+sensor: ``latest()`` returns the last good values with their age, and
+drops them once they are older than ``max_age``. Results are also
+reported to the device's ``device_health`` breaker, so a sensor that stays
+silent shows up as ``open`` in ``/health`` and is logged once instead of
+every cycle.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    from . import device_health
+    from . import hardware_config
+except ImportError:
+    # Allow running as a standalone script (no package parent)
+    import device_health  # type: ignore
+    import hardware_config  # type: ignore
+
+DEFAULT_INTERVAL = 10.0  # seconds between good reads
+MIN_INTERVAL = 2.0  # DHT11 needs ~1 s between reads; keep a margin
+RETRY_MIN = 2.0
+RETRY_MAX = 60.0
+
+Reading = Tuple[
+    Optional[float], Optional[float], Optional[float]
+]  # temperature, humidity, age
+
+
+def open_device(pin_name: str = "D17", kind: str = "DHT11"):
+    """An ``adafruit_dht`` sensor on a board pin name (e.g. ``"D17"``)."""
+    import adafruit_dht  # type: ignore
+    import board  # type: ignore
+
+    sensor_cls = getattr(adafruit_dht, kind, adafruit_dht.DHT11)
+    return sensor_cls(getattr(board, pin_name))
+
+
+class DHTService:
+    def __init__(
+        self,
+        opener: Callable[[], object],
+        interval: float = DEFAULT_INTERVAL,
+        name: str = "dht",
+    ):
+        self._opener = opener
+        self.name = name
+        self.interval = max(MIN_INTERVAL, float(interval))
+        # Readings older than this are not served (a few missed intervals plus one
+        # long backoff).
+        self.max_age = max(3 * self.interval, RETRY_MAX)
+        self.device = None
+        self.temperature: Optional[float] = None
+        self.humidity: Optional[float] = None
+        self._updated: Optional[float] = None  # monotonic time of the last good read
+        self._lock = threading.Lock()
+
+        self.reads = 0
+        self.errors = 0
+        self.failures = 0  # consecutive, drives the backoff
+        self.last_error: Optional[str] = None
+        # Checksum misses are routine; only a run of them counts as the device
+        # being down.
+        self.health = device_health.breaker(
+            name, failure_threshold=5, base_backoff=RETRY_MIN, max_backoff=RETRY_MAX
+        )
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Thread ---
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.name}-service", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._stop.wait(self.read_once())
+
+    # --- Reading ---
+    def retry_delay(self) -> float:
+        return min(
+            RETRY_MIN * 2 ** max(self.failures - 1, 0), max(RETRY_MAX, self.interval)
+        )
+
+    def read_once(self) -> float:
+        """One read attempt; returns the delay before the next one."""
+        try:
+            if self.device is None:
+                self.device = self._opener()
+            temperature = self.device.temperature
+            humidity = self.device.humidity
+            if temperature is None or humidity is None:
+                raise RuntimeError("no data")
+            temperature, humidity = float(temperature), float(humidity)
+        except Exception as exc:
+            self.errors += 1
+            self.failures += 1
+            self.last_error = str(exc.args[0] if exc.args else exc)
+            if not isinstance(exc, RuntimeError):
+                self._close_device()
+            self.health.failure(self.last_error)
+            return self.retry_delay()
+        with self._lock:
+            self.temperature = temperature
+            self.humidity = humidity
+            self._updated = time.monotonic()
+        self.reads += 1
+        self.failures = 0
+        self.health.success()
+        return self.interval
+
+    def _close_device(self) -> None:
+        device, self.device = self.device, None
+        if device is not None:
+            try:
+                device.exit()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        self.stop()
+        self._close_device()
+
+    # --- Queries ---
+    def age(self) -> Optional[float]:
+        updated = self._updated
+        return None if updated is None else time.monotonic() - updated
+
+    def latest(self, max_age: Optional[float] = None) -> Reading:
+        """Last good ``(temperature, humidity, age)``; None values past ``max_age``."""
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            temperature, humidity = self.temperature, self.humidity
+        age = self.age()
+        if age is None or age > max_age:
+            return None, None, age
+        return temperature, humidity, age
+
+    def status(self) -> dict:
+        temperature, humidity, age = self.latest()
+        return {
+            "temperature": temperature,
+            "humidity": humidity,
+            "age": None if age is None else round(age, 1),
+            "interval": self.interval,
+            "reads": self.reads,
+            "errors": self.errors,
+            "consecutive_failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+_services: Dict[str, DHTService] = {}
+_services_lock = threading.Lock()
+
+
+def get_service(
+    pin_name: str = "D17", kind: str = "DHT11", interval: Optional[float] = None
+) -> DHTService:
+    """The shared service for a DHT on ``pin_name`` (not started; call ``start()``).
+
+    A pin carries one sensor, so asking again for the same pin with another
+    ``kind`` or ``interval`` raises ``ValueError`` instead of handing back
+    the service opened with the first settings.
+    """
+    with _services_lock:
+        service = _services.get(pin_name)
+        if service is None:
+            if interval is None:
+                interval = float(
+                    hardware_config.setting(
+                        "sensors.dht11.sample_interval", DEFAULT_INTERVAL
+                    )
+                )
+            service = _services[pin_name] = DHTService(
+                lambda: open_device(pin_name, kind), interval, name=kind.lower()
+            )
+        elif service.name != kind.lower() or (
+            interval is not None
+            and max(MIN_INTERVAL, float(interval)) != service.interval
+        ):
+            raise ValueError(
+                f"DHT on {pin_name} is already a {service.name.upper()}"
+                f" read every {service.interval} s"
+                f" (asked for {kind}, interval {interval})"
+            )
+        return service
@@ -0,0 +1,226 @@
+"""Record raw GPS serial traffic and replay it through a pseudo-terminal.
+
+A trace file is a ``MAGIC`` header followed by one record per chunk read
+from the port: ``<IH`` (microseconds since the previous chunk, byte count)
+plus the bytes themselves, i.e. six bytes of overhead per read. Replaying
+opens a pty and writes the chunks to its master side with the recorded
+spacing divided by ``speed`` (0 = as fast as the reader drains it), so
+anything that opens a serial port -- ``GPSReader``, ``SensorReader`` or a
+bare ``serial.Serial`` -- can be pointed at the slave device instead of
+``/dev/serial0`` and runs unchanged.
+
+Usage (from PythonProject/):
+    python -m src.gps_trace record /dev/serial0 trace.gps --seconds 600
+    python -m src.gps_trace replay trace.gps --speed 10 --link /tmp/gps0
+    GPS_PORT=/tmp/gps0 python -m src.data_logger
+"""
+
+import argparse
+import os
+import struct
+import time
+import tty
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b"GPSTRACE1\n"
+_RECORD = struct.Struct("<IH")
+MAX_DELTA_US = 0xFFFFFFFF
+MAX_CHUNK = 0xFFFF
+
+
+class TraceWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+        self._last: Optional[float] = None
+        self.chunks = 0
+        self.bytes = 0
+
+    def write(self, data: bytes, when: Optional[float] = None) -> None:
+        """Append ``data`` received at ``when`` (``time.monotonic()`` seconds)."""
+        if when is None:
+            when = time.monotonic()
+        delta = 0 if self._last is None else int((when - self._last) * 1e6)
+        self._last = when
+        for start in range(0, len(data), MAX_CHUNK):
+            piece = data[start : start + MAX_CHUNK]
+            self._file.write(_RECORD.pack(min(max(delta, 0), MAX_DELTA_US), len(piece)))
+            self._file.write(piece)
+            delta = 0
+        self.chunks += 1
+        self.bytes += len(data)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_trace(path: str) -> Iterator[Tuple[float, bytes]]:
+    """Yield ``(seconds since the first chunk, data)`` for every record."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"not a GPS trace file: {path}")
+        offset = 0.0
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            delta_us, length = _RECORD.unpack(header)
+            offset += delta_us / 1e6
+            yield offset, f.read(length)
+
+
+def synthesize(
+    path: str, epochs: Iterable[Iterable[bytes]], baud: int = 9600, period: float = 1.0
+) -> None:
+    """Write a trace from canned messages: one epoch per ``period``, each
+    message spaced by its transmission time at ``baud`` (10 bits per byte)."""
+    with TraceWriter(path) as writer:
+        for index, epoch in enumerate(epochs):
+            when = index * period
+            for message in epoch:
+                writer.write(message, when)
+                when += len(message) * 10.0 / baud
+
+
+def record(port: str, baud: int, path: str, seconds: Optional[float] = None) -> None:
+    """Copy everything the receiver sends into a trace until ``seconds`` or Ctrl+C."""
+    import serial  # type: ignore
+
+    deadline = None if seconds is None else time.monotonic() + seconds
+    with serial.Serial(port, baud, timeout=0.5) as ser, TraceWriter(path) as writer:
+        print(f"✓ 녹화 시작: {port} → {path}")
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                data = ser.read(max(1, ser.in_waiting))
+                if data:
+                    writer.write(data)
+        except KeyboardInterrupt:
+            pass
+        print(f"✓ 녹화 종료: {writer.chunks} 청크, {writer.bytes} 바이트")
+
+
+def open_pty(link: Optional[str] = None) -> Tuple[int, str]:
+    """Open a raw pty; returns the master fd and the slave path to use as the port.
+
+    The slave fd is deliberately left open so the device stays valid while
+    readers close and reopen it.
+    """
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    name = os.ttyname(slave)
+    if link:
+        if os.path.islink(link):
+            os.unlink(link)
+        os.symlink(name, link)
+    return master, name
+
+
+def replay(
+    path: str,
+    master: int,
+    speed: float = 1.0,
+    loop: bool = False,
+    on_write: Optional[Callable[[int, float], None]] = None,
+    stop: Optional[Callable[[], bool]] = None,
+) -> int:
+    """Write a trace to the pty master, keeping the recorded timing / ``speed``.
+
+    ``on_write(total_bytes, monotonic)`` is called after every chunk so a
+    benchmark can match bytes read back to the moment they were sent.
+    Returns the number of bytes written.
+    """
+    written = 0
+    while True:
+        start = time.monotonic()
+        for offset, data in read_trace(path):
+            if stop is not None and stop():
+                return written
+            if speed > 0:
+                delay = start + offset / speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            view = memoryview(data)
+            while view:
+                n = os.write(master, view)
+                view = view[n:]
+            written += len(data)
+            if on_write is not None:
+                on_write(written, time.monotonic())
+        if not loop:
+            return written
+
+
+def trace_stats(path: str) -> Tuple[int, int, float]:
+    """(chunks, bytes, duration in seconds) of a trace."""
+    chunks = size = 0
+    duration = 0.0
+    for duration, data in read_trace(path):
+        chunks += 1
+        size += len(data)
+    return chunks, size, duration
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="GPS serial trace record/replay")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="record raw bytes from a serial port")
+    rec.add_argument("port")
+    rec.add_argument("trace")
+    rec.add_argument("--baud", type=int, default=int(os.getenv("GPS_BAUD", "9600")))
+    rec.add_argument("--seconds", type=float, default=None)
+
+    rep = sub.add_parser("replay", help="replay a trace through a pty")
+    rep.add_argument("trace")
+    rep.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="1 = real time, 10 = 10x, 0 = unthrottled",
+    )
+    rep.add_argument("--loop", action="store_true")
+    rep.add_argument(
+        "--link",
+        default=None,
+        help="symlink pointing at the pty slave (e.g. /tmp/gps0)",
+    )
+    rep.add_argument(
+        "--delay",
+        type=float,
+        default=3.0,
+        help="seconds to wait for the reader to open the port",
+    )
+
+    info = sub.add_parser("info", help="show trace size and duration")
+    info.add_argument("trace")
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        record(args.port, args.baud, args.trace, args.seconds)
+    elif args.command == "replay":
+        master, name = open_pty(args.link)
+        print(f"✓ 재생 포트: {args.link or name}  (GPS_PORT로 지정)")
+        try:
+            # pyserial clears the input buffer on open, so give the reader time to
+            # attach.
+            time.sleep(args.delay)
+            written = replay(args.trace, master, args.speed, args.loop)
+            print(f"✓ 재생 완료: {written} 바이트")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if args.link and os.path.islink(args.link):
+                os.unlink(args.link)
+    else:
+        chunks, size, duration = trace_stats(args.trace)
+        print(f"{args.trace}: {chunks} 청크, {size} 바이트, {duration:.1f} 초")
+
+
+if __name__ == "__main__":
+    main()
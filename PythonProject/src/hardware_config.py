@@ -0,0 +1,55 @@
+"""Hardware settings from the JSON config (``config/config.example.json`` layout).
+
+``setting("sensors.dht11.sample_interval", 10)`` looks a dotted path up in
+the file named by ``HARDWARE_CONFIG`` and returns the default when the file,
+or the key, is missing. Without ``HARDWARE_CONFIG`` the first existing file
+of ``config/config.json`` next to ``src/`` (``PythonProject/``) and
+``PythonProject/config/config.json`` (for the repository-root ``src/``) is
+used, or, when neither exists, the one whose directory does, so both trees
+share one file. A missing file is reported once. The file is read once per
+process; environment variables still take precedence where a module reads
+both.
+"""
+
+import json
+import os
+import pathlib
+from typing import Any, Optional
+
+_BASE = pathlib.Path(__file__).resolve().parent.parent
+_CANDIDATES = (
+    _BASE / "config" / "config.json",
+    _BASE / "PythonProject" / "config" / "config.json",
+)
+_DEFAULT_PATH = next(
+    (p for p in _CANDIDATES if p.exists()),
+    next((p for p in _CANDIDATES if p.parent.is_dir()), _CANDIDATES[0]),
+)
+HARDWARE_CONFIG = os.getenv("HARDWARE_CONFIG", str(_DEFAULT_PATH))
+
+_config: Optional[dict] = None
+
+
+def load() -> dict:
+    """The parsed config file, or an empty dict if it is absent or invalid."""
+    global _config
+    if _config is None:
+        try:
+            with open(HARDWARE_CONFIG, "r", encoding="utf-8") as f:
+                _config = json.load(f)
+        except FileNotFoundError:
+            print(f"Hardware config not found ({HARDWARE_CONFIG}), using defaults")
+            _config = {}
+        except (OSError, ValueError) as exc:
+            print(f"Hardware config unreadable ({HARDWARE_CONFIG}): {exc}")
+            _config = {}
+    return _config
+
+
+def setting(path: str, default: Any = None) -> Any:
+    value: Any = load()
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return default
+        value = value[key]
+    return value
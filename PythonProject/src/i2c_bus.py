@@ -0,0 +1,224 @@
+"""Process-wide I2C bus manager.
+
+Every ``/dev/i2c-N`` is opened once (``get_bus(n)``) and shared by all
+drivers instead of each call site opening its own ``SMBus``. Transactions on
+a bus are serialized by a ``PriorityLock``: a waiting high-priority reader
+(INA219) is handed the bus before queued low-priority ones (RTC, scans), so
+it waits for at most the one transaction in flight. Bus 3 is the bit-banged
+``i2c-gpio`` overlay, where a single RTC block read can take milliseconds.
+
+Each transaction is timed per device name; ``stats()`` reports count, error
+count, mean/max latency and time spent waiting for the bus.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    from smbus2 import SMBus  # type: ignore
+except ImportError:  # pragma: no cover - hardware dependent
+    SMBus = None
+
+PRIORITY_CRITICAL = 0  # power/current readings the tracker acts on
+PRIORITY_NORMAL = 5
+PRIORITY_BACKGROUND = 10  # RTC, scans, diagnostics
+
+
+class PriorityLock:
+    """Mutex whose waiters are granted in (priority, arrival) order."""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._held = False
+        self._waiters: List[tuple] = []
+        self._order = itertools.count()
+
+    def acquire(
+        self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None
+    ) -> bool:
+        with self._cond:
+            if not self._held and not self._waiters:
+                self._held = True
+                return True
+            entry = (priority, next(self._order))
+            heapq.heappush(self._waiters, entry)
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while self._held or self._waiters[0] != entry:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                    return False
+                self._cond.wait(remaining)
+            heapq.heappop(self._waiters)
+            self._held = True
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self._held = False
+            self._cond.notify_all()
+
+
+class DeviceStats:
+    __slots__ = (
+        "count",
+        "errors",
+        "total_s",
+        "max_s",
+        "wait_s",
+        "max_wait_s",
+        "last_error",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.wait_s = 0.0
+        self.max_wait_s = 0.0
+        self.last_error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": (
+                round(self.total_s / self.count * 1000, 3) if self.count else None
+            ),
+            "max_ms": round(self.max_s * 1000, 3),
+            "mean_wait_ms": (
+                round(self.wait_s / self.count * 1000, 3) if self.count else None
+            ),
+            "max_wait_ms": round(self.max_wait_s * 1000, 3),
+            "last_error": self.last_error,
+        }
+
+
+class I2CBus:
+    def __init__(self, bus_num: int, opener: Optional[Callable[[int], object]] = None):
+        self.bus_num = bus_num
+        self._opener = opener or SMBus
+        self._handle = None
+        self._lock = PriorityLock()
+        self._stats: Dict[str, DeviceStats] = {}
+
+    def _open(self):
+        if self._handle is None:
+            if self._opener is None:
+                raise RuntimeError("smbus2 not installed")
+            self._handle = self._opener(self.bus_num)
+        return self._handle
+
+    @contextmanager
+    def transaction(
+        self,
+        device: str,
+        priority: int = PRIORITY_NORMAL,
+        timeout: Optional[float] = None,
+    ) -> Iterator:
+        """Hold the bus for one device access and yield the SMBus handle.
+
+        Keep the body to the register reads/writes themselves; anything slow
+        belongs outside so other devices are not held up.
+        """
+        requested = time.perf_counter()
+        if not self._lock.acquire(priority, timeout):
+            raise TimeoutError(f"I2C bus {self.bus_num} busy ({device})")
+        started = time.perf_counter()
+        stats = self._stats.get(device)
+        if stats is None:
+            stats = self._stats[device] = DeviceStats()
+        try:
+            yield self._open()
+        except Exception as exc:
+            stats.errors += 1
+            stats.last_error = str(exc)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            waited = started - requested
+            stats.count += 1
+            stats.total_s += elapsed
+            stats.max_s = max(stats.max_s, elapsed)
+            stats.wait_s += waited
+            stats.max_wait_s = max(stats.max_wait_s, waited)
+            self._lock.release()
+
+    # --- Convenience wrappers (one transaction each) ---
+    def read_word(
+        self, device: str, address: int, register: int, priority: int = PRIORITY_NORMAL
+    ) -> int:
+        with self.transaction(device, priority) as bus:
+            return bus.read_word_data(address, register)
+
+    def write_word(
+        self,
+        device: str,
+        address: int,
+        register: int,
+        value: int,
+        priority: int = PRIORITY_NORMAL,
+    ) -> None:
+        with self.transaction(device, priority) as bus:
+            bus.write_word_data(address, register, value)
+
+    def read_block(
+        self,
+        device: str,
+        address: int,
+        register: int,
+        length: int,
+        priority: int = PRIORITY_NORMAL,
+    ) -> List[int]:
+        with self.transaction(device, priority) as bus:
+            return bus.read_i2c_block_data(address, register, length)
+
+    def stats(self) -> Dict[str, dict]:
+        return {device: stats.as_dict() for device, stats in self._stats.items()}
+
+    def close(self) -> None:
+        self._lock.acquire(PRIORITY_BACKGROUND)
+        try:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+        finally:
+            self._lock.release()
+
+
+_buses: Dict[int, I2CBus] = {}
+_buses_lock = threading.Lock()
+
+
+def get_bus(bus_num: int) -> I2CBus:
+    """The shared manager for ``/dev/i2c-<bus_num>`` (opened on first use)."""
+    with _buses_lock:
+        bus = _buses.get(bus_num)
+        if bus is None:
+            bus = _buses[bus_num] = I2CBus(bus_num)
+        return bus
+
+
+def stats() -> Dict[str, Dict[str, dict]]:
+    """Per-bus, per-device transaction metrics for status/health reporting."""
+    with _buses_lock:
+        buses = list(_buses.values())
+    return {f"i2c-{bus.bus_num}": bus.stats() for bus in buses}
+
+
+def close_all() -> None:
+    with _buses_lock:
+        buses = list(_buses.values())
+        _buses.clear()
+    for bus in buses:
+        try:
+            bus.close()
+        except Exception:
+            pass
@@ -0,0 +1,229 @@
+"""Velocity-limited (trapezoidal) servo trajectories on an absolute timer.
+
+Jumping the PWM straight to the target makes an MG996R/MG995 slam across
+the range at full speed: a stall-current spike on the 5 V rail and a
+mechanical shock through the panel mount. With ``motors.smooth_move`` set,
+``MotionPlanner`` instead moves both axes along trapezoidal velocity
+profiles (accelerate, cruise, decelerate) and writes a new setpoint every
+``motors.move_delay`` seconds. The limits come from the config too: at
+cruise speed a full 180 degree move takes ``move_steps`` ticks, and the
+ramps take a quarter of that (``limits()``; ``motors.max_speed`` /
+``motors.max_accel`` override them).
+
+A move from rest is planned on the longer axis and the other axis follows
+the same profile scaled down, so both arrive together along a straight
+line in angle space. Ticks are scheduled at ``start + k * period`` and each
+setpoint is sampled at the actual elapsed time, so a late wakeup never
+accumulates into drift the way a loop of ``time.sleep(move_delay)`` does.
+
+The wait between ticks is the caller's (``MotionExecutor.preempted``) and
+returns True when a new target arrives; the move then stops where it is
+and the next plan starts from the current commanded position *and
+velocity*, braking first if it has to turn around, so an interrupted move
+never jumps.
+
+With the ``fake`` PWM backend (``pwm_backend.RecordingChannel``) every
+setpoint is recorded with its time, so trajectories can be timed and
+checked without a Pi (``Test/motion_planner_test.py``).
+"""
+
+import math
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+DEFAULT_MOVE_STEPS = 20
+DEFAULT_MOVE_DELAY = 0.05
+FULL_RANGE = 180.0  # degrees a full move covers
+
+Segment = Tuple[float, float]  # duration (s), acceleration (deg/s^2)
+
+
+def limits(
+    move_steps: int = DEFAULT_MOVE_STEPS, move_delay: float = DEFAULT_MOVE_DELAY
+) -> Tuple[float, float]:
+    """(max speed deg/s, max acceleration deg/s^2) for the config's steps and tick."""
+    cruise = max(1, move_steps) * move_delay  # full range at cruise speed
+    speed = FULL_RANGE / cruise
+    return speed, speed / (cruise / 4)
+
+
+class Profile:
+    """One axis: start position and velocity, then constant-acceleration segments."""
+
+    __slots__ = ("start", "velocity", "segments", "duration", "distance")
+
+    def __init__(self, start: float, velocity: float, segments: List[Segment]):
+        self.start = start
+        self.velocity = velocity
+        self.segments = [s for s in segments if s[0] > 0]
+        self.duration = sum(s[0] for s in self.segments)
+        self.distance = self.sample(self.duration)[0] - start
+
+    def sample(self, t: float) -> Tuple[float, float]:
+        """Position and velocity ``t`` seconds in (held at the end)."""
+        x, v = self.start, self.velocity
+        for duration, accel in self.segments:
+            dt = min(t, duration)
+            x += v * dt + 0.5 * accel * dt * dt
+            v += accel * dt
+            t -= dt
+            if t <= 0:
+                break
+        return x, v
+
+    def scaled(self, start: float, distance: float) -> "Profile":
+        """The same timing from rest over ``distance`` (this profile starts at rest)."""
+        ratio = distance / self.distance if self.distance else 0.0
+        return Profile(start, 0.0, [(d, a * ratio) for d, a in self.segments])
+
+
+def plan_axis(
+    start: float, velocity: float, target: float, max_speed: float, max_accel: float
+) -> Profile:
+    """Fastest profile from ``(start, velocity)`` to rest at ``target``."""
+    distance = target - start
+    if abs(distance) < 1e-9 and abs(velocity) < 1e-9:
+        return Profile(start, 0.0, [])
+    direction = (
+        math.copysign(1.0, distance) if distance else -math.copysign(1.0, velocity)
+    )
+    u = velocity * direction  # speed towards the target
+    if u < 0 or u * u / (2 * max_accel) > abs(distance) + 1e-9:
+        # Moving away, or too fast to stop in time: brake to rest, then go from there.
+        brake = abs(velocity) / max_accel
+        stopped = start + velocity * brake / 2
+        rest = plan_axis(stopped, 0.0, target, max_speed, max_accel)
+        return Profile(
+            start,
+            velocity,
+            [(brake, -math.copysign(max_accel, velocity))] + rest.segments,
+        )
+    span = abs(distance)
+    peak = min(math.sqrt(max_accel * span + u * u / 2), max_speed)
+    ramp = abs(peak - u) / max_accel
+    ramp_distance = (peak + u) / 2 * ramp
+    stop = peak / max_accel
+    stop_distance = peak * stop / 2
+    cruise = max(span - ramp_distance - stop_distance, 0.0) / peak if peak > 0 else 0.0
+    return Profile(
+        start,
+        velocity,
+        [
+            (ramp, math.copysign(max_accel, peak - u) * direction),
+            (cruise, 0.0),
+            (stop, -max_accel * direction),
+        ],
+    )
+
+
+def plan(
+    position: Sequence[float],
+    velocity: Sequence[float],
+    target: Sequence[float],
+    max_speed: float,
+    max_accel: float,
+) -> List[Profile]:
+    """Profiles for all axes; from rest they share one time scale (a straight line)."""
+    if any(abs(v) > 1e-9 for v in velocity):
+        return [
+            plan_axis(p, v, t, max_speed, max_accel)
+            for p, v, t in zip(position, velocity, target)
+        ]
+    distances = [t - p for p, t in zip(position, target)]
+    longest = max(range(len(distances)), key=lambda i: abs(distances[i]))
+    lead = plan_axis(position[longest], 0.0, target[longest], max_speed, max_accel)
+    return [
+        lead if i == longest else lead.scaled(p, d)
+        for i, (p, d) in enumerate(zip(position, distances))
+    ]
+
+
+class MotionPlanner:
+    """Commanded state of a multi-axis servo and the loop that follows a plan."""
+
+    def __init__(
+        self,
+        position: Sequence[float],
+        max_speed: float,
+        max_accel: float,
+        period: float = DEFAULT_MOVE_DELAY,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.position = list(position)
+        self.velocity = [0.0] * len(self.position)
+        self.max_speed = max_speed
+        self.max_accel = max_accel
+        self.period = period
+        self._clock = clock
+
+        self.moves = 0
+        self.interrupted = 0
+        self.ticks = 0
+        self.max_late_s = 0.0  # worst tick lateness
+        self.last_planned_s: Optional[float] = None
+        self.last_actual_s: Optional[float] = None
+
+    def move(
+        self,
+        target: Sequence[float],
+        write: Callable[..., None],
+        wait: Callable[[float], bool],
+    ) -> bool:
+        """Follow a plan to ``target``, calling ``write(*setpoints)`` every tick.
+
+        ``wait(seconds)`` sleeps until the next tick and returns True to
+        abandon the move (new target); the commanded position and velocity
+        at that moment are kept for the next plan. Returns True on arrival.
+        """
+        profiles = plan(
+            self.position, self.velocity, target, self.max_speed, self.max_accel
+        )
+        total = max(p.duration for p in profiles)
+        start = self._clock()
+        tick = 0
+        while True:
+            tick += 1
+            due = min(start + tick * self.period, start + total)
+            if wait(max(due - self._clock(), 0.0)):
+                # Write this instant's setpoint so the next plan continues from it.
+                self._hold(profiles, min(self._clock() - start, total))
+                write(*self.position)
+                self.interrupted += 1
+                return False
+            now = self._clock()
+            self.max_late_s = max(self.max_late_s, now - due)
+            self.ticks += 1
+            elapsed = min(now - start, total)
+            self._hold(profiles, elapsed)
+            write(*self.position)
+            if elapsed >= total:
+                break
+        self.position = list(target)
+        self.velocity = [0.0] * len(self.position)
+        self.moves += 1
+        self.last_planned_s = total
+        self.last_actual_s = self._clock() - start
+        return True
+
+    def _hold(self, profiles: List[Profile], elapsed: float) -> None:
+        state = [p.sample(elapsed) for p in profiles]
+        self.position = [s[0] for s in state]
+        self.velocity = [s[1] for s in state]
+
+    def stats(self) -> dict:
+        return {
+            "position": [round(p, 2) for p in self.position],
+            "max_speed_dps": round(self.max_speed, 1),
+            "max_accel_dps2": round(self.max_accel, 1),
+            "period_s": self.period,
+            "moves": self.moves,
+            "interrupted": self.interrupted,
+            "ticks": self.ticks,
+            "max_late_ms": round(self.max_late_s * 1000, 3),
+            "last_planned_s": (
+                None if self.last_planned_s is None else round(self.last_planned_s, 4)
+            ),
+            "last_actual_s": (
+                None if self.last_actual_s is None else round(self.last_actual_s, 4)
+            ),
+        }
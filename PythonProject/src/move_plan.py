@@ -0,0 +1,194 @@
+"""Precomputed daily servo moves: as few as possible within a cosine-loss budget.
+
+Correcting whenever a cycle comes around (or whenever the servo-space drift
+passes a fixed threshold) spends moves evenly over the day, although the
+power lost to a mis-pointed panel is ``1 - cos(incidence)`` and so depends
+on the angle on the sky, not on servo degrees. ``plan_day`` instead takes
+the sun's track from now until sunset, the tracker's servo mapping and a
+tolerance on the *extra* cosine loss, and returns the fewest ``(time, az,
+alt)`` moves that keep every sample within it.
+
+The extra loss of holding pose ``j`` (the servo angles for the sun at sample
+``j``) at sample ``i`` is the loss of that pose minus the loss of the pose
+the tracker would choose at ``i`` itself. Outside the servo range (the
+azimuth clamps at 180 degrees, the altitude at 0/90) the best pose already
+loses something, so only what a held pose loses on top of that counts.
+
+Every candidate pose covers a contiguous run of samples around its own, so
+choosing moves is interval covering, and the greedy rule is exact: from
+the first uncovered sample, take the pose whose run reaches furthest.
+Consecutive runs share their boundary sample and the move happens there,
+so the time between two samples is always inside one pose's run. The
+tracker then sleeps until the next planned move (``MovePlan.next_time``,
+``TrackerScheduler.follow_plan``) instead of checking the sun every cycle.
+"""
+
+import bisect
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .solar_position import solar_position
+except ImportError:
+    # Allow running as a standalone script (no package parent)
+    from solar_position import solar_position  # type: ignore
+
+DEFAULT_MAX_LOSS = 0.005  # 0.5 % extra cosine loss, about 5.7 degrees off the sun
+DEFAULT_STEP_SECONDS = 60
+HORIZON_SECONDS = 86400
+WAKE_SLACK = 2.0  # a wake-up this early still counts as the move's time
+LOCATION_TOLERANCE_DEG = 0.01
+
+ServoMap = Callable[[float, float], Tuple[float, float]]
+
+
+class Move(NamedTuple):
+    time: float  # POSIX seconds
+    azimuth: float  # servo degrees
+    altitude: float
+
+
+def _unit(azimuth, altitude) -> np.ndarray:
+    """Direction vectors (east, north, up) for sky angles in degrees."""
+    az = np.radians(np.asarray(azimuth, dtype=float))
+    alt = np.radians(np.asarray(altitude, dtype=float))
+    return np.stack(
+        [np.cos(alt) * np.sin(az), np.cos(alt) * np.cos(az), np.sin(alt)], axis=-1
+    )
+
+
+def _iso(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat(timespec="seconds")
+
+
+class MovePlan:
+    def __init__(
+        self,
+        moves: List[Move],
+        end: float,
+        samples: int,
+        max_loss: float,
+        worst_loss: float,
+    ):
+        self.moves = moves
+        self.end = end  # covered until (sunset or the end of the horizon)
+        self.samples = samples
+        self.max_loss = max_loss
+        self.worst_loss = worst_loss
+        self.latitude: Optional[float] = None
+        self.longitude: Optional[float] = None
+        self._times = [m.time for m in moves]
+
+    def covers(self, when: float) -> bool:
+        return bool(self.moves) and self.moves[0].time - WAKE_SLACK <= when < self.end
+
+    def matches(self, latitude: float, longitude: float) -> bool:
+        return (
+            self.latitude is not None
+            and abs(latitude - self.latitude) <= LOCATION_TOLERANCE_DEG
+            and abs(longitude - self.longitude) <= LOCATION_TOLERANCE_DEG
+        )
+
+    def active(self, when: float) -> Optional[Move]:
+        """The move whose pose should be held at ``when``."""
+        index = bisect.bisect_right(self._times, when + WAKE_SLACK) - 1
+        return self.moves[max(index, 0)] if self.moves else None
+
+    def next_time(self, when: float) -> Optional[float]:
+        """Time of the first move after the one active at ``when``, or None."""
+        index = bisect.bisect_right(self._times, when + WAKE_SLACK)
+        return self._times[index] if index < len(self._times) else None
+
+    def as_dict(self) -> dict:
+        return {
+            "moves": len(self.moves),
+            "samples": self.samples,
+            "max_loss": self.max_loss,
+            "worst_loss": round(self.worst_loss, 5),
+            "end": _iso(self.end) if self.moves else None,
+            "times": [_iso(m.time) for m in self.moves],
+        }
+
+
+def plan_moves(
+    times,
+    azimuth,
+    altitude,
+    to_servo: ServoMap,
+    from_servo: ServoMap,
+    max_loss: float = DEFAULT_MAX_LOSS,
+) -> MovePlan:
+    """Fewest moves covering the samples with at most ``max_loss`` extra cosine loss.
+
+    ``times`` are POSIX seconds of daytime sun samples ``(azimuth,
+    altitude)``; ``to_servo`` is the tracker's mapping and ``from_servo``
+    its inverse (where the panel points for given servo angles).
+    """
+    times = np.asarray(times, dtype=float)
+    n = len(times)
+    if n == 0:
+        return MovePlan([], float("nan"), 0, max_loss, 0.0)
+    poses = [
+        to_servo(az, alt)
+        for az, alt in zip(np.asarray(azimuth).tolist(), np.asarray(altitude).tolist())
+    ]
+    pointing = _unit(*zip(*(from_servo(az, alt) for az, alt in poses)))
+    cosine = np.clip(_unit(azimuth, altitude) @ pointing.T, 0.0, 1.0)  # [sample, pose]
+    excess = np.diagonal(cosine)[:, None] - cosine
+    ok = excess <= max_loss
+
+    # Contiguous run of samples around each pose's own sample.
+    left = np.empty(n, dtype=int)
+    right = np.empty(n, dtype=int)
+    for j in range(n):
+        before = np.flatnonzero(~ok[:j, j])
+        after = np.flatnonzero(~ok[j + 1 :, j])
+        left[j] = before[-1] + 1 if before.size else 0
+        right[j] = j + after[0] if after.size else n - 1
+
+    moves: List[Move] = []
+    worst = 0.0
+    start = 0
+    while True:
+        reach = np.where((left <= start) & (right >= start), right, -1)
+        j = int(np.argmax(reach))
+        end = int(right[j])
+        moves.append(Move(float(times[start]), *poses[j]))
+        worst = max(worst, float(excess[start : end + 1, j].max()))
+        if end >= n - 1:
+            break
+        start = end if end > start else start + 1
+    return MovePlan(moves, float(times[-1]), n, max_loss, worst)
+
+
+def plan_day(
+    latitude: float,
+    longitude: float,
+    now: datetime,
+    to_servo: ServoMap,
+    from_servo: ServoMap,
+    max_loss: float = DEFAULT_MAX_LOSS,
+    step: float = DEFAULT_STEP_SECONDS,
+) -> MovePlan:
+    """Plan from ``now`` until the sun next sets (within ``HORIZON_SECONDS``)."""
+    stamps = now.timestamp() + np.arange(0, HORIZON_SECONDS, step, dtype=float)
+    azimuth, altitude = solar_position(stamps, latitude, longitude)
+    up = altitude > 0
+    # Today's daylight only: from the first sample above the horizon to the next sunset.
+    first = int(np.argmax(up)) if up.any() else len(up)
+    down = np.flatnonzero(~up[first:])
+    last = first + (int(down[0]) if down.size else len(up) - first)
+    plan = plan_moves(
+        stamps[first:last],
+        azimuth[first:last],
+        altitude[first:last],
+        to_servo,
+        from_servo,
+        max_loss,
+    )
+    if plan.moves:
+        plan.end = float(stamps[last - 1] + step)
+    plan.latitude, plan.longitude = latitude, longitude
+    return plan
@@ -0,0 +1,215 @@
+"""Minimal NMEA 0183 parser for the GPS hot path.
+
+Works directly on the ``bytes`` returned by ``serial.readline()``: the
+sentence type is checked first (``kinds`` narrows it to what the caller
+uses, so unwanted sentences cost one slice and a dict lookup), then the
+checksum is verified on the raw buffer, fields are cut with one C-level
+``bytes.split`` limited to the fields the type needs and converted with
+``float()``/``int()`` on the byte slices, so no ``str`` objects are
+created. Handles RMC, GGA, GSA and VTG from any talker (``$GP``, ``$GN``,
+``$GL``, ``$GA``, ...); other sentence types and lines with a missing or
+wrong checksum yield ``None``.
+
+Per sentence this is about 3-4 us for RMC/GGA, a little faster than
+pynmea2. Through a real serial port the pyserial ``readline()`` costs far
+more than either parser (see ``Test/gps_replay_bench.py``), so the saving
+there comes from skipping unwanted sentence types, not from parsing.
+
+Results are ``NMEAFix`` records (``__slots__``, no per-instance dict). Only
+the fields carried by the sentence type are filled, the rest stay ``None``.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from functools import reduce
+from operator import xor
+from typing import Container, Optional
+
+_HEX_VALUES = {b"%02X" % n: n for n in range(256)}
+_HEX_VALUES.update({b"%02x" % n: n for n in range(256)})
+_KINDS = {b"RMC": "RMC", b"GGA": "GGA", b"GSA": "GSA", b"VTG": "VTG"}
+KINDS = tuple(_KINDS.values())
+# Highest field index each type reads, the split's maxsplit.
+_LAST_FIELD = {b"RMC": 10, b"GGA": 10, b"GSA": 18, b"VTG": 8}
+_dates: dict = {}  # ddmmyy -> date; one entry per day seen
+_TALKERS: dict = {}
+
+
+class NMEAFix:
+    __slots__ = (
+        "kind",
+        "talker",
+        "valid",
+        "latitude",
+        "longitude",
+        "time_of_day",
+        "date",
+        "quality",
+        "satellites",
+        "hdop",
+        "altitude",
+        "fix_type",
+        "pdop",
+        "vdop",
+        "speed_knots",
+        "course",
+    )
+
+    def __init__(self, kind: str, talker: str):
+        self.kind = kind
+        self.talker = talker
+        self.valid = False
+        self.latitude: Optional[float] = None
+        self.longitude: Optional[float] = None
+        self.time_of_day: Optional[float] = None  # seconds since 00:00 UTC
+        self.date: Optional[date] = None
+        self.quality: Optional[int] = None
+        self.satellites: Optional[int] = None
+        self.hdop: Optional[float] = None
+        self.altitude: Optional[float] = None
+        self.fix_type: Optional[int] = None
+        self.pdop: Optional[float] = None
+        self.vdop: Optional[float] = None
+        self.speed_knots: Optional[float] = None
+        self.course: Optional[float] = None
+
+    def timestamp(self, on: Optional[date] = None) -> Optional[datetime]:
+        """UTC datetime from this sentence's time and its own (or the given) date."""
+        day = self.date or on
+        if day is None or self.time_of_day is None:
+            return None
+        midnight = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        return midnight + timedelta(seconds=self.time_of_day)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        )
+        return f"NMEAFix({fields})"
+
+
+def _xor_bytes(data: bytes) -> int:
+    # XOR of all bytes by folding one big integer onto itself: seven shifts
+    # instead of one Python-level step per byte. Valid up to 128 bytes, which
+    # covers the 82-character NMEA maximum.
+    if len(data) > 128:
+        return reduce(xor, data, 0)
+    x = int.from_bytes(data, "little")
+    x ^= x >> 512
+    x ^= x >> 256
+    x ^= x >> 128
+    x ^= x >> 64
+    x ^= x >> 32
+    x ^= x >> 16
+    x ^= x >> 8
+    return x & 0xFF
+
+
+def _checksum_ok(line: bytes, star: int) -> bool:
+    if star < 1 or line[:1] != b"$" or len(line) < star + 3:
+        return False
+    given = _HEX_VALUES.get(line[star + 1 : star + 3])
+    return given is not None and _xor_bytes(line[1:star]) == given
+
+
+def checksum_ok(line: bytes) -> bool:
+    """Validate ``$...*HH``; the XOR runs over the bytes between ``$`` and ``*``."""
+    return _checksum_ok(line, line.rfind(b"*"))
+
+
+def _coord(raw: bytes, hemi: bytes) -> Optional[float]:
+    # ddmm.mmmm / dddmm.mmmm: one float conversion, degrees split arithmetically.
+    if not raw or not hemi:
+        return None
+    value = float(raw)
+    degrees = value // 100
+    value = degrees + (value - degrees * 100) / 60.0
+    return -value if hemi in (b"S", b"W") else value
+
+
+def _time(raw: bytes) -> Optional[float]:
+    # hhmmss.ss -> seconds since midnight.
+    if len(raw) < 6:
+        return None
+    value = float(raw)
+    hours, rest = divmod(value, 10000)
+    minutes, seconds = divmod(rest, 100)
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _float(raw: bytes) -> Optional[float]:
+    return float(raw) if raw else None
+
+
+def _int(raw: bytes) -> Optional[int]:
+    return int(raw) if raw else None
+
+
+def _date(raw: bytes) -> date:
+    day = _dates.get(raw)
+    if day is None:
+        day = date(2000 + int(raw[4:6]), int(raw[2:4]), int(raw[0:2]))
+        if len(_dates) > 8:
+            _dates.clear()
+        _dates[raw] = day
+    return day
+
+
+def parse(line, kinds: Container[str] = KINDS) -> Optional[NMEAFix]:
+    """Parse one sentence (``bytes`` or ``str``); ``None`` if unsupported or corrupt.
+
+    ``kinds`` limits the accepted sentence types, e.g. ``("RMC", "GGA")``.
+    """
+    if isinstance(line, str):
+        line = line.encode("ascii", errors="replace")
+    line = line.strip()
+    kind = line[3:6]
+    name = _KINDS.get(kind)
+    if name is None or name not in kinds:
+        return None
+    star = line.rfind(b"*")
+    if not _checksum_ok(line, star):
+        return None
+
+    f = line[:star].split(b",", _LAST_FIELD[kind])
+    talker = _TALKERS.get(line[1:3])
+    if talker is None:
+        talker = _TALKERS.setdefault(
+            line[1:3], line[1:3].decode("ascii", errors="replace")
+        )
+    fix = NMEAFix(name, talker)
+    try:
+        if kind == b"RMC" and len(f) >= 10:
+            fix.time_of_day = _time(f[1])
+            fix.valid = f[2] == b"A"
+            fix.latitude = _coord(f[3], f[4])
+            fix.longitude = _coord(f[5], f[6])
+            fix.speed_knots = _float(f[7])
+            fix.course = _float(f[8])
+            if len(f[9]) == 6:
+                fix.date = _date(f[9])
+        elif kind == b"GGA" and len(f) >= 10:
+            fix.time_of_day = _time(f[1])
+            fix.latitude = _coord(f[2], f[3])
+            fix.longitude = _coord(f[4], f[5])
+            fix.quality = _int(f[6]) or 0
+            fix.valid = fix.quality > 0
+            fix.satellites = _int(f[7])
+            fix.hdop = _float(f[8])
+            fix.altitude = _float(f[9])
+        elif kind == b"GSA" and len(f) >= 18:
+            fix.fix_type = _int(f[2]) or 1
+            fix.valid = fix.fix_type > 1
+            fix.pdop = _float(f[15])
+            fix.hdop = _float(f[16])
+            fix.vdop = _float(f[17])
+        elif kind == b"VTG" and len(f) >= 8:
+            fix.course = _float(f[1])
+            fix.speed_knots = _float(f[5])
+            fix.valid = fix.speed_knots is not None
+        else:
+            return None
+    except ValueError:
+        return None
+    return fix
@@ -0,0 +1,182 @@
+"""Servo PWM channels: RPi.GPIO software PWM, sysfs hardware PWM, or a recorder.
+
+``RPi.GPIO.PWM`` times pulses in a userspace thread: the pulse width
+jitters with CPU load (servo buzz and creep) and the thread costs CPU for
+as long as the channel is on. The Pi's PWM peripheral produces the same
+50 Hz pulses in hardware. ``open_channel(pin, frequency, backend)`` returns
+one of:
+
+* ``"gpio"`` -- ``GPIOChannel``, the original RPi.GPIO software PWM.
+* ``"sysfs"`` -- ``SysfsChannel``, hardware PWM through ``/sys/class/pwm``
+  (needs ``dtoverlay=pwm-2chan`` with the servo pins in ``config.txt``).
+  ``SYSFS_CHANNELS`` maps BCM pins to chip channels. The default is the Pi 5
+  (RP1) layout, where GPIO 12/13/18/19 are channels 0/1/2/3. On a Pi 4,
+  GPIO 12 and 18 are both PWM0 and cannot carry two servos, so either
+  channel map is checked for that clash up front. ``PWM_SYSFS_ROOT``
+  points the backend at another directory, so a fake tree exercises it on
+  any Linux box.
+* ``"fake"`` -- ``RecordingChannel``, no hardware; records ``(time, duty)``
+  for tests, benchmarks and running without servos.
+
+All channels take duty in percent (``set_duty``); 0 stops the pulses, which
+lets a servo at rest stop hunting.
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+SYSFS_ROOT = os.getenv("PWM_SYSFS_ROOT", "/sys/class/pwm")
+SYSFS_CHIP = int(os.getenv("PWM_SYSFS_CHIP", "0"))
+# "pin:channel,..." -- default: Raspberry Pi 5 RP1 PWM0
+SYSFS_CHANNELS: Dict[int, int] = {
+    int(pin): int(channel)
+    for pin, channel in (
+        item.split(":")
+        for item in os.getenv("PWM_SYSFS_CHANNELS", "12:0,13:1,18:2,19:3").split(",")
+    )
+}
+EXPORT_TIMEOUT = 1.0  # udev needs a moment to create and chown pwmN after export
+
+BACKENDS = ("gpio", "sysfs", "fake")
+
+
+class PWMChannel:
+    """One servo output; ``set_duty`` in percent, 0 turns the pulses off."""
+
+    backend = ""
+
+    def __init__(self, pin: int, frequency: float):
+        self.pin = pin
+        self.frequency = frequency
+        self.duty = 0.0
+
+    def set_duty(self, duty: float) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class GPIOChannel(PWMChannel):
+    backend = "gpio"
+
+    def __init__(self, pin: int, frequency: float):
+        super().__init__(pin, frequency)
+        import RPi.GPIO as GPIO  # type: ignore
+
+        self._gpio = GPIO
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+        GPIO.setup(pin, GPIO.OUT)
+        self._pwm = GPIO.PWM(pin, frequency)
+        self._pwm.start(0)
+
+    def set_duty(self, duty: float) -> None:
+        self._pwm.ChangeDutyCycle(duty)
+        self.duty = duty
+
+    def close(self) -> None:
+        self._pwm.stop()
+        self._gpio.cleanup(self.pin)
+
+
+def check_channels(pins, channels: Dict[int, int] = SYSFS_CHANNELS) -> None:
+    """Raise ``ValueError`` unless every pin has its own hardware channel."""
+    used: Dict[int, int] = {}
+    for pin in pins:
+        if pin not in channels:
+            raise ValueError(
+                f"GPIO {pin} has no hardware PWM channel (PWM_SYSFS_CHANNELS)"
+            )
+        channel = channels[pin]
+        if channel in used:
+            raise ValueError(
+                f"GPIO {pin} and GPIO {used[channel]} share PWM channel {channel}"
+            )
+        used[channel] = pin
+
+
+class SysfsChannel(PWMChannel):
+    backend = "sysfs"
+
+    def __init__(
+        self,
+        pin: int,
+        frequency: float,
+        root: Optional[str] = None,
+        chip: Optional[int] = None,
+        channels: Optional[Dict[int, int]] = None,
+    ):
+        super().__init__(pin, frequency)
+        channels = SYSFS_CHANNELS if channels is None else channels
+        check_channels([pin], channels)
+        self.channel = channels[pin]
+        self.chip_path = os.path.join(
+            SYSFS_ROOT if root is None else root,
+            f"pwmchip{SYSFS_CHIP if chip is None else chip}",
+        )
+        self.path = os.path.join(self.chip_path, f"pwm{self.channel}")
+        self._exported = False
+        if not os.path.isdir(self.path):
+            self._write(os.path.join(self.chip_path, "export"), self.channel)
+            self._exported = True
+            deadline = time.monotonic() + EXPORT_TIMEOUT
+            while not os.access(os.path.join(self.path, "enable"), os.W_OK):
+                if time.monotonic() > deadline:
+                    raise OSError(f"{self.path} did not appear after export")
+                time.sleep(0.01)
+        self.period_ns = int(round(1e9 / frequency))
+        self._attr("duty_cycle", 0)  # duty must stay <= period while the period changes
+        self._attr("period", self.period_ns)
+        self._attr("enable", 1)
+
+    @staticmethod
+    def _write(path: str, value) -> None:
+        with open(path, "w") as f:
+            f.write(f"{value}\n")
+
+    def _attr(self, name: str, value) -> None:
+        self._write(os.path.join(self.path, name), value)
+
+    def set_duty(self, duty: float) -> None:
+        self._attr("duty_cycle", int(self.period_ns * max(0.0, min(100.0, duty)) / 100))
+        self.duty = duty
+
+    def close(self) -> None:
+        try:
+            self._attr("enable", 0)
+            if self._exported:
+                self._write(os.path.join(self.chip_path, "unexport"), self.channel)
+        except OSError:
+            pass
+
+
+class RecordingChannel(PWMChannel):
+    """No hardware: keeps every ``(time, duty)`` in ``log``."""
+
+    backend = "fake"
+
+    def __init__(
+        self,
+        pin: int = 0,
+        frequency: float = 50,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        super().__init__(pin, frequency)
+        self.log: List[Tuple[float, float]] = []
+        self._clock = clock
+
+    def set_duty(self, duty: float) -> None:
+        self.duty = duty
+        self.log.append((self._clock(), duty))
+
+
+def open_channel(pin: int, frequency: float, backend: str = "gpio") -> PWMChannel:
+    if backend == "gpio":
+        return GPIOChannel(pin, frequency)
+    if backend == "sysfs":
+        return SysfsChannel(pin, frequency)
+    if backend == "fake":
+        return RecordingChannel(pin, frequency)
+    raise ValueError(f"unknown PWM backend {backend!r} (one of {', '.join(BACKENDS)})")
@@ -0,0 +1,254 @@
+"""Multi-rate sensor scheduler with a shared latest-value table.
+
+Each sensor runs at its own cadence (``sample_interval`` in the hardware
+config: INA219 1 s, DHT11 10 s, ...) instead of everything being read in
+sequence whenever a consumer asks. One scheduler thread keeps a heap of
+``(due, task)`` entries and hands each due read to a small worker pool, so
+a slow read (a GPS ``readline`` waiting out its serial timeout) delays only
+its own sensor. Results are published to a ``LatestTable``; consumers take
+the newest value and its age from there and never call into a driver.
+
+Per task the scheduler records jitter (how late a read started relative to
+its slot) and missed deadlines: slots skipped because the previous read of
+that sensor was still running, or because the scheduler itself fell behind.
+Missed slots are dropped rather than made up, so a sensor that stalls does
+not come back with a burst of catch-up reads. A read that returns None
+publishes nothing (no new data); an exception is counted as an error and
+leaves the previous value in the table. A read that returns a driver's
+cached value can say how old it already was (``age``), and the sample is
+then dated back to when the value was actually measured.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class Sample(NamedTuple):
+    value: Any
+    # When the value was measured (time.monotonic): read start, minus its age if cached.
+    monotonic: float
+    timestamp: float  # same instant on the scheduler's wall clock
+    duration: float  # seconds from then until the value was published
+
+
+class LatestTable:
+    """Newest sample per sensor; readers never wait on a sensor."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Sample] = {}
+
+    def publish(self, name: str, sample: Sample) -> None:
+        with self._lock:
+            self._samples[name] = sample
+
+    def get(self, name: str) -> Optional[Sample]:
+        with self._lock:
+            return self._samples.get(name)
+
+    def age(self, name: str) -> Optional[float]:
+        sample = self.get(name)
+        return None if sample is None else time.monotonic() - sample.monotonic
+
+    def snapshot(self) -> Dict[str, Sample]:
+        with self._lock:
+            return dict(self._samples)
+
+
+class TaskStats:
+    __slots__ = (
+        "runs",
+        "errors",
+        "missed",
+        "jitter_s",
+        "max_jitter_s",
+        "duration_s",
+        "max_duration_s",
+        "last_error",
+    )
+
+    def __init__(self):
+        self.runs = 0
+        self.errors = 0
+        self.missed = 0
+        self.jitter_s = 0.0
+        self.max_jitter_s = 0.0
+        self.duration_s = 0.0
+        self.max_duration_s = 0.0
+        self.last_error: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "missed": self.missed,
+            "mean_jitter_ms": (
+                round(self.jitter_s / self.runs * 1000, 3) if self.runs else None
+            ),
+            "max_jitter_ms": round(self.max_jitter_s * 1000, 3),
+            "mean_duration_ms": (
+                round(self.duration_s / self.runs * 1000, 3) if self.runs else None
+            ),
+            "max_duration_ms": round(self.max_duration_s * 1000, 3),
+            "last_error": self.last_error,
+        }
+
+
+class SensorTask:
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        read: Callable[[], Any],
+        age: Optional[Callable[[Any], float]] = None,
+    ):
+        self.name = name
+        self.interval = interval
+        self.read = read
+        self.age = age  # seconds a returned value was already old (a driver's cache)
+        self.busy = False  # a read is in flight
+        self.stats = TaskStats()
+
+
+class SensorScheduler:
+    def __init__(
+        self,
+        table: Optional[LatestTable] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.table = table or LatestTable()
+        self._clock = clock  # wall time for published samples (e.g. ClockService.time)
+        self._tasks: Dict[str, SensorTask] = {}
+        self._heap: List[tuple] = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def add(
+        self,
+        name: str,
+        interval: float,
+        read: Callable[[], Any],
+        offset: float = 0.0,
+        age: Optional[Callable[[Any], float]] = None,
+    ) -> SensorTask:
+        """Run ``read`` every ``interval`` seconds, first after ``offset`` seconds.
+
+        ``age(value)`` returns how old a value already was when ``read``
+        returned it; the published sample is dated back by that much.
+        """
+        if interval <= 0:
+            raise ValueError(f"{name}: interval must be positive")
+        task = self._tasks[name] = SensorTask(name, interval, read, age)
+        with self._cond:
+            heapq.heappush(
+                self._heap, (time.monotonic() + offset, next(self._order), task)
+            )
+            self._cond.notify()
+        return task
+
+    # --- Thread ---
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop = False
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, len(self._tasks)), thread_name_prefix="sensor"
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="sensor-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._pool:
+            self._pool.shutdown(wait=False)
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stop:
+                    return
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, _, task = self._heap[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                now = time.monotonic()
+                # Next slot on the task's own grid; slots already past are missed.
+                skipped = math.floor((now - due) / task.interval)
+                if skipped:
+                    task.stats.missed += skipped
+                heapq.heappush(
+                    self._heap,
+                    (due + (skipped + 1) * task.interval, next(self._order), task),
+                )
+            self._dispatch(task, due + skipped * task.interval)
+
+    def _dispatch(self, task: SensorTask, due: float) -> None:
+        if task.busy:
+            task.stats.missed += 1  # previous read still running
+            return
+        task.busy = True
+        self._pool.submit(self._execute, task, due)
+
+    def _execute(self, task: SensorTask, due: Optional[float]) -> Any:
+        started = time.monotonic()
+        timestamp = self._clock()
+        stats = task.stats
+        try:
+            value = task.read()
+        except Exception as exc:
+            stats.errors += 1
+            stats.last_error = str(exc)
+            value = None
+        finally:
+            duration = time.monotonic() - started
+            stats.runs += 1
+            stats.duration_s += duration
+            stats.max_duration_s = max(stats.max_duration_s, duration)
+            if due is not None:
+                jitter = max(started - due, 0.0)
+                stats.jitter_s += jitter
+                stats.max_jitter_s = max(stats.max_jitter_s, jitter)
+        if value is not None:
+            age = task.age(value) if task.age is not None else 0.0
+            self.table.publish(
+                task.name, Sample(value, started - age, timestamp - age, duration + age)
+            )
+        task.busy = False
+        return value
+
+    def run_now(self, name: str) -> Any:
+        """Read one sensor immediately on the calling thread (also publishes)."""
+        return self._execute(self._tasks[name], None)
+
+    def stats(self) -> Dict[str, dict]:
+        result = {}
+        for name, task in self._tasks.items():
+            age = self.table.age(name)
+            result[name] = dict(
+                task.stats.as_dict(),
+                interval=task.interval,
+                age=None if age is None else round(age, 3),
+            )
+        return result
@@ -0,0 +1,108 @@
+"""Per-servo kinematic model: how long to hold the pulses after a move.
+
+The servos have no position feedback, so after the last setpoint the
+controller has to guess when the horn has arrived before it stops the
+pulses. A fixed 0.4 s was both too long (a 0.5 degree tracking correction
+held the bus-powered servos for 0.4 s) and too short (a loaded 180 degree
+swing takes the better part of a second). ``ServoModel`` predicts it
+instead::
+
+    hold = max(distance / speed - commanded, 0) + settle
+
+``speed`` is the servo's loaded slew rate in deg/s, ``commanded`` is how
+long the setpoints themselves took to get there (the trapezoidal
+trajectory; 0 for a jump) and ``settle`` covers the last frames of the
+servo's own control loop. The defaults come from the datasheets derated for
+the panel: MG996R 0.17 s/60 deg and MG995 0.20 s/60 deg unloaded at 4.8 V.
+Set ``motors.x_axis.speed_dps`` / ``settle_s`` (and ``y_axis``) in the
+hardware config, or feed measured moves (from a calibration run, a camera,
+a feedback servo) to ``observe()``, which learns the speed as a moving
+average.
+
+``MoveStats`` keeps what the controller commanded for each move, for
+``/health``: how long the setpoints streamed (the trajectory) and how long
+the pulses were then held. Both are our own timings, not a measurement of
+when the horn arrived -- nothing on the board senses the servo position or
+current -- so they show what the model costs, not how accurate it is.
+"""
+
+from typing import Optional
+
+DEFAULT_SETTLE_S = 0.04  # two 20 ms PWM frames for the servo to latch and settle
+MG996R_SPEED_DPS = 250.0  # 350 deg/s unloaded, derated for the panel
+MG995_SPEED_DPS = 200.0  # 300 deg/s unloaded
+LEARN_RATE = 0.2
+
+
+class ServoModel:
+    def __init__(
+        self,
+        speed_dps: float,
+        settle_s: float = DEFAULT_SETTLE_S,
+        learn_rate: float = LEARN_RATE,
+    ):
+        self.speed_dps = speed_dps
+        self.settle_s = settle_s
+        self.learn_rate = learn_rate
+        self.observed = 0
+
+    def travel_time(self, distance: float) -> float:
+        return abs(distance) / self.speed_dps
+
+    def hold_time(self, distance: float, commanded_s: float = 0.0) -> float:
+        """Seconds to keep pulses on after the last setpoint of a ``distance`` move."""
+        return max(self.travel_time(distance) - commanded_s, 0.0) + self.settle_s
+
+    def observe(self, distance: float, seconds: float) -> None:
+        """Learn the speed from one timed rest-to-rest move (settle included)."""
+        moving = seconds - self.settle_s
+        if abs(distance) < 1.0 or moving <= 0:
+            return  # too short to say anything about the slew rate
+        self.speed_dps += self.learn_rate * (abs(distance) / moving - self.speed_dps)
+        self.observed += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "speed_dps": round(self.speed_dps, 1),
+            "settle_s": self.settle_s,
+            "observed": self.observed,
+        }
+
+
+class MoveStats:
+    """Commanded trajectory and hold durations per move (``cut_short``: preempted)."""
+
+    def __init__(self):
+        self.count = 0
+        self.cut_short = 0
+        self.trajectory_s = 0.0
+        self.hold_s = 0.0
+        self.max_hold_s = 0.0
+        self.last_trajectory_s: Optional[float] = None
+        self.last_hold_s: Optional[float] = None
+
+    def record(self, trajectory: float, hold: float, completed: bool = True) -> None:
+        self.count += 1
+        if not completed:
+            self.cut_short += 1
+        self.trajectory_s += trajectory
+        self.hold_s += hold
+        self.max_hold_s = max(self.max_hold_s, hold)
+        self.last_trajectory_s = trajectory
+        self.last_hold_s = hold
+
+    def as_dict(self) -> dict:
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 1)
+
+        return {
+            "moves": self.count,
+            "cut_short": self.cut_short,
+            "mean_trajectory_ms": (
+                ms(self.trajectory_s / self.count) if self.count else None
+            ),
+            "mean_hold_ms": ms(self.hold_s / self.count) if self.count else None,
+            "max_hold_ms": ms(self.max_hold_s),
+            "last_trajectory_ms": ms(self.last_trajectory_s),
+            "last_hold_ms": ms(self.last_hold_s),
+        }
@@ -0,0 +1,201 @@
+"""Vectorized solar ephemeris used by the trackers.
+
+pysolar's ``get_altitude``/``get_azimuth`` evaluate the full SPA periodic
+series once per call, so a day of positions costs thousands of scalar series
+evaluations. This module computes the same quantities for whole arrays of
+timestamps (and, optionally, arrays of latitude/longitude) in a single NumPy
+pass using the Meeus low-precision solar theory (Astronomical Algorithms,
+ch. 25) plus nutation, aberration, topocentric parallax and the NREL/pysolar
+refraction model.
+
+Results follow pysolar's conventions (azimuth clockwise from north, altitude
+including refraction) and agree with it to within ``PYSOLAR_TOLERANCE_DEG``
+for dates between 1950 and 2100 while the sun is above the horizon. The
+azimuth bound is an angular distance on the sky (azimuth error times
+cos(altitude)), since raw azimuth is ill-conditioned near the zenith.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Maximum deviation from pysolar.get_azimuth / get_altitude (degrees).
+PYSOLAR_TOLERANCE_DEG = 0.025
+
+STANDARD_PRESSURE = 101325.0  # Pa, same default as pysolar
+STANDARD_TEMPERATURE = 288.15  # K, same default as pysolar
+
+_UNIX_EPOCH_JD = 2440587.5
+_J2000_JD = 2451545.0
+_DELTA_T_SECONDS = 69.2  # TT - UT, close enough for the 2020s
+_SUN_RADIUS = 0.26667
+_ATMOS_REFRACT = 0.5667
+
+
+def to_epoch_seconds(timestamps) -> np.ndarray:
+    """Convert datetimes, datetime64 values or POSIX seconds to a float array.
+
+    Naive datetimes are treated as UTC (the trackers always pass aware UTC
+    timestamps, matching pysolar's requirement).
+    """
+    if isinstance(timestamps, datetime):
+        timestamps = [timestamps]
+    arr = np.asarray(timestamps)
+    if arr.dtype.kind == "M":
+        return arr.astype("datetime64[us]").astype(np.int64) / 1e6
+    if arr.dtype.kind == "O":
+        out = np.empty(arr.shape, dtype=float)
+        flat = out.reshape(-1)
+        for i, value in enumerate(arr.reshape(-1)):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            flat[i] = value.timestamp()
+        return out
+    return arr.astype(float)
+
+
+def _refraction(elevation: np.ndarray, pressure, temperature) -> np.ndarray:
+    # Same expression as pysolar.solar.get_refraction_correction (NREL SPA).
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = (pressure * 2.830 * 1.02) / (
+            1010.0
+            * temperature
+            * 60.0
+            * np.tan(np.radians(elevation + 10.3 / (elevation + 5.11)))
+        )
+    return np.where(elevation >= -(_SUN_RADIUS + _ATMOS_REFRACT), corr, 0.0)
+
+
+def solar_position(
+    timestamps,
+    latitude,
+    longitude,
+    temperature=STANDARD_TEMPERATURE,
+    pressure=STANDARD_PRESSURE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(azimuth, altitude)`` arrays in degrees.
+
+    ``timestamps``, ``latitude`` and ``longitude`` broadcast against each
+    other, so one site over many instants, many sites at one instant, or
+    matching arrays of both all work.
+    """
+    t_unix = to_epoch_seconds(timestamps)
+    lat = np.radians(np.asarray(latitude, dtype=float))
+    lon = np.asarray(longitude, dtype=float)
+
+    jd = t_unix / 86400.0 + _UNIX_EPOCH_JD
+    jc = (jd + _DELTA_T_SECONDS / 86400.0 - _J2000_JD) / 36525.0
+
+    # Geometric mean longitude, mean anomaly and equation of centre.
+    l0 = 280.46646 + jc * (36000.76983 + 0.0003032 * jc)
+    m = np.radians(357.52911 + jc * (35999.05029 - 0.0001537 * jc))
+    ecc = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+    centre = (
+        np.sin(m) * (1.914602 - jc * (0.004817 + 0.000014 * jc))
+        + np.sin(2 * m) * (0.019993 - 0.000101 * jc)
+        + np.sin(3 * m) * 0.000289
+    )
+    true_long = l0 + centre
+    true_anom = m + np.radians(centre)
+    distance = 1.000001018 * (1 - ecc * ecc) / (1 + ecc * np.cos(true_anom))
+
+    # Nutation (dominant terms) and aberration.
+    omega = np.radians(125.04452 - 1934.136261 * jc)
+    l_sun = np.radians(280.4665 + 36000.7698 * jc)
+    l_moon = np.radians(218.3165 + 481267.8813 * jc)
+    nut_long = (
+        -17.20 * np.sin(omega)
+        - 1.32 * np.sin(2 * l_sun)
+        - 0.23 * np.sin(2 * l_moon)
+        + 0.21 * np.sin(2 * omega)
+    ) / 3600.0
+    nut_obl = (
+        9.20 * np.cos(omega)
+        + 0.57 * np.cos(2 * l_sun)
+        + 0.10 * np.cos(2 * l_moon)
+        - 0.09 * np.cos(2 * omega)
+    ) / 3600.0
+    apparent_long = np.radians(true_long + nut_long - 20.4898 / (3600.0 * distance))
+
+    mean_obl = 23.439291111 - jc * (0.013004167 + jc * (1.6389e-7 - 5.0361e-7 * jc))
+    obliquity = np.radians(mean_obl + nut_obl)
+
+    ra = np.arctan2(np.cos(obliquity) * np.sin(apparent_long), np.cos(apparent_long))
+    decl = np.arcsin(np.sin(obliquity) * np.sin(apparent_long))
+
+    # Apparent sidereal time (UT based) and local hour angle.
+    jd_ut = jd - _J2000_JD
+    jc_ut = jd_ut / 36525.0
+    gmst = (
+        280.46061837
+        + 360.98564736629 * jd_ut
+        + jc_ut * jc_ut * (0.000387933 - jc_ut / 38710000.0)
+    )
+    gast = gmst + nut_long * np.cos(obliquity)
+    hour_angle = np.radians(np.mod(gast + lon - np.degrees(ra), 360.0))
+
+    sin_alt = np.sin(lat) * np.sin(decl) + np.cos(lat) * np.cos(decl) * np.cos(
+        hour_angle
+    )
+    geo_alt = np.degrees(np.arcsin(np.clip(sin_alt, -1.0, 1.0)))
+
+    # Topocentric parallax (8.794" at 1 AU) then atmospheric refraction.
+    parallax = (8.794 / 3600.0) / distance * np.cos(np.radians(geo_alt))
+    topo_alt = geo_alt - parallax
+    altitude = topo_alt + _refraction(topo_alt, pressure, temperature)
+
+    azimuth = np.mod(
+        180.0
+        + np.degrees(
+            np.arctan2(
+                np.sin(hour_angle),
+                np.cos(hour_angle) * np.sin(lat) - np.tan(decl) * np.cos(lat),
+            )
+        ),
+        360.0,
+    )
+    return azimuth, altitude
+
+
+def solar_position_at(
+    latitude: float, longitude: float, timestamp: datetime
+) -> Tuple[float, float]:
+    """Scalar convenience wrapper returning ``(azimuth, altitude)`` floats."""
+    azimuth, altitude = solar_position(timestamp, latitude, longitude)
+    return float(azimuth.reshape(-1)[0]), float(altitude.reshape(-1)[0])
+
+
+def sun_events(
+    latitude: float,
+    longitude: float,
+    when: datetime,
+    horizon: float = 0.0,
+    search_hours: int = 48,
+    step_seconds: int = 60,
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Return the next ``(sunrise, sunset)`` after ``when`` as UTC datetimes.
+
+    Altitude is sampled every ``step_seconds`` over ``search_hours`` in one
+    vectorized call and each horizon crossing is located by linear
+    interpolation (error well under a second). Either value is None if the
+    sun does not cross ``horizon`` in the window (polar day/night).
+    """
+    t0 = float(to_epoch_seconds(when)[0])
+    times = t0 + np.arange(
+        0, search_hours * 3600 + step_seconds, step_seconds, dtype=float
+    )
+    _, altitude = solar_position(times, latitude, longitude)
+    above = altitude > horizon
+
+    def crossing(mask: np.ndarray) -> Optional[datetime]:
+        idx = np.flatnonzero(mask)
+        if idx.size == 0:
+            return None
+        i = int(idx[0])
+        frac = (horizon - altitude[i]) / (altitude[i + 1] - altitude[i])
+        return datetime.fromtimestamp(times[i] + frac * step_seconds, tz=timezone.utc)
+
+    sunrise = crossing(~above[:-1] & above[1:])
+    sunset = crossing(above[:-1] & ~above[1:])
+    return sunrise, sunset
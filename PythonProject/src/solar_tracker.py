@@ -10,51 +10,150 @@ import json
 import os
 import pathlib
 import time
+from concurrent.futures import Future
 from datetime import datetime, timezone
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
-import pynmea2  # type: ignore
-import RPi.GPIO as GPIO  # type: ignore
 import serial  # type: ignore
-from pysolar.solar import get_altitude, get_azimuth  # type: ignore
-from smbus2 import SMBus  # type: ignore
 
-# Optional hardware libs
 try:
-    import adafruit_extended_bus as exbus  # type: ignore
-except Exception:  # pragma: no cover - hardware dependent
-    exbus = None
-try:
-    import board  # type: ignore
-    import busio  # type: ignore
-    from adafruit_ina219 import INA219  # type: ignore
-except Exception:  # pragma: no cover - hardware dependent
-    board = None
-    busio = None
-    INA219 = None  # type: ignore
-try:
-    import adafruit_dht  # type: ignore
-except Exception:  # pragma: no cover - hardware dependent
-    adafruit_dht = None  # type: ignore
+    from .solar_position import solar_position_at
+    from .sun_path import SunPathTable, default_table_path
+    from .tracker_schedule import TrackerScheduler
+    from . import move_plan
+    from .site_lock import StationarySite
+    from .clock import ClockService
+    from . import i2c_bus
+    from .power_sampler import PowerSampler
+    from . import ina219
+    from . import dht_service
+    from . import device_health
+    from .motion_executor import MotionExecutor
+    from . import hardware_config, motion_planner, pwm_backend, servo_model
+    from . import nmea, ubx
+except ImportError:
+    # Allow running as a standalone script (no package parent)
+    from solar_position import solar_position_at  # type: ignore
+    from sun_path import SunPathTable, default_table_path  # type: ignore
+    from tracker_schedule import TrackerScheduler  # type: ignore
+    import move_plan  # type: ignore
+    from site_lock import StationarySite  # type: ignore
+    from clock import ClockService  # type: ignore
+    import i2c_bus  # type: ignore
+    from power_sampler import PowerSampler  # type: ignore
+    import ina219  # type: ignore
+    import dht_service  # type: ignore
+    import device_health  # type: ignore
+    from motion_executor import MotionExecutor  # type: ignore
+    import hardware_config  # type: ignore
+    import motion_planner  # type: ignore
+    import pwm_backend  # type: ignore
+    import servo_model  # type: ignore
+    import nmea  # type: ignore
+    import ubx  # type: ignore
 
 # Defaults (can be overridden via environment variables)
 GPS_PORT = os.getenv("GPS_PORT", "/dev/serial0")
 GPS_BAUD = int(os.getenv("GPS_BAUD", "9600"))
+# Send UBX config at connect (RMC/GGA only, nav rate, power save); 0 to leave the
+# receiver as is.
+GPS_CONFIGURE = os.getenv("GPS_CONFIGURE", "1") == "1"
+# "nmea" (text sentences) or "ubx" (binary NAV messages with accuracy estimates)
+GPS_PROTOCOL = os.getenv("GPS_PROTOCOL", "nmea")
+GPS_MAX_HACC_M = float(
+    os.getenv("GPS_MAX_HACC_M", "50")
+)  # ignore UBX fixes less accurate than this
 SERVO_AZIMUTH_PIN = int(os.getenv("SERVO_AZIMUTH_PIN", "18"))
 SERVO_ALTITUDE_PIN = int(os.getenv("SERVO_ALTITUDE_PIN", "12"))
 DHT_PIN_NAME = os.getenv("DHT_PIN", "D17")  # board pin name for adafruit_dht
-DHT_SENSOR_KIND = os.getenv("DHT_SENSOR", "DHT11")
+DHT_SENSOR_KIND = os.getenv(
+    "DHT_SENSOR", "DHT11"
+)  # read every sensors.dht11.sample_interval s (dht_service)
 I2C_BUS_NUM = int(os.getenv("I2C_BUS", "3"))
+RTC_BUS_NUM = int(os.getenv("RTC_I2C_BUS", "1"))
+INA219_SAMPLE_HZ = float(os.getenv("INA219_SAMPLE_HZ", "20"))  # 0: read once per update
+INA219_SHUNT_OHMS = float(os.getenv("INA219_SHUNT_OHMS", "0.1"))
+INA219_SAMPLES = int(
+    os.getenv("INA219_SAMPLES", "8")
+)  # ADC averaging; conversion must outlast a bus-3 burst
+INA219_AUTORANGE = (
+    os.getenv("INA219_AUTORANGE", "1") == "1"
+)  # pick PGA gain/calibration from the current
+INA219_OVERSAMPLE = int(
+    os.getenv("INA219_OVERSAMPLE", "16")
+)  # samples per tracker reading (median/MAD filtered)
+INA219_OVERSAMPLE_BUDGET = float(
+    os.getenv("INA219_OVERSAMPLE_BUDGET", "0.25")
+)  # seconds
 UPDATE_INTERVAL = int(os.getenv("TRACK_INTERVAL", "60"))
+NIGHT_INTERVAL = int(
+    os.getenv("TRACK_NIGHT_INTERVAL", "1800")
+)  # 0 = sleep straight to dawn
+DAWN_LEAD_SECONDS = int(os.getenv("TRACK_DAWN_LEAD", "600"))
+# Servo-space correction threshold from tracking.correction_threshold;
+# TRACK_CORRECTION_THRESHOLD overrides the config value. 0 moves every cycle.
+CORRECTION_THRESHOLD = float(
+    os.getenv("TRACK_CORRECTION_THRESHOLD")
+    or hardware_config.setting("tracking.correction_threshold", 5.0)
+)
+MAX_TRACK_INTERVAL = int(os.getenv("TRACK_MAX_INTERVAL", "1800"))
+CORRECTION_EPSILON = 0.1
+# Daily move plan (config: tracking.max_cosine_loss): fewest moves keeping the extra
+# cosine loss below this; 0 falls back to the threshold corrections above.
+MAX_COSINE_LOSS = float(
+    hardware_config.setting("tracking.max_cosine_loss", move_plan.DEFAULT_MAX_LOSS)
+)
 AZIMUTH_OFFSET = float(os.getenv("AZIMUTH_OFFSET", "90"))
 ALTITUDE_OFFSET = float(os.getenv("ALTITUDE_OFFSET", "0"))
 PWM_FREQUENCY = 50
+SERVO_PWM_BACKEND = os.getenv(
+    "SERVO_PWM_BACKEND", "gpio"
+)  # gpio (RPi.GPIO), sysfs (hardware PWM) or fake
+# Pulses are held for the predicted travel time plus a settle time, then stopped to
+# avoid jitter.
+SERVO_AZ_SPEED = float(
+    hardware_config.setting("motors.x_axis.speed_dps", servo_model.MG996R_SPEED_DPS)
+)
+SERVO_ALT_SPEED = float(
+    hardware_config.setting("motors.y_axis.speed_dps", servo_model.MG995_SPEED_DPS)
+)
+SERVO_AZ_SETTLE = float(
+    hardware_config.setting("motors.x_axis.settle_s", servo_model.DEFAULT_SETTLE_S)
+)
+SERVO_ALT_SETTLE = float(
+    hardware_config.setting("motors.y_axis.settle_s", servo_model.DEFAULT_SETTLE_S)
+)
+# Trapezoidal moves (config motors.*): a new setpoint every move_delay seconds.
+SMOOTH_MOVE = bool(hardware_config.setting("motors.smooth_move", True))
+MOVE_DELAY = float(
+    hardware_config.setting("motors.move_delay", motion_planner.DEFAULT_MOVE_DELAY)
+)
+_speed, _accel = motion_planner.limits(
+    int(
+        hardware_config.setting("motors.move_steps", motion_planner.DEFAULT_MOVE_STEPS)
+    ),
+    MOVE_DELAY,
+)
+SERVO_MAX_SPEED = float(hardware_config.setting("motors.max_speed", _speed))  # deg/s
+SERVO_MAX_ACCEL = float(hardware_config.setting("motors.max_accel", _accel))  # deg/s^2
 GPS_FIX_TIMEOUT = int(os.getenv("GPS_FIX_TIMEOUT", "60"))
+# Stationary site: lock the position once fixes agree, then only check the GPS
+# occasionally.
+STATIONARY_MODE = os.getenv("TRACK_STATIONARY", "1") == "1"
+SITE_MIN_FIXES = int(os.getenv("SITE_MIN_FIXES", "60"))
+# Until the lock, each GPS session keeps reading SITE_SESSION_SECONDS for fixes
+# SITE_SAMPLE_SPACING apart (about 7 per session, so the lock takes ~9 updates).
+SITE_SESSION_SECONDS = float(os.getenv("SITE_SESSION_SECONDS", "30"))
+SITE_SAMPLE_SPACING = float(os.getenv("SITE_SAMPLE_SPACING", "5"))
+SITE_MAX_SPREAD_M = float(os.getenv("SITE_MAX_SPREAD_M", "5"))
+SITE_CHECK_INTERVAL = int(os.getenv("SITE_CHECK_INTERVAL", str(6 * 3600)))
+SITE_DRIFT_LIMIT_M = float(os.getenv("SITE_DRIFT_LIMIT_M", "100"))
 
 PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
 CACHE_FILE = os.getenv(
     "SOLAR_CACHE_FILE", str(PROJECT_ROOT / "cache" / "solar_tracker_cache.json")
 )
+SUN_PATH_FILE = os.getenv("SUN_PATH_FILE", default_table_path(CACHE_FILE))
 
 
 def _ensure_cache_dir(path: str) -> None:
@@ -68,9 +167,9 @@ def _bcd_to_dec(bcd: int) -> int:
 def read_time_ds3231() -> Optional[datetime]:
     """RTC DS3231 시간 읽기."""
     try:
-        bus = SMBus(1)
-        data = bus.read_i2c_block_data(0x68, 0x00, 7)
-        bus.close()
+        data = i2c_bus.get_bus(RTC_BUS_NUM).read_block(
+            "ds3231", 0x68, 0x00, 7, i2c_bus.PRIORITY_BACKGROUND
+        )
 
         sec = _bcd_to_dec(data[0])
         minute = _bcd_to_dec(data[1])
@@ -103,8 +202,13 @@ class CacheManager:
             print("ℹ 캐시 없음")
         return None
 
-    def save_cache(self, latitude: float, longitude: float) -> None:
-        data = {"latitude": latitude, "longitude": longitude, "timestamp": datetime.now().isoformat()}
+    def save_cache(self, latitude: float, longitude: float, **extra) -> None:
+        data = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "timestamp": datetime.now().isoformat(),
+        }
+        data.update(extra)  # e.g. stationary-site lock (locked, spread_m, fixes)
         try:
             with open(self.cache_file, "w") as f:
                 json.dump(data, f, indent=2)
@@ -114,10 +218,21 @@ class CacheManager:
 
 
 class GPSReader:
-    def __init__(self, port: str, baud: int, cache_manager: CacheManager):
+    def __init__(
+        self,
+        port: str,
+        baud: int,
+        cache_manager: CacheManager,
+        protocol: str = GPS_PROTOCOL,
+        clock: Optional[ClockService] = None,
+    ):
         self.port = port
         self.baud = baud
         self.cache_manager = cache_manager
+        self.protocol = protocol
+        # Every fix time disciplines the clock; the DS3231 covers GPS outages.
+        self.clock = clock or ClockService(read_time_ds3231)
+        self._ubx = ubx.UBXStream() if protocol == "ubx" else None
 
         self.serial = None
         self.latitude: Optional[float] = None
@@ -125,160 +240,375 @@ class GPSReader:
         self.timestamp: Optional[datetime] = None
         self.valid = False
         self.cached_position = None
+        self.fix_type: Optional[int] = None
+        self.h_acc: Optional[float] = None
+        self.fresh = False  # last read_position came from a real fix (False: cache)
+        self.save_fixes = True  # turned off once the stationary site is locked
+        # A missing or unplugged port is reopened with exponential backoff.
+        self.health = device_health.breaker("gps", failure_threshold=1)
 
     def connect(self) -> bool:
         try:
             self.serial = serial.Serial(self.port, self.baud, timeout=1)
             print(f"✓ GPS 연결됨: {self.port}")
-            return True
+            if GPS_CONFIGURE:
+                ubx.configure(self.serial, **ubx.protocol_options(self.protocol))
         except Exception as exc:
-            print(f"✗ GPS 연결 실패: {exc}")
+            self._disconnect(exc)
             return False
+        self.health.success()
+        return True
+
+    def _disconnect(self, error: Exception) -> None:
+        """Drop a failed port and let the breaker decide when to reopen it."""
+        if self.serial is not None:
+            try:
+                self.serial.close()
+            except Exception:
+                pass
+        self.serial = None
+        self.health.failure(error)
 
     def load_cached_position(self) -> bool:
         self.cached_position = self.cache_manager.load_cache()
         if self.cached_position:
             self.latitude = self.cached_position["latitude"]
             self.longitude = self.cached_position["longitude"]
-            self.timestamp = datetime.now(timezone.utc)
+            self.timestamp = self.clock.now()
             self.valid = True
             print("✓ 캐시 기반 임시 위치 사용")
             return True
         return False
 
     def read_position(self, timeout: int = GPS_FIX_TIMEOUT) -> bool:
-        if not self.serial:
+        self.fresh = False
+        if not self.serial and not (self.health.allow() and self.connect()):
             return False
         print(f"GPS Fix 시도 중… 최대 {timeout}초")
-        start = time.time()
-        while time.time() - start < timeout:
-            if self.serial.in_waiting > 0:
-                try:
-                    line = self.serial.readline().decode("ascii", errors="replace").strip()
-                    if line.startswith("$GPRMC") or line.startswith("$GNRMC"):
-                        msg = pynmea2.parse(line)
-                        if msg.status == "A":
-                            self.latitude = msg.latitude
-                            self.longitude = msg.longitude
-                            self.timestamp = datetime.combine(msg.datestamp, msg.timestamp).replace(
-                                tzinfo=timezone.utc
-                            )
-                            self.valid = True
-                            self.cache_manager.save_cache(self.latitude, self.longitude)
-                            print("✓ GPS Fix 성공")
-                            return True
-                except Exception:
-                    pass
+        try:
+            # Drop what piled up since the last read: the kernel keeps the oldest bytes.
+            self.serial.reset_input_buffer()
+        except Exception:
+            pass
+        try:
+            fix = self._next_fix(time.time() + timeout)
+            if fix is not None:
+                self._accept(*fix)
+                return True
+        except (serial.SerialException, OSError) as exc:
+            self._disconnect(exc)
         print("⚠ GPS Fix 실패 → 캐시 사용")
         if self.cached_position:
             self.valid = True
             self.latitude = self.cached_position["latitude"]
             self.longitude = self.cached_position["longitude"]
-            self.timestamp = datetime.now(timezone.utc)
+            self.timestamp = self.clock.now()
             return True
         return False
 
+    def collect_fixes(
+        self, seconds: float, on_fix: Callable[[float, float], bool]
+    ) -> int:
+        """Keep reading for ``seconds``, handing each usable fix to ``on_fix``.
+
+        Stops early once ``on_fix`` returns True; returns the number of fixes read.
+        """
+        if self.serial is None:
+            return 0
+        deadline = time.time() + seconds
+        count = 0
+        try:
+            while True:
+                fix = self._next_fix(deadline)
+                if fix is None:
+                    break
+                count += 1
+                if on_fix(fix[0], fix[1]):
+                    break
+        except (serial.SerialException, OSError) as exc:
+            self._disconnect(exc)
+        return count
+
+    def _next_fix(self, deadline: float) -> Optional[Tuple[float, float, datetime]]:
+        """The next usable fix, or None once ``deadline`` (time.time()) passes."""
+        # Both reads block up to the port timeout (1 s) waiting for data instead of
+        # spinning.
+        while time.time() < deadline:
+            if self._ubx is not None:
+                fix = self._read_ubx()
+                if fix is not None:
+                    return fix
+                continue
+            raw = self.serial.readline()
+            if not raw:
+                continue
+            try:
+                sentence = nmea.parse(raw, ("RMC",))
+            except Exception:
+                continue
+            if (
+                sentence is not None
+                and sentence.kind == "RMC"
+                and sentence.valid
+                and sentence.date is not None
+            ):
+                return sentence.latitude, sentence.longitude, sentence.timestamp()
+        return None
+
+    def _read_ubx(self) -> Optional[Tuple[float, float, datetime]]:
+        try:
+            fixes = self._ubx.read(self.serial)
+        except (serial.SerialException, OSError):
+            raise
+        except Exception:
+            return None
+        for fix in fixes:
+            self.fix_type = fix.fix_type
+            self.h_acc = fix.h_acc
+            if fix.valid and fix.h_acc is not None and fix.h_acc <= GPS_MAX_HACC_M:
+                return fix.latitude, fix.longitude, fix.utc
+        return None
+
+    def _accept(self, latitude: float, longitude: float, when: datetime) -> None:
+        self.latitude = latitude
+        self.longitude = longitude
+        self.timestamp = when
+        self.valid = True
+        self.fresh = True
+        self.clock.add_gps(when)
+        if self.save_fixes:
+            self.cache_manager.save_cache(self.latitude, self.longitude)
+        print("✓ GPS Fix 성공")
+
     def get_position(self) -> dict:
         return {
             "latitude": self.latitude,
             "longitude": self.longitude,
             "timestamp": self.timestamp,
             "valid": self.valid,
+            "fix_type": self.fix_type,
+            "h_acc": self.h_acc,
         }
 
     def close(self) -> None:
         if self.serial:
             self.serial.close()
+            self.serial = None
 
 
 class ServoController:
-    def __init__(self, azimuth_pin: int, altitude_pin: int):
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
-        GPIO.setup(azimuth_pin, GPIO.OUT)
-        GPIO.setup(altitude_pin, GPIO.OUT)
-
-        self.pwm_az = GPIO.PWM(azimuth_pin, PWM_FREQUENCY)
-        self.pwm_alt = GPIO.PWM(altitude_pin, PWM_FREQUENCY)
-        self.pwm_az.start(0)
-        self.pwm_alt.start(0)
+    def __init__(
+        self, azimuth_pin: int, altitude_pin: int, backend: str = SERVO_PWM_BACKEND
+    ):
+        if backend == "sysfs":
+            pwm_backend.check_channels((azimuth_pin, altitude_pin))
+        self.backend = backend
+        self.pwm_az = pwm_backend.open_channel(azimuth_pin, PWM_FREQUENCY, backend)
+        self.pwm_alt = pwm_backend.open_channel(altitude_pin, PWM_FREQUENCY, backend)
         self.current_az = 90
         self.current_alt = 45
+        # Only the motion thread touches the PWM channels.
+        self.motion = MotionExecutor(
+            self._drive, position=lambda: (self.current_az, self.current_alt)
+        )
+        self.model_az = servo_model.ServoModel(SERVO_AZ_SPEED, SERVO_AZ_SETTLE)
+        self.model_alt = servo_model.ServoModel(SERVO_ALT_SPEED, SERVO_ALT_SETTLE)
+        self.move_stats = servo_model.MoveStats()
+        self.planner: Optional[motion_planner.MotionPlanner] = None
+        if SMOOTH_MOVE:
+            self.planner = motion_planner.MotionPlanner(
+                (self.current_az, self.current_alt),
+                SERVO_MAX_SPEED,
+                SERVO_MAX_ACCEL,
+                MOVE_DELAY,
+            )
 
-    def _set_angle(self, pwm, angle: float) -> None:
+    @staticmethod
+    def _duty(angle: float) -> float:
         angle = max(0, min(180, angle))
-        duty = 2.5 + (angle / 180) * 10
-        pwm.ChangeDutyCycle(duty)
-        time.sleep(0.4)
-        pwm.ChangeDutyCycle(0)
+        return 2.5 + (angle / 180) * 10
+
+    def _write(self, azimuth: float, altitude: float) -> None:
+        self.pwm_az.set_duty(self._duty(azimuth))
+        self.pwm_alt.set_duty(self._duty(altitude))
+
+    def _drive(self, azimuth: float, altitude: float) -> bool:
+        """Both axes at once (a trajectory with SMOOTH_MOVE); False if preempted.
+
+        However the move ends (done, preempted on the way or during the hold),
+        the pulses stop and the move is recorded in ``move_stats``.
+        """
+        started = time.perf_counter()
+        holding: Optional[float] = None
+        completed = False
+        distance_az, distance_alt = (
+            azimuth - self.current_az,
+            altitude - self.current_alt,
+        )
+        try:
+            commanded = 0.0
+            if self.planner is not None:
+                reached = self.planner.move(
+                    (azimuth, altitude), self._write, self.motion.preempted
+                )
+                self.current_az, self.current_alt = self.planner.position
+                if not reached:
+                    return False
+                commanded = self.planner.last_planned_s
+            else:
+                self._write(azimuth, altitude)
+            hold = max(
+                self.model_az.hold_time(distance_az, commanded),
+                self.model_alt.hold_time(distance_alt, commanded),
+            )
+            holding = time.perf_counter()
+            completed = not self.motion.preempted(hold)
+            self.current_az = azimuth
+            self.current_alt = altitude
+            return True
+        finally:
+            self.pwm_az.set_duty(0)
+            self.pwm_alt.set_duty(0)
+            ended = time.perf_counter()
+            if holding is None:
+                self.move_stats.record(ended - started, 0.0, completed)
+            else:
+                self.move_stats.record(holding - started, ended - holding, completed)
 
-    def move_to_position(self, azimuth: float, altitude: float) -> None:
+    def timing(self) -> dict:
+        return {
+            "azimuth": self.model_az.as_dict(),
+            "altitude": self.model_alt.as_dict(),
+            "moves": self.move_stats.as_dict(),
+        }
+
+    def move_async(self, azimuth: float, altitude: float) -> Future:
+        """Start a move without waiting; the future resolves to the pose reached.
+
+        That is the target, or, when a newer target superseded this move, the
+        newer target (if the move had not started) or where the servos stopped.
+        """
         print(f"  → 서보 이동: AZ {azimuth:.1f}°, ALT {altitude:.1f}°")
-        self._set_angle(self.pwm_az, azimuth)
-        self._set_angle(self.pwm_alt, altitude)
-        self.current_az = azimuth
-        self.current_alt = altitude
+        return self.motion.submit(azimuth, altitude)
 
-    def reset_position(self) -> None:
+    def move_to_position(self, azimuth: float, altitude: float) -> bool:
+        """Move and wait; False if a newer target superseded this move."""
+        reached = self.move_async(azimuth, altitude).result()
+        if reached == (azimuth, altitude):
+            return True
+        where = (
+            "알 수 없음"
+            if reached is None
+            else f"AZ {reached[0]:.1f}°, ALT {reached[1]:.1f}°"
+        )
+        print(f"  ⚠ 새 목표가 이동을 대체함 (도달: {where})")
+        return False
+
+    def reset_position(self) -> bool:
         print("  초기 위치로 복귀")
-        self.move_to_position(90, 45)
+        return self.move_to_position(90, 45)
 
     def cleanup(self) -> None:
-        self.pwm_az.stop()
-        self.pwm_alt.stop()
-        GPIO.cleanup()
+        self.motion.stop()
+        self.pwm_az.close()
+        self.pwm_alt.close()
 
 
 class PowerSensor:
-    """INA219 wrapper with explicit I2C bus selection."""
+    """INA219 on the shared I2C bus with explicit bus selection (0: board bus 1)."""
 
     def __init__(self, bus_num: int):
         self.bus_num = bus_num
-        self.ina = None
+        self.ina: Optional[ina219.INA219Reader] = None
         self._setup()
 
     def _setup(self):
-        if INA219 is None:
-            print("INA219 라이브러리가 로드되지 않았습니다.")
-            return
-        try:
-            i2c = None
-            if self.bus_num and exbus:
-                i2c = exbus.ExtendedI2C(self.bus_num)
-            elif board and busio:
-                i2c = busio.I2C(board.SCL, board.SDA)
-            else:
-                print("I2C 초기화 실패: board/busio 사용 불가.")
-                return
-            self.ina = INA219(i2c)
-        except Exception as exc:  # pragma: no cover - hardware dependent
-            print(f"INA219 초기화 실패: {exc}")
-            self.ina = None
+        # Kept even if the chip is not found yet: its breaker reprobes the bus.
+        self.ina = ina219.INA219Reader(
+            (self.bus_num or 1,),
+            shunt_ohms=INA219_SHUNT_OHMS,
+            samples=INA219_SAMPLES,
+            autorange=INA219_AUTORANGE,
+        )
 
     def read(self) -> Optional[Tuple[float, float, float]]:
+        """``ina219.Measurement`` (unpacks to V, A, W), or None on error/overflow.
+
+        Also None when no new conversion is ready, so the power sampler does
+        not store the previous one again.
+        """
         if not self.ina:
             return None
-        try:
-            voltage = self.ina.bus_voltage
-            current = self.ina.current / 1000  # mA -> A
-            power = self.ina.power / 1000
-            return voltage, current, power
-        except Exception as exc:
-            print(f"INA219 읽기 실패: {exc}")
+        reading = self.ina.read_new()
+        if reading is None or reading[0] is None or reading[1] is None:
+            return None
+        return reading
+
+    def oversample(self) -> Optional["ina219.Oversampled"]:
+        """Outlier-filtered mean of a burst of readings (None without a usable one)."""
+        if not self.ina:
             return None
+        reading = self.ina.oversample(INA219_OVERSAMPLE, INA219_OVERSAMPLE_BUDGET)
+        return reading if reading.count else None
 
 
 class SolarTracker:
-    def __init__(self, gps_reader: GPSReader, servo_controller: ServoController, power_sensor: PowerSensor):
+    def __init__(
+        self,
+        gps_reader: GPSReader,
+        servo_controller: ServoController,
+        power_sensor: PowerSensor,
+        sun_path: Optional[SunPathTable] = None,
+    ):
         self.gps = gps_reader
         self.servo = servo_controller
         self.power_sensor = power_sensor
+        self.power_sampler: Optional[PowerSampler] = None
+        if INA219_SAMPLE_HZ > 0:
+            self.power_sampler = PowerSampler(power_sensor.read, INA219_SAMPLE_HZ)
+        self.clock = gps_reader.clock
+        self.dht = dht_service.get_service(DHT_PIN_NAME, DHT_SENSOR_KIND)
+        self.sun_path = sun_path or SunPathTable(SUN_PATH_FILE)
+        self.scheduler = TrackerScheduler(
+            UPDATE_INTERVAL, NIGHT_INTERVAL, DAWN_LEAD_SECONDS, MAX_TRACK_INTERVAL
+        )
+        self.night = False
+        self.parked = False
+        self.plan: Optional[move_plan.MovePlan] = None
+        self.last_location: Optional[Tuple[float, float]] = None
+        self.site: Optional[StationarySite] = None
+        if STATIONARY_MODE:
+            self.site = StationarySite(
+                SITE_MIN_FIXES,
+                SITE_MAX_SPREAD_M,
+                SITE_SAMPLE_SPACING,
+                SITE_CHECK_INTERVAL,
+                SITE_DRIFT_LIMIT_M,
+            )
+            if self.site.restore(self.gps.cached_position):
+                self.gps.save_fixes = False
+
+    def _calculate_solar_position(
+        self, latitude: float, longitude: float, timestamp: datetime
+    ) -> Tuple[float, float]:
+        try:
+            return self.sun_path.position(latitude, longitude, timestamp)
+        except Exception as exc:
+            print(f"⚠ 태양 궤적 테이블 조회 실패, 직접 계산: {exc}")
+            return solar_position_at(latitude, longitude, timestamp)
 
-    @staticmethod
-    def _calculate_solar_position(latitude: float, longitude: float, timestamp: datetime) -> Tuple[float, float]:
-        altitude = get_altitude(latitude, longitude, timestamp)
-        azimuth = get_azimuth(latitude, longitude, timestamp)
-        return azimuth, altitude
+    def _prepare_sun_path(self) -> None:
+        """Build (or load) today's sun-path table from the cached site at startup."""
+        if not self.gps.cached_position:
+            return
+        try:
+            self.sun_path.ensure(
+                self.gps.cached_position["latitude"],
+                self.gps.cached_position["longitude"],
+                self.clock.now(),
+            )
+        except Exception as exc:
+            print(f"⚠ 태양 궤적 테이블 준비 실패: {exc}")
 
     @staticmethod
     def _is_daytime(altitude: float) -> bool:
@@ -293,51 +623,242 @@ class SolarTracker:
         servo_alt = max(0, min(90, alt_deg + ALTITUDE_OFFSET))
         return servo_az, servo_alt
 
+    @staticmethod
+    def _servo_to_sun(servo_az: float, servo_alt: float) -> Tuple[float, float]:
+        """Where the panel points (azimuth, altitude) for given servo angles."""
+        return ((servo_az - 90) * 2 + AZIMUTH_OFFSET) % 360, servo_alt - ALTITUDE_OFFSET
+
     def _read_dht(self):
-        if not adafruit_dht or not board:
-            print("  ✗ DHT 라이브러리(board/adafruit_dht) 미설치")
+        self.dht.start()  # no-op once running; the service thread owns the sensor
+        temperature, humidity, age = self.dht.latest()
+        if temperature is None:
+            print(f"  ✗ DHT 측정값 없음 ({self.dht.last_error or '첫 측정 대기 중'})")
             return
-        try:
-            sensor_cls = getattr(adafruit_dht, DHT_SENSOR_KIND, adafruit_dht.DHT11)
-            pin = getattr(board, DHT_PIN_NAME)
-            sensor = sensor_cls(pin)
-            humidity = sensor.humidity
-            temperature = sensor.temperature
-            if humidity is not None and temperature is not None:
-                print(f"  온도: {temperature:.1f}°C")
-                print(f"  습도: {humidity:.1f}%")
-            else:
-                print("  ✗ DHT 측정 실패")
-        except Exception as exc:
-            print(f"  ✗ DHT 오류: {exc}")
+        print(f"  온도: {temperature:.1f}°C")
+        print(f"  습도: {humidity:.1f}% ({age:.0f}초 전 측정)")
 
     def _read_power(self):
-        measurement = self.power_sensor.read()
-        if not measurement:
-            print("  ✗ INA219 읽기 실패 또는 초기화되지 않음")
+        sampler = self.power_sampler
+        if sampler is not None and sampler.running():
+            age = sampler.age()
+            measurement = None
+            ina = self.power_sensor.ina
+            if age is not None and age <= sampler.max_gap and ina is not None:
+                # Floor the MAD at one LSB per channel, as INA219Reader.oversample does.
+                measurement = ina219.summarize(
+                    sampler.recent(INA219_OVERSAMPLE), ina.resolution
+                )
+        else:
+            measurement = self.power_sensor.oversample()
+        if not measurement or measurement[0] is None:
+            ina = self.power_sensor.ina
+            if ina is not None and ina.health.state == device_health.OPEN:
+                print(
+                    f"  ✗ INA219 응답 없음 ({ina.health.retry_in():.0f}초 후 재시도:"
+                    f" {ina.health.last_error})"
+                )
+            else:
+                print("  ✗ INA219 읽기 실패")
             return
         v, a, w = measurement
         print(f"  전압: {v:.2f}V")
-        print(f"  전류: {a:.3f}A")
+        print(
+            f"  전류: {a:.3f}A (±{measurement.spread[1]:.4f}, {measurement.count}개 샘플)"
+        )
         print(f"  전력: {w:.3f}W")
+        if sampler is not None:
+            stats = sampler.stats()
+            print(
+                f"  오늘 발전량: {stats['today_wh']:.3f}Wh ({stats['today_ah']:.4f}Ah)"
+            )
+
+    def _known_location(self) -> Optional[Tuple[float, float]]:
+        if self.last_location:
+            return self.last_location
+        if self.gps.cached_position:
+            return (
+                self.gps.cached_position["latitude"],
+                self.gps.cached_position["longitude"],
+            )
+        return None
+
+    def _park(self) -> None:
+        """Move to the rest position once per night (again next cycle if superseded)."""
+        if not self.parked:
+            self.parked = self.servo.reset_position()
+
+    def _night_update(self, now: datetime) -> bool:
+        """Night cycle without GPS or servo activity; returns False during the day."""
+        location = self._known_location()
+        if location is None:
+            return False
+        latitude, longitude = location
+        _, alt = self._calculate_solar_position(latitude, longitude, now)
+        if self._is_daytime(alt):
+            self.night = False
+            return False
+
+        self.night = True
+        self.scheduler.refresh_events(latitude, longitude, now)
+        print("  상태: 밤 → GPS 생략, 야간 주기로 센서만 측정")
+        self._park()
+        print("\n[센서] 온습도 측정")
+        self._read_dht()
+        print("\n[센서] 전류/전압 측정")
+        self._read_power()
+        return True
+
+    def _locked_location(self) -> Optional[Tuple[float, float, datetime]]:
+        """The locked site and disciplined time, or None when the GPS is needed."""
+        site = self.site
+        if site is None or not site.locked or site.needs_check():
+            return None
+        now = self.clock.now()
+        print(
+            f"  고정 위치 사용: lat={site.latitude:.6f}, lon={site.longitude:.6f} (GPS 대기)"
+        )
+        return site.latitude, site.longitude, now
+
+    def _site_fix(self, latitude: float, longitude: float, timestamp: datetime) -> None:
+        """Feed a fresh fix into site collection, or use it as the periodic check."""
+        site = self.site
+        if site is None:
+            return
+        if not self.gps.fresh:
+            if site.locked:
+                site.last_check = (
+                    time.monotonic()
+                )  # no fix: retry at the next check interval
+            return
+        if site.locked:
+            if not site.check(latitude, longitude):
+                self.gps.save_fixes = True
+                self.gps.cache_manager.save_cache(latitude, longitude)
+                self.gps.cached_position = {
+                    "latitude": latitude,
+                    "longitude": longitude,
+                }
+            return
+        # Updates only come at planned moves, so one fix each would take days to lock.
+        if not site.add_fix(latitude, longitude) and SITE_SESSION_SECONDS > 0:
+            self.gps.collect_fixes(SITE_SESSION_SECONDS, site.add_fix)
+            print(f"  위치 수집: Fix {site.sample_count()}/{site.min_fixes}개")
+        if site.locked:
+            self.gps.save_fixes = False
+            self.gps.cache_manager.save_cache(
+                site.latitude, site.longitude, **site.cache_fields()
+            )
+            self.gps.cached_position = {
+                "latitude": site.latitude,
+                "longitude": site.longitude,
+                "locked": True,
+            }
+
+    def _deviation(self, servo_az: float, servo_alt: float) -> float:
+        return max(
+            abs(servo_az - self.servo.current_az),
+            abs(servo_alt - self.servo.current_alt),
+        )
+
+    def _needs_correction(self, servo_az: float, servo_alt: float) -> bool:
+        return (
+            self._deviation(servo_az, servo_alt)
+            > CORRECTION_THRESHOLD - CORRECTION_EPSILON
+        )
+
+    def _move_plan(
+        self, latitude: float, longitude: float, now: datetime
+    ) -> Optional[move_plan.MovePlan]:
+        """Today's move plan, computed once per day (or when the site changes)."""
+        if MAX_COSINE_LOSS <= 0:
+            return None
+        plan = self.plan
+        if (
+            plan is not None
+            and plan.covers(now.timestamp())
+            and plan.matches(latitude, longitude)
+        ):
+            return plan
+        try:
+            plan = move_plan.plan_day(
+                latitude,
+                longitude,
+                now,
+                self._convert_to_servo,
+                self._servo_to_sun,
+                MAX_COSINE_LOSS,
+            )
+        except Exception as exc:
+            print(f"⚠ 이동 계획 생성 실패, 임계값 보정 사용: {exc}")
+            plan = None
+        if plan is not None and not plan.moves:
+            plan = None
+        self.plan = plan
+        if plan is not None:
+            print(
+                f"  ✓ 이동 계획: 일몰까지 {len(plan.moves)}회"
+                f" (추가 코사인 손실 최대 {plan.worst_loss * 100:.2f}%)"
+            )
+        return plan
+
+    def _follow_plan(self, plan: move_plan.MovePlan, now: datetime) -> None:
+        """Hold the planned pose and sleep until the next planned move."""
+        move = plan.active(now.timestamp())
+        if self._deviation(move.azimuth, move.altitude) > CORRECTION_EPSILON:
+            # Superseded (e.g. a manual target): the next update corrects again.
+            self.servo.move_to_position(move.azimuth, move.altitude)
+            self.parked = False
+        else:
+            print("  보정 생략: 계획된 자세 유지")
+        delay = self.scheduler.follow_plan(plan, now)
+        print(f"  다음 계획 이동: {delay:.0f}초 후")
+
+    def _plan_next_correction(self, latitude: float, longitude: float) -> None:
+        """Schedule the next wake-up for when the sun drifts past the threshold."""
+        if CORRECTION_THRESHOLD <= 0:
+            return
+        delay = self.scheduler.plan_correction(
+            latitude,
+            longitude,
+            self.clock.now(),
+            (self.servo.current_az, self.servo.current_alt),
+            self._convert_to_servo,
+            CORRECTION_THRESHOLD,
+        )
+        print(f"  다음 보정 예상: {delay:.0f}초 후")
+
+    def next_update_delay(self) -> float:
+        return self.scheduler.next_delay(self.clock.now(), self.night)
 
     def update(self) -> bool:
         print("\n" + "=" * 60)
         print("🌞 태양 추적 업데이트")
         print("=" * 60)
 
-        gps_ok = self.gps.read_position()
-        if gps_ok:
+        self.clock.maintain()
+        if self._night_update(self.clock.now()):
+            return True
+
+        located = self._locked_location()
+        if located is not None:
+            latitude, longitude, timestamp = located
+        elif self.gps.read_position():
             pos = self.gps.get_position()
             latitude = pos["latitude"]
             longitude = pos["longitude"]
             timestamp = pos["timestamp"]
+            self._site_fix(latitude, longitude, timestamp)
         else:
-            print("\n⚠ GPS Fix 실패 → RTC 기반 계산 모드")
-            timestamp = read_time_ds3231()
-            if timestamp is None:
+            print("\n⚠ GPS Fix 실패 → RTC/보정 시계 기반 계산 모드")
+            if not self.clock.disciplined():
+                self.clock.sample_rtc()
+            if not self.clock.disciplined():
                 print("✗ RTC 시간 없음 → 추적 중단")
                 return False
+            timestamp = self.clock.now()
+            print(
+                f"  시계 추정 오차 ±{self.clock.error_estimate():.2f}초 ({self.clock.source})"
+            )
             if self.gps.cached_position:
                 latitude = self.gps.cached_position["latitude"]
                 longitude = self.gps.cached_position["longitude"]
@@ -345,19 +866,34 @@ class SolarTracker:
             else:
                 print("✗ 위치 정보 없음 → 초기 위치 유지")
                 self.servo.reset_position()
+                self.parked = True
                 return False
 
+        self.last_location = (latitude, longitude)
+
         az, alt = self._calculate_solar_position(latitude, longitude, timestamp)
         print(f"  태양 방위각: {az:.2f}°")
         print(f"  태양 고도각: {alt:.2f}°")
 
         if self._is_daytime(alt):
             print("  상태: 낮")
-            servo_az, servo_alt = self._convert_to_servo(az, alt)
-            self.servo.move_to_position(servo_az, servo_alt)
+            self.night = False
+            plan = self._move_plan(latitude, longitude, timestamp)
+            if plan is not None:
+                self._follow_plan(plan, timestamp)
+            else:
+                servo_az, servo_alt = self._convert_to_servo(az, alt)
+                if self._needs_correction(servo_az, servo_alt):
+                    self.servo.move_to_position(servo_az, servo_alt)
+                    self.parked = False
+                else:
+                    print(f"  보정 생략: 서보 오차 {CORRECTION_THRESHOLD}° 이내")
+                self._plan_next_correction(latitude, longitude)
         else:
             print("  상태: 밤 → 초기 위치로 이동")
-            self.servo.reset_position()
+            self._park()
+            self.night = True
+            self.scheduler.refresh_events(latitude, longitude, self.clock.now())
 
         print("\n[센서] 온습도 측정")
         self._read_dht()
@@ -371,14 +907,20 @@ class SolarTracker:
         print("║            🌞 태양 추적 시스템 시작            ║")
         print("╚═══════════════════════════════════════════════╝\n")
 
+        self._prepare_sun_path()
+        if self.power_sampler is not None:
+            self.power_sampler.start()
         self.servo.reset_position()
+        self.parked = True
         time.sleep(2)
         try:
             while True:
                 self.update()
-                print(f"\n다음 업데이트까지 {UPDATE_INTERVAL}초 대기…")
-                time.sleep(UPDATE_INTERVAL)
+                delay = self.next_update_delay()
+                print(f"\n다음 업데이트까지 {delay:.0f}초 대기…")
+                time.sleep(delay)
         finally:
+            self.dht.close()
             self.servo.cleanup()
             self.gps.close()
 
@@ -16,17 +16,29 @@ import time
 import json
 import os
 import threading
-import pynmea2
-import RPi.GPIO as GPIO
-from datetime import datetime, timezone
-
-# 태양 위치 계산 라이브러리
-from pysolar.solar import get_altitude, get_azimuth
-
-# 추가 센서
-import adafruit_dht
-import board
-from smbus2 import SMBus
+from datetime import datetime, timedelta, timezone
+
+# 태양 위치 계산 (NumPy 벡터화 엔진, pysolar 대비 오차 PYSOLAR_TOLERANCE_DEG 이내)
+from solar_position import solar_position_at
+from sun_path import SunPathTable, default_table_path
+from tracker_schedule import TrackerScheduler
+import move_plan
+from site_lock import StationarySite, distance_m
+from clock import ClockService
+from power_sampler import PowerSampler
+from ina219 import INA219Reader, summarize
+import i2c_bus
+import nmea
+import ubx
+import hardware_config
+import device_health
+from motion_executor import MotionExecutor
+import motion_planner
+import pwm_backend
+import servo_model
+
+# 추가 센서 (DHT11은 dht_service가 board/adafruit_dht로 한 번만 생성)
+import dht_service
 
 # ============================================================
 # 설정
@@ -34,19 +46,79 @@ from smbus2 import SMBus
 
 GPS_PORT = "/dev/serial0"
 GPS_BAUD = 9600
+GPS_CONFIGURE = True  # 연결 시 UBX로 RMC/GGA만 출력 + 측위 주기 + 절전 모드 설정
+GPS_PROTOCOL = os.getenv(
+    "GPS_PROTOCOL", "nmea"
+)  # "ubx" → NMEA 끄고 UBX NAV 바이너리 수신
+GPS_MAX_HACC_M = 50.0  # UBX 수평 정확도(hAcc)가 이보다 나쁘면 Fix 무시
 
 CACHE_FILE = "/home/user/cache/solar_tracker_cache.json"
+SUN_PATH_FILE = default_table_path(CACHE_FILE)  # 일별 태양 궤적 테이블 (캐시 파일 옆)
 
-SERVO_AZIMUTH_PIN = 18   # 방위각 서보 (MG996R)
+SERVO_AZIMUTH_PIN = 18  # 방위각 서보 (MG996R)
 SERVO_ALTITUDE_PIN = 12  # 고도각 서보 (MG995)
 
 PWM_FREQUENCY = 50
-UPDATE_INTERVAL = 60   # 1분 간격
+# "gpio"(RPi.GPIO 소프트웨어 PWM), "sysfs"(하드웨어 PWM, dtoverlay=pwm-2chan 필요),
+# "fake"(하드웨어 없이 기록만)
+SERVO_PWM_BACKEND = os.getenv("SERVO_PWM_BACKEND", "gpio")
+# 이동 후 펄스 유지 시간 = 예상 이동 시간(거리/속도) + 안정화 시간, 이후 떨림 방지를 위해 펄스 정지
+SERVO_AZ_SPEED = float(
+    hardware_config.setting("motors.x_axis.speed_dps", servo_model.MG996R_SPEED_DPS)
+)  # °/s
+SERVO_ALT_SPEED = float(
+    hardware_config.setting("motors.y_axis.speed_dps", servo_model.MG995_SPEED_DPS)
+)
+SERVO_AZ_SETTLE = float(
+    hardware_config.setting("motors.x_axis.settle_s", servo_model.DEFAULT_SETTLE_S)
+)
+SERVO_ALT_SETTLE = float(
+    hardware_config.setting("motors.y_axis.settle_s", servo_model.DEFAULT_SETTLE_S)
+)
+# 부드러운 이동 (config.json motors.*): 사다리꼴 속도 프로파일, move_delay마다 목표 각도 갱신
+SMOOTH_MOVE = bool(hardware_config.setting("motors.smooth_move", True))
+MOVE_DELAY = float(
+    hardware_config.setting("motors.move_delay", motion_planner.DEFAULT_MOVE_DELAY)
+)
+_speed, _accel = motion_planner.limits(
+    int(
+        hardware_config.setting("motors.move_steps", motion_planner.DEFAULT_MOVE_STEPS)
+    ),
+    MOVE_DELAY,
+)
+SERVO_MAX_SPEED = float(hardware_config.setting("motors.max_speed", _speed))  # °/s
+SERVO_MAX_ACCEL = float(hardware_config.setting("motors.max_accel", _accel))  # °/s²
+UPDATE_INTERVAL = 60  # 1분 간격
+NIGHT_INTERVAL = 1800  # 야간 센서 측정 간격 (0이면 일출 직전까지 대기)
+DAWN_LEAD_SECONDS = 600  # 일출 몇 초 전에 주간 주기로 복귀할지
+# 서보 보정 임계값(°, config의 tracking.correction_threshold, TRACK_CORRECTION_THRESHOLD로 덮어쓰기):
+# 목표가 이만큼 벗어날 때만 이동 (0이면 매 주기 이동)
+CORRECTION_THRESHOLD = float(
+    os.getenv("TRACK_CORRECTION_THRESHOLD")
+    or hardware_config.setting("tracking.correction_threshold", 5.0)
+)
+MAX_TRACK_INTERVAL = 1800  # 임계값에 도달하지 않아도 낮에는 최대 이 간격마다 갱신
+CORRECTION_EPSILON = 0.1  # 예약된 시각에 깨어났을 때의 보간 오차 허용
+# 하루 이동 계획: 추가 코사인 손실이 이 값 이하가 되는 최소 이동
+# (config의 tracking.max_cosine_loss, 0이면 임계값 보정 사용)
+MAX_COSINE_LOSS = float(
+    hardware_config.setting("tracking.max_cosine_loss", move_plan.DEFAULT_MAX_LOSS)
+)
 
 AZIMUTH_OFFSET = 90
 ALTITUDE_OFFSET = 0
 
-GPS_FIX_TIMEOUT = 60  # GPS Fix 최대 대기
+GPS_FIX_TIMEOUT = 60  # GPS Fix 최대 대기 (스트리밍 미사용 시)
+GPS_FIX_MAX_AGE = 120  # 스트리밍 Fix가 이보다 오래되면 캐시 사용
+GPS_CACHE_MIN_MOVE_M = 10  # 위치가 이만큼 바뀔 때만 캐시 저장
+STATIONARY_MODE = (
+    True  # 고정 설치: 위치가 안정되면 고정하고 GPS는 가끔 시각/위치 점검만
+)
+SITE_MIN_FIXES = 60  # 위치 고정에 필요한 Fix 수
+SITE_MAX_SPREAD_M = 5.0  # Fix 중앙값 주변 CEP50이 이 이하이면 고정
+SITE_SAMPLE_SPACING = 10  # 중앙값에 넣는 Fix 최소 간격(초)
+SITE_CHECK_INTERVAL = 6 * 3600  # 고정 후 GPS 점검 간격(초)
+SITE_DRIFT_LIMIT_M = 100  # 점검 Fix가 이보다 멀면 고정 해제
 MANUAL_HOLD_SECONDS = 180  # 수동 명령 유지 시간
 
 # INA219 I2C 우선순위 (software I2C 버스 3 → 기본 버스 1 순으로 시도)
@@ -58,107 +130,38 @@ INA219_ADDRESS = int(os.getenv("INA219_ADDRESS", "0x40"), 0)
 INA219_CALIBRATION = int(os.getenv("INA219_CALIBRATION", "4096"))
 # 기본 션트 저항(Ω) — 모듈이 0.1Ω일 때 4096 캘리브레이션 값이 잘 맞음
 INA219_SHUNT_OHMS = float(os.getenv("INA219_SHUNT_OHMS", "0.1"))
-
-# DHT11 설정 (adafruit_dht 사용)
-try:
-    DHT_PIN = board.D17
-    dht_device = adafruit_dht.DHT11(DHT_PIN)
-except Exception as e:
-    print(f"⚠ DHT11 초기화 실패: {e}")
-    DHT_PIN = None
-    dht_device = None
-
-
-class INA219Reader:
-    """INA219를 smbus(I2C 버스 번호 우선순위)로만 읽어오는 헬퍼"""
-
-    def __init__(self):
-        self.address = INA219_ADDRESS
-        self.cal_value = INA219_CALIBRATION
-        self.shunt_ohms = INA219_SHUNT_OHMS
-        self.mode = None
-        self.device = None  # smbus 핸들
-        self.bus_num = None
-
-        for bus_candidate in INA219_BUS_PRIORITY:
-            try:
-                bus = SMBus(bus_candidate)
-                self.device = bus
-                self.bus_num = bus_candidate
-                self.mode = "smbus"
-                self._write_register(0x05, self.cal_value)  # Calibration 강제 설정
-                print(f"✓ INA219 SMBus({bus_candidate}) 준비 완료 (cal={self.cal_value})")
-                return
-            except Exception as e:
-                print(f"⚠ INA219 SMBus {bus_candidate} 초기화 실패: {e}")
-
-        print("✗ INA219 초기화 실패 (사용 불가)")
-
-    def _write_register(self, reg, value):
-        """INA219는 Big-endian을 사용하므로 바이트 스왑 후 기록"""
-        if self.mode != "smbus":
-            return
-        try:
-            swapped = ((value & 0xFF) << 8) | (value >> 8)
-            self.device.write_word_data(self.address, reg, swapped)
-        except Exception as e:
-            print(f"  ✗ INA219 레지스터 0x{reg:02X} 쓰기 실패: {e}")
-
-    def _read_register(self, reg):
-        """INA219 16비트 레지스터 읽기 (Big-endian → 리틀 변환)"""
-        if self.mode != "smbus":
-            return None
-        try:
-            val = self.device.read_word_data(self.address, reg)
-            return ((val & 0xFF) << 8) | (val >> 8)
-        except Exception as e:
-            print(f"  ✗ INA219 레지스터 0x{reg:02X} 읽기 실패: {e}")
-            return None
-
-    @staticmethod
-    def _signed(val):
-        if val is None:
-            return None
-        return val - 65536 if val > 32767 else val
-
-    def read(self):
-        """전압(V), 전류(A), 전력(W) 튜플 반환"""
-        if self.mode == "smbus":
-            try:
-                bus_voltage_raw = self._read_register(0x02)
-                current_raw = self._signed(self._read_register(0x04))
-                power_raw = self._read_register(0x03)
-
-                if bus_voltage_raw is None or current_raw is None:
-                    return None, None, None
-
-                voltage = (bus_voltage_raw >> 3) * 0.004  # 4 mV per bit
-
-                current_lsb = 0.04096 / (self.cal_value * self.shunt_ohms)
-                current = current_raw * current_lsb  # A
-
-                power = None
-                if power_raw is not None:
-                    power = power_raw * current_lsb * 20  # Power LSB = 20 * current LSB
-
-                return voltage, current, power
-            except Exception as e:
-                print(f"  ✗ INA219 오류(SMBus): {e}")
-                return None, None, None
-
-        return None, None, None
-
-
-ina219_reader = INA219Reader()
+# 전압/전류/전력 레지스터를 한 번의 I2C 트랜잭션으로 읽고 CNVR로 새 변환만 사용 (0이면 레지스터별 읽기)
+INA219_BURST = os.getenv("INA219_BURST", "1") == "1"
+# ADC 평균 샘플 수 (1~128) — 변환 주기가 비트뱅 버스 3의 버스트 읽기(~3 ms)보다 길어야 일관된 값
+INA219_SAMPLES = int(os.getenv("INA219_SAMPLES", "8"))
+# 전류 크기에 따라 PGA 이득/캘리브레이션 자동 선택 (0이면 INA219_CALIBRATION 고정, ±320 mV)
+INA219_AUTORANGE = os.getenv("INA219_AUTORANGE", "1") == "1"
+# 추적 주기마다 측정값 하나 대신 N개 샘플을 중앙값/MAD로 이상치 제거 후 평균 (시간 예산 초 내에서)
+INA219_OVERSAMPLE = int(os.getenv("INA219_OVERSAMPLE", "16"))
+INA219_OVERSAMPLE_BUDGET = float(os.getenv("INA219_OVERSAMPLE_BUDGET", "0.25"))
+# 전용 샘플링 스레드 주기(Hz) — 에너지(Wh/Ah) 적분용, 0이면 추적 주기마다 1회만 읽기
+INA219_SAMPLE_HZ = float(os.getenv("INA219_SAMPLE_HZ", "20"))
+POWER_WINDOW_SECONDS = 60  # 상태에 보고하는 전력 통계 구간(초)
+
+# DHT11 설정: 프로세스당 센서 하나를 전용 스레드가 주기적으로 읽고 실패 시 백오프 재시도
+DHT_PIN_NAME = "D17"
+DHT_SAMPLE_INTERVAL = float(
+    hardware_config.setting(
+        "sensors.dht11.sample_interval", dht_service.DEFAULT_INTERVAL
+    )
+)
+# DHT/INA219/샘플러는 SolarTracker가 생성 (import 시 하드웨어 접근 없음)
 
 # RTC 주소
 DS3231_ADDR = 0x68
+DS3231_BUS = 1
 
 
 # ============================================================
 # DS3231 시간 읽기
 # ============================================================
 
+
 def bcd_to_dec(bcd):
     return (bcd & 0x0F) + ((bcd >> 4) * 10)
 
@@ -166,9 +169,10 @@ def bcd_to_dec(bcd):
 def read_time_ds3231():
     """RTC DS3231 시간 읽기"""
     try:
-        bus = SMBus(1)
-        data = bus.read_i2c_block_data(DS3231_ADDR, 0x00, 7)
-        bus.close()
+        # 공유 버스 핸들 사용, INA219 읽기가 대기 중이면 양보
+        data = i2c_bus.get_bus(DS3231_BUS).read_block(
+            "ds3231", DS3231_ADDR, 0x00, 7, i2c_bus.PRIORITY_BACKGROUND
+        )
 
         sec = bcd_to_dec(data[0])
         minute = bcd_to_dec(data[1])
@@ -184,10 +188,15 @@ def read_time_ds3231():
         return None
 
 
+# GPS 시각과 RTC로 보정한 단조 시계 (조회 시 I/O 없음)
+clock = ClockService(read_time_ds3231)
+
+
 # ============================================================
 # 캐시 관리
 # ============================================================
 
+
 class CacheManager:
     def __init__(self, cache_file):
         self.cache_file = cache_file
@@ -195,7 +204,7 @@ class CacheManager:
     def load_cache(self):
         if os.path.exists(self.cache_file):
             try:
-                with open(self.cache_file, 'r') as f:
+                with open(self.cache_file, "r") as f:
                     cache = json.load(f)
 
                 print(f"✓ 캐시 로드 성공")
@@ -210,15 +219,16 @@ class CacheManager:
         print("ℹ 캐시 없음")
         return None
 
-    def save_cache(self, latitude, longitude):
+    def save_cache(self, latitude, longitude, **extra):
         data = {
-            'latitude': latitude,
-            'longitude': longitude,
-            'timestamp': datetime.now().isoformat()
+            "latitude": latitude,
+            "longitude": longitude,
+            "timestamp": datetime.now().isoformat(),
         }
+        data.update(extra)  # 예: 고정 설치 위치 정보 (locked, spread_m, fixes)
 
         try:
-            with open(self.cache_file, 'w') as f:
+            with open(self.cache_file, "w") as f:
                 json.dump(data, f, indent=2)
             print("✓ 캐시 저장 완료")
         except Exception as e:
@@ -229,11 +239,16 @@ class CacheManager:
 # GPS 처리
 # ============================================================
 
+
 class GPSReader:
-    def __init__(self, port, baud, cache_manager):
+    """NEO-6M 리더: 백그라운드 스레드가 NMEA(또는 UBX)를 계속 읽고 최신 Fix만 보관"""
+
+    def __init__(self, port, baud, cache_manager, protocol=GPS_PROTOCOL):
         self.port = port
         self.baud = baud
         self.cache_manager = cache_manager
+        self.protocol = protocol
+        self._ubx = ubx.UBXStream() if protocol == "ubx" else None
 
         self.serial = None
         self.latitude = None
@@ -242,150 +257,404 @@ class GPSReader:
         self.valid = False
         self.cached_position = None
 
+        # 스트리밍 스레드가 갱신하는 최신 Fix
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._fix = None  # (lat, lon, utc datetime, monotonic 수신 시각)
+        self._date = None  # 마지막 RMC 날짜 (GGA에는 날짜가 없음)
+        self.fix_quality = 0
+        self.satellites = None
+        self.fix_type = None  # UBX 모드: 0=없음, 2=2D, 3=3D
+        self.h_acc = None  # UBX 모드: 수평 정확도 추정치(m)
+        self._saved_position = None
+        self.fresh = False  # 마지막 read_position이 실제 Fix였는지 (False면 캐시)
+        self.save_fixes = True  # 위치가 고정되면 SolarTracker가 끔
+        self.on_fix = None  # Fix마다 호출 (lat, lon) → 고정 설치 위치 수집
+        # 포트 열기 실패/분리 시 지수 백오프로 재연결 (상태 변화만 출력)
+        self.health = device_health.breaker("gps", failure_threshold=1)
+
     def connect(self):
         try:
             self.serial = serial.Serial(self.port, self.baud, timeout=1)
             print(f"✓ GPS 연결됨: {self.port}")
-            return True
+            if GPS_CONFIGURE:
+                ubx.configure(self.serial, **ubx.protocol_options(self.protocol))
         except Exception as e:
-            print(f"✗ GPS 연결 실패: {e}")
+            self._disconnect(e)
             return False
+        self.health.success()
+        return True
+
+    def _disconnect(self, error):
+        """포트 오류(USB 분리 등): 닫고 브레이커에 기록 → 재시도 시각에 다시 연결"""
+        if self.serial is not None:
+            try:
+                self.serial.close()
+            except Exception:
+                pass
+        self.serial = None
+        self.health.failure(error)
+
+    def _ensure_connected(self):
+        """포트가 없으면 재시도 시각이 됐을 때만 다시 연결"""
+        if self.serial is not None:
+            return True
+        return self.health.allow() and self.connect()
 
     def load_cached_position(self):
         self.cached_position = self.cache_manager.load_cache()
         if self.cached_position:
-            self.latitude = self.cached_position['latitude']
-            self.longitude = self.cached_position['longitude']
-            self.timestamp = datetime.now(timezone.utc)
+            self.latitude = self.cached_position["latitude"]
+            self.longitude = self.cached_position["longitude"]
+            self.timestamp = clock.now()
             self.valid = True
+            self._saved_position = (self.latitude, self.longitude)
             print("✓ 캐시 기반 임시 위치 사용")
             return True
         return False
 
-    def read_position(self, timeout=GPS_FIX_TIMEOUT):
-        print(f"GPS Fix 시도 중… 최대 {timeout}초")
-        start = time.time()
+    # --- 스트리밍 ---
+    def start_stream(self):
+        """시리얼 포트를 계속 읽는 백그라운드 스레드 시작 (포트가 없으면 스레드가 재연결)"""
+        if self._thread and self._thread.is_alive():
+            return True
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._stream_loop, name="gps-stream", daemon=True
+        )
+        self._thread.start()
+        print("✓ GPS 스트리밍 스레드 시작")
+        return True
 
-        while time.time() - start < timeout:
-            if self.serial.in_waiting > 0:
-                try:
-                    line = self.serial.readline().decode("ascii", errors="replace").strip()
-                    if line.startswith("$GPRMC") or line.startswith("$GNRMC"):
-                        msg = pynmea2.parse(line)
-
-                        if msg.status == "A":
-                            self.latitude = msg.latitude
-                            self.longitude = msg.longitude
-                            self.timestamp = datetime.combine(msg.datestamp, msg.timestamp).replace(
-                                tzinfo=timezone.utc
-                            )
-                            self.valid = True
-
-                            self.cache_manager.save_cache(self.latitude, self.longitude)
-                            print("✓ GPS Fix 성공")
-                            return True
-
-                except Exception:
-                    pass
-
-        print("⚠ GPS Fix 실패 → 캐시 사용")
+    def stop_stream(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def streaming(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _stream_loop(self):
+        while not self._stop.is_set():
+            if not self._ensure_connected():
+                self._stop.wait(max(self.health.retry_in(), 1))
+                continue
+            try:
+                self._poll()
+            except (serial.SerialException, OSError) as e:
+                self._disconnect(e)
+            except Exception as e:
+                print(f"⚠ GPS 읽기 오류: {e}")
+                self._stop.wait(1)
+
+    def _poll(self):
+        """포트에서 한 번 읽어 반영 (timeout=1 → 최대 1초 블록, CPU 사용 없음)"""
+        if self._ubx is not None:
+            for fix in self._ubx.read(self.serial):
+                self._handle_nav(fix)
+            return
+        raw = self.serial.readline()
+        if raw:
+            self._handle_line(raw)
+
+    def _handle_line(self, raw):
+        """체크섬이 맞는 RMC/GGA만 반영 (bytes 그대로 파싱)"""
+        fix = nmea.parse(raw, ("RMC", "GGA"))
+        if fix is None:
+            return
+
+        if fix.kind == "RMC":
+            if not fix.valid or fix.date is None:
+                return
+            self._date = fix.date
+            self._store_fix(fix.latitude, fix.longitude, fix.timestamp())
+        elif fix.kind == "GGA":
+            with self._lock:
+                self.fix_quality = fix.quality
+                self.satellites = fix.satellites
+            if fix.valid and self._date is not None and fix.latitude is not None:
+                self._store_fix(fix.latitude, fix.longitude, fix.timestamp(self._date))
+
+    def _handle_nav(self, fix):
+        """UBX NAV 해(PVT 또는 POSLLH+SOL+TIMEUTC) 반영, hAcc가 나쁘면 무시"""
+        with self._lock:
+            self.fix_type = fix.fix_type
+            self.fix_quality = 1 if fix.valid else 0
+            self.satellites = fix.satellites
+            self.h_acc = fix.h_acc
+        if fix.valid and fix.h_acc is not None and fix.h_acc <= GPS_MAX_HACC_M:
+            self._store_fix(fix.latitude, fix.longitude, fix.utc)
+
+    def _store_fix(self, latitude, longitude, when):
+        received = time.monotonic()
+        with self._lock:
+            self._fix = (latitude, longitude, when, received)
+        clock.add_gps(when, received)
+        if self.on_fix is not None:
+            self.on_fix(latitude, longitude)
+        if self.save_fixes and self._moved(latitude, longitude):
+            self._saved_position = (latitude, longitude)
+            self.cache_manager.save_cache(latitude, longitude)
+
+    def _moved(self, latitude, longitude):
+        """마지막 저장 위치에서 GPS_CACHE_MIN_MOVE_M 이상 이동했는지"""
+        if self._saved_position is None:
+            return True
+        lat0, lon0 = self._saved_position
+        return distance_m(lat0, lon0, latitude, longitude) >= GPS_CACHE_MIN_MOVE_M
+
+    def latest_fix(self):
+        """(lat, lon, 현재 시각으로 보정한 UTC, age 초) 또는 None"""
+        with self._lock:
+            fix = self._fix
+        if fix is None:
+            return None
+        latitude, longitude, when, received = fix
+        age = time.monotonic() - received
+        return latitude, longitude, when + timedelta(seconds=age), age
+
+    # --- 조회 ---
+    def read_position(self, timeout=GPS_FIX_TIMEOUT):
+        if self.streaming():
+            # 스트리밍 중에는 대기 없이 최신 Fix 사용
+            fix = self.latest_fix()
+            if fix is not None and fix[3] <= GPS_FIX_MAX_AGE:
+                self.latitude, self.longitude, self.timestamp, _ = fix
+                self.valid = True
+                self.fresh = True
+                return True
+        elif self._ensure_connected():
+            if self._read_blocking(timeout):
+                self.fresh = True
+                return True
+
+        self.fresh = False
+        print("⚠ GPS Fix 없음 → 캐시 사용")
         if self.cached_position:
             self.valid = True
-            self.latitude = self.cached_position['latitude']
-            self.longitude = self.cached_position['longitude']
-            self.timestamp = datetime.now(timezone.utc)
+            self.latitude = self.cached_position["latitude"]
+            self.longitude = self.cached_position["longitude"]
+            self.timestamp = clock.now()
             return True
 
         return False
 
+    def _read_blocking(self, timeout):
+        """스트리밍을 쓰지 않을 때의 기존 방식 (Fix가 나올 때까지 대기)"""
+        print(f"GPS Fix 시도 중… 최대 {timeout}초")
+        try:
+            # 쉬는 동안 쌓인 오래된 문장 버리기 (커널 버퍼는 가장 오래된 데이터를 보관)
+            self.serial.reset_input_buffer()
+        except Exception:
+            pass
+        start = time.time()
+        while time.time() - start < timeout:
+            try:
+                self._poll()
+            except (serial.SerialException, OSError) as e:
+                self._disconnect(e)
+                return False
+            except Exception:
+                return False
+            fix = self.latest_fix()
+            if fix is not None and fix[3] <= GPS_FIX_MAX_AGE:
+                self.latitude, self.longitude, self.timestamp, _ = fix
+                self.valid = True
+                print("✓ GPS Fix 성공")
+                return True
+        return False
+
     def get_position(self):
+        fix = self.latest_fix()
         return {
             "latitude": self.latitude,
             "longitude": self.longitude,
             "timestamp": self.timestamp,
             "valid": self.valid,
+            "fix_age": fix[3] if fix else None,
+            "fix_quality": self.fix_quality,
+            "fix_type": self.fix_type,
+            "h_acc": self.h_acc,
         }
 
     def close(self):
+        self.stop_stream()
         if self.serial:
             self.serial.close()
+            self.serial = None
 
 
 # ============================================================
 # 서보모터
 # ============================================================
 
-class ServoController:
-    def __init__(self, azimuth_pin, altitude_pin):
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setwarnings(False)
-
-        GPIO.setup(azimuth_pin, GPIO.OUT)
-        GPIO.setup(altitude_pin, GPIO.OUT)
-
-        self.pwm_az = GPIO.PWM(azimuth_pin, PWM_FREQUENCY)
-        self.pwm_alt = GPIO.PWM(altitude_pin, PWM_FREQUENCY)
 
-        self.pwm_az.start(0)
-        self.pwm_alt.start(0)
+class ServoController:
+    def __init__(self, azimuth_pin, altitude_pin, backend=SERVO_PWM_BACKEND):
+        if backend == "sysfs":
+            pwm_backend.check_channels(
+                (azimuth_pin, altitude_pin)
+            )  # 두 핀이 같은 하드웨어 채널이면 중단
+        self.backend = backend
+        self.pwm_az = pwm_backend.open_channel(azimuth_pin, PWM_FREQUENCY, backend)
+        self.pwm_alt = pwm_backend.open_channel(altitude_pin, PWM_FREQUENCY, backend)
 
         self.current_az = 90
         self.current_alt = 45
 
-    def set_angle(self, pwm, angle):
-        angle = max(0, min(180, angle))
-        duty = 2.5 + (angle / 180) * 10
-        pwm.ChangeDutyCycle(duty)
-        time.sleep(0.4)
-        pwm.ChangeDutyCycle(0)
-
-    def move_to_position(self, azimuth, altitude):
-        print(f"  → 서보 이동: AZ {azimuth:.1f}°, ALT {altitude:.1f}°")
-        self.set_angle(self.pwm_az, azimuth)
-        self.set_angle(self.pwm_alt, altitude)
-
-        self.current_az = azimuth
-        self.current_alt = altitude
-
-    def reset_position(self):
-        print("  초기 위치로 복귀")
-        self.move_to_position(90, 45)
-
-    def cleanup(self):
-        self.pwm_az.stop()
-        self.pwm_alt.stop()
-        GPIO.cleanup()
+        # PWM은 이동 스레드만 사용, 호출부는 Future를 받고 바로 반환
+        self.motion = MotionExecutor(
+            self._drive, position=lambda: (self.current_az, self.current_alt)
+        )
+        self.model_az = servo_model.ServoModel(SERVO_AZ_SPEED, SERVO_AZ_SETTLE)
+        self.model_alt = servo_model.ServoModel(SERVO_ALT_SPEED, SERVO_ALT_SETTLE)
+        self.move_stats = servo_model.MoveStats()  # 이동마다 지령한 궤적/펄스 유지 시간
+        self.planner = None
+        if SMOOTH_MOVE:
+            self.planner = motion_planner.MotionPlanner(
+                (self.current_az, self.current_alt),
+                SERVO_MAX_SPEED,
+                SERVO_MAX_ACCEL,
+                MOVE_DELAY,
+            )
 
+    @staticmethod
+    def duty_cycle(angle):
+        angle = max(0, min(180, angle))
+        return 2.5 + (angle / 180) * 10
+
+    def _write(self, azimuth, altitude):
+        self.pwm_az.set_duty(self.duty_cycle(azimuth))
+        self.pwm_alt.set_duty(self.duty_cycle(altitude))
+
+    def _drive(self, azimuth, altitude):
+        """두 축 동시 이동 (SMOOTH_MOVE면 궤적을 따라), 새 목표가 오면 중간에 멈추고 False
+
+        어떻게 끝나든(완료, 이동 중/유지 중 새 목표) 펄스를 끄고 move_stats에 기록
+        """
+        started = time.perf_counter()
+        holding = None
+        completed = False
+        distance_az, distance_alt = (
+            azimuth - self.current_az,
+            altitude - self.current_alt,
+        )
+        try:
+            commanded = 0.0
+            if self.planner is not None:
+                reached = self.planner.move(
+                    (azimuth, altitude), self._write, self.motion.preempted
+                )
+                self.current_az, self.current_alt = self.planner.position
+                if not reached:
+                    return False
+                commanded = self.planner.last_planned_s
+            else:
+                self._write(azimuth, altitude)
+            hold = max(
+                self.model_az.hold_time(distance_az, commanded),
+                self.model_alt.hold_time(distance_alt, commanded),
+            )
+            holding = time.perf_counter()
+            completed = not self.motion.preempted(hold)
+            self.current_az = azimuth
+            self.current_alt = altitude
+            return True
+        finally:
+            self.pwm_az.set_duty(0)
+            self.pwm_alt.set_duty(0)
+            ended = time.perf_counter()
+            if holding is None:
+                self.move_stats.record(ended - started, 0.0, completed)
+            else:
+                self.move_stats.record(holding - started, ended - holding, completed)
 
-class NoOpServoController:
-    """하드웨어가 없을 때를 위한 더미 서보 컨트롤러"""
+    def timing(self):
+        return {
+            "azimuth": self.model_az.as_dict(),
+            "altitude": self.model_alt.as_dict(),
+            "moves": self.move_stats.as_dict(),
+        }
 
-    def __init__(self):
-        self.current_az = 90
-        self.current_alt = 45
+    def move_async(self, azimuth, altitude):
+        """대기 없이 이동 요청 → Future (결과: 도달한 자세; 새 목표에 밀리면 그 목표(시작 전) 또는 멈춘 위치)"""
+        dummy = " (더미)" if self.backend == "fake" else ""
+        print(f"  →{dummy} 서보 이동: AZ {azimuth:.1f}°, ALT {altitude:.1f}°")
+        return self.motion.submit(azimuth, altitude)
 
     def move_to_position(self, azimuth, altitude):
-        print(f"  → (더미) 서보 이동: AZ {azimuth:.1f}°, ALT {altitude:.1f}°")
-        self.current_az = azimuth
-        self.current_alt = altitude
+        """이동 완료까지 대기, 새 목표(수동 명령 등)에 밀려 목표에 못 가면 False"""
+        reached = self.move_async(azimuth, altitude).result()
+        if reached == (azimuth, altitude):
+            return True
+        where = (
+            "알 수 없음"
+            if reached is None
+            else f"AZ {reached[0]:.1f}°, ALT {reached[1]:.1f}°"
+        )
+        print(f"  ⚠ 새 목표가 이동을 대체함 (도달: {where})")
+        return False
 
     def reset_position(self):
-        print("  (더미) 초기 위치로 복귀")
-        self.move_to_position(90, 45)
+        print("  초기 위치로 복귀")
+        return self.move_to_position(90, 45)
 
     def cleanup(self):
-        pass
+        self.motion.stop()
+        self.pwm_az.close()
+        self.pwm_alt.close()
 
 
 # ============================================================
 # 태양 추적 시스템
 # ============================================================
 
+
 class SolarTracker:
-    def __init__(self, gps_reader, servo_controller):
+    def __init__(self, gps_reader, servo_controller, sun_path=None):
         self.gps = gps_reader
         self.servo = servo_controller
+        self.sun_path = sun_path or SunPathTable(SUN_PATH_FILE)
+        self.scheduler = TrackerScheduler(
+            UPDATE_INTERVAL, NIGHT_INTERVAL, DAWN_LEAD_SECONDS, MAX_TRACK_INTERVAL
+        )
+        self.night = False
+        self.parked = False
+        self.plan = None  # 오늘의 이동 계획 (move_plan.MovePlan)
+        self.last_location = None
         self.manual_override_until = 0
+        self.power_spread = None  # 마지막 전력 요약의 분산/샘플 수
+        self.dht = dht_service.get_service(DHT_PIN_NAME, "DHT11", DHT_SAMPLE_INTERVAL)
+        self.ina219_reader = INA219Reader(
+            INA219_BUS_PRIORITY,
+            INA219_ADDRESS,
+            INA219_CALIBRATION,
+            INA219_SHUNT_OHMS,
+            burst=INA219_BURST,
+            samples=INA219_SAMPLES,
+            autorange=INA219_AUTORANGE,
+        )
+        self.power_sampler = None
+        if INA219_SAMPLE_HZ > 0:  # 미검출이어도 시작: 브레이커가 재연결 시도
+            # 새 변환이 없으면 None (이전 값을 새 샘플로 저장·적분하지 않음)
+            self.power_sampler = PowerSampler(
+                self.ina219_reader.read_new, INA219_SAMPLE_HZ, POWER_WINDOW_SECONDS
+            )
+        self.site = None
+        if STATIONARY_MODE:
+            self.site = StationarySite(
+                SITE_MIN_FIXES,
+                SITE_MAX_SPREAD_M,
+                SITE_SAMPLE_SPACING,
+                SITE_CHECK_INTERVAL,
+                SITE_DRIFT_LIMIT_M,
+            )
+            if self.site.restore(self.gps.cached_position):
+                self.gps.save_fixes = False
+            else:
+                self.gps.on_fix = self.site.add_fix
         self.latest_status = {
             "power_metrics": {
                 "solar_panel": {"voltage": None, "current": None, "power": None}
@@ -394,22 +663,37 @@ class SolarTracker:
                 "tracker": {
                     "motor_x_angle": self.servo.current_az,
                     "motor_y_angle": self.servo.current_alt,
-                    "mode": "idle"
+                    "mode": "idle",
                 },
                 "environment": {"temperature": None, "humidity": None},
                 "controller": {"last_update": None},
-                "gps": {"latitude": None, "longitude": None, "timestamp": None}
-            }
+                "gps": {"latitude": None, "longitude": None, "timestamp": None},
+            },
         }
 
     def calculate_solar_position(self, latitude, longitude, timestamp):
         try:
-            altitude = get_altitude(latitude, longitude, timestamp)
-            azimuth = get_azimuth(latitude, longitude, timestamp)
-            return azimuth, altitude
+            return self.sun_path.position(latitude, longitude, timestamp)
+        except Exception as e:
+            print(f"⚠ 태양 궤적 테이블 조회 실패, 직접 계산: {e}")
+        try:
+            return solar_position_at(latitude, longitude, timestamp)
         except:
             return None, None
 
+    def prepare_sun_path(self):
+        """시작 시 캐시 위치 기준으로 오늘의 태양 궤적 테이블 준비"""
+        if not self.gps.cached_position:
+            return
+        try:
+            self.sun_path.ensure(
+                self.gps.cached_position["latitude"],
+                self.gps.cached_position["longitude"],
+                clock.now(),
+            )
+        except Exception as e:
+            print(f"⚠ 태양 궤적 테이블 준비 실패: {e}")
+
     def is_daytime(self, altitude):
         return altitude > 0
 
@@ -425,17 +709,25 @@ class SolarTracker:
 
         return servo_az, servo_alt
 
+    def servo_to_sun(self, servo_az, servo_alt):
+        """convert_to_servo의 역변환: 서보 각도에서 패널이 향하는 방위각/고도각"""
+        return ((servo_az - 90) * 2 + 90) % 360, servo_alt
+
     def manual_override_active(self):
         return time.time() < self.manual_override_until
 
     def set_manual_position(self, x_angle, y_angle, hold_seconds=MANUAL_HOLD_SECONDS):
-        """외부 명령으로 모터 각도를 설정하고 일정 시간 자동 추적을 정지"""
+        """외부 명령으로 모터 각도를 설정하고 일정 시간 자동 추적을 정지 (이동 완료 Future 반환, 대기하지 않음)"""
         self.manual_override_until = time.time() + max(1, hold_seconds)
-        self.servo.move_to_position(x_angle, y_angle)
+        future = self.servo.move_async(x_angle, y_angle)
+        self.parked = False
         self.latest_status["system_status"]["tracker"].update(
             {"motor_x_angle": x_angle, "motor_y_angle": y_angle, "mode": "manual"}
         )
-        self.latest_status["system_status"]["controller"]["last_update"] = datetime.now(timezone.utc).isoformat()
+        self.latest_status["system_status"]["controller"][
+            "last_update"
+        ] = clock.now().isoformat()
+        return future
 
     def resume_auto(self):
         """즉시 자동 추적 모드로 복귀"""
@@ -444,18 +736,14 @@ class SolarTracker:
 
     def _read_environment(self):
         """DHT11 센서 읽기 (값이 없으면 None 유지)"""
-        temperature = None
-        humidity = None
-        if dht_device is None:
-            print("  ✗ DHT11 미초기화(하드웨어 미검출)")
-            return temperature, humidity
-        try:
-            temperature = dht_device.temperature
-            humidity = dht_device.humidity
-        except RuntimeError as e:
-            print(f"  ✗ DHT11 읽기 오류: {e.args[0]}")
-        except Exception as e:
-            print(f"  ✗ DHT11 실패: {e}")
+        self.dht.start()  # 이미 실행 중이면 무시
+        temperature, humidity, age = self.dht.latest()
+        if temperature is None and self.dht.last_error:
+            print(
+                f"  ✗ DHT11 읽기 오류: {self.dht.last_error} (연속 {self.dht.failures}회)"
+            )
+        elif age is not None and temperature is not None:
+            print(f"  ({age:.0f}초 전 측정값)")
         return temperature, humidity
 
     def _read_power(self):
@@ -463,15 +751,49 @@ class SolarTracker:
         voltage = None
         current = None
         power = None
-        if ina219_reader is None or ina219_reader.mode is None:
-            print("  ✗ INA219 미초기화(하드웨어 미검출)")
+        health = self.ina219_reader.health
+        if health.state == device_health.OPEN:
+            print(
+                f"  ✗ INA219 응답 없음 ({health.retry_in():.0f}초 후 재시도:"
+                f" {health.last_error})"
+            )
             return voltage, current, power
-        voltage, current, power = ina219_reader.read()
-        if all(v is None for v in (voltage, current, power)):
-            print("  ✗ INA219 데이터 없음")
+        reading = None
+        if self.power_sampler is not None and self.power_sampler.running():
+            # 샘플링 스레드의 최근 N개 값으로 요약 (버스 접근 없음), 너무 오래된 값은 버림
+            age = self.power_sampler.age()
+            if age is not None and age <= self.power_sampler.max_gap:
+                # MAD 하한은 채널별 1 LSB (INA219Reader.oversample과 동일)
+                reading = summarize(
+                    self.power_sampler.recent(INA219_OVERSAMPLE),
+                    self.ina219_reader.resolution,
+                    range_info=self.ina219_reader.range_info,
+                )
+        else:
+            reading = self.ina219_reader.oversample(
+                INA219_OVERSAMPLE, INA219_OVERSAMPLE_BUDGET
+            )
+        if reading is None or reading.count == 0:
+            errors = (
+                f" (오류 {reading.errors}회: {self.ina219_reader.last_error})"
+                if reading is not None and reading.errors
+                else ""
+            )
+            print(f"  ✗ INA219 데이터 없음{errors}")
+            return voltage, current, power
+        voltage, current, power = reading
+        self.power_spread = {
+            "voltage": reading.spread[0],
+            "current": reading.spread[1],
+            "power": reading.spread[2],
+            "samples": reading.count,
+            "rejected": reading.rejected,
+        }
         return voltage, current, power
 
-    def _update_latest_status(self, env, power, latitude=None, longitude=None, timestamp=None, mode="auto"):
+    def _update_latest_status(
+        self, env, power, latitude=None, longitude=None, timestamp=None, mode="auto"
+    ):
         """대시보드/API 응답용 최신 상태 저장"""
         temperature, humidity = env
         voltage, current, watt = power
@@ -479,52 +801,252 @@ class SolarTracker:
         self.latest_status["power_metrics"]["solar_panel"] = {
             "voltage": voltage,
             "current": current,
-            "power": watt
+            "power": watt,
         }
+        if self.power_spread is not None and voltage is not None:
+            self.latest_status["power_metrics"]["solar_panel"][
+                "spread"
+            ] = self.power_spread
+        if self.ina219_reader.mode is not None:
+            self.latest_status["power_metrics"]["solar_panel"]["range"] = dict(
+                self.ina219_reader.range_info,
+                switches=self.ina219_reader.range_switches,
+            )
+        if self.power_sampler is not None:
+            self.latest_status["power_metrics"]["energy"] = self.power_sampler.stats()
         self.latest_status["system_status"]["environment"] = {
             "temperature": temperature,
-            "humidity": humidity
+            "humidity": humidity,
+            "age": self.dht.status()["age"],
         }
         self.latest_status["system_status"]["tracker"].update(
             {
                 "motor_x_angle": self.servo.current_az,
                 "motor_y_angle": self.servo.current_alt,
-                "mode": mode
+                "mode": mode,
             }
         )
+        fix = self.gps.get_position()
         self.latest_status["system_status"]["gps"] = {
             "latitude": latitude,
             "longitude": longitude,
-            "timestamp": timestamp.isoformat() if isinstance(timestamp, datetime) else None
+            "timestamp": (
+                timestamp.isoformat() if isinstance(timestamp, datetime) else None
+            ),
+            "fix_age": fix.get("fix_age"),
+            "fix_quality": fix.get("fix_quality"),
+            "fix_type": fix.get("fix_type"),
+            "h_acc": fix.get("h_acc"),
+            "site_locked": self.site.locked if self.site else None,
+            "site_spread_m": self.site.spread_m if self.site else None,
         }
-        self.latest_status["system_status"]["controller"]["last_update"] = datetime.now(timezone.utc).isoformat()
+        self.latest_status["system_status"]["clock"] = clock.status()
+        self.latest_status["system_status"]["i2c"] = i2c_bus.stats()
+        self.latest_status["system_status"]["controller"][
+            "last_update"
+        ] = clock.now().isoformat()
 
     def get_latest_status(self):
         """외부 API에서 사용"""
         return self.latest_status
 
+    def _known_location(self):
+        """마지막으로 사용한 위치 (없으면 캐시 위치)"""
+        if self.last_location:
+            return self.last_location
+        if self.gps.cached_position:
+            return (
+                self.gps.cached_position["latitude"],
+                self.gps.cached_position["longitude"],
+            )
+        return None
+
+    def _park(self):
+        """야간에는 한 번만 초기 위치로 이동 (새 목표에 밀리면 다음 주기에 다시)"""
+        if not self.parked:
+            self.parked = self.servo.reset_position()
+
+    def _night_update(self, now):
+        """야간: GPS/서보 동작 없이 센서만 측정. 낮이면 False 반환"""
+        location = self._known_location()
+        if location is None:
+            return False
+        latitude, longitude = location
+        az, alt = self.calculate_solar_position(latitude, longitude, now)
+        if alt is None or self.is_daytime(alt):
+            self.night = False
+            return False
+
+        self.night = True
+        self.scheduler.refresh_events(latitude, longitude, now)
+        print("  상태: 밤 → GPS 생략, 야간 주기로 센서만 측정")
+        self._park()
+        env = self._read_environment()
+        power = self._read_power()
+        self._update_latest_status(env, power, latitude, longitude, now, mode="night")
+        return True
+
+    # --- 고정 설치 위치 ---
+    def _locked_location(self):
+        """위치가 고정돼 있고 점검 시기가 아니면 (lat, lon, 시각), 아니면 None"""
+        site = self.site
+        if site is None or not site.locked:
+            return None
+        if self.gps.save_fixes:
+            # 스트리밍 스레드에서 방금 고정됨 → 저장하고 GPS 대기
+            self._persist_site()
+        if self.gps.streaming():
+            self.gps.stop_stream()
+        if site.needs_check():
+            return None
+        now = clock.now()
+        print(
+            f"  고정 위치 사용: lat={site.latitude:.6f}, lon={site.longitude:.6f} (GPS 대기)"
+        )
+        return site.latitude, site.longitude, now
+
+    def _site_fix(self, latitude, longitude, timestamp):
+        """새 Fix를 위치 수집/점검에 반영"""
+        site = self.site
+        if site is None:
+            return
+        if not self.gps.fresh:
+            if site.locked:
+                site.last_check = time.monotonic()  # Fix 실패: 다음 점검 주기에 재시도
+            return
+        if site.locked:
+            if not site.check(latitude, longitude):
+                self._release_site(latitude, longitude)
+            return
+        if site.add_fix(latitude, longitude) or site.locked:
+            self._persist_site()
+
+    def _persist_site(self):
+        site = self.site
+        self.gps.save_fixes = False
+        self.gps.on_fix = None
+        self.gps.cache_manager.save_cache(
+            site.latitude, site.longitude, **site.cache_fields()
+        )
+        self.gps.cached_position = {
+            "latitude": site.latitude,
+            "longitude": site.longitude,
+            "locked": True,
+        }
+
+    def _release_site(self, latitude, longitude):
+        """설치 위치가 바뀜: 수집을 다시 시작하고 GPS 스트리밍 재개"""
+        self.gps.save_fixes = True
+        self.gps.on_fix = self.site.add_fix
+        self.gps.cache_manager.save_cache(latitude, longitude)
+        self.gps.cached_position = {"latitude": latitude, "longitude": longitude}
+        self.gps.start_stream()
+
+    def _deviation(self, servo_az, servo_alt):
+        return max(
+            abs(servo_az - self.servo.current_az),
+            abs(servo_alt - self.servo.current_alt),
+        )
+
+    def needs_correction(self, servo_az, servo_alt):
+        """목표 서보 각도가 현재 각도에서 임계값 이상 벗어났는지"""
+        return (
+            self._deviation(servo_az, servo_alt)
+            > CORRECTION_THRESHOLD - CORRECTION_EPSILON
+        )
+
+    def _move_plan(self, latitude, longitude, now):
+        """오늘(지금~일몰)의 이동 계획: 하루 한 번 계산, 위치가 바뀌면 다시 계산"""
+        if MAX_COSINE_LOSS <= 0:
+            return None
+        plan = self.plan
+        if (
+            plan is not None
+            and plan.covers(now.timestamp())
+            and plan.matches(latitude, longitude)
+        ):
+            return plan
+        try:
+            plan = move_plan.plan_day(
+                latitude,
+                longitude,
+                now,
+                self.convert_to_servo,
+                self.servo_to_sun,
+                MAX_COSINE_LOSS,
+            )
+        except Exception as e:
+            print(f"⚠ 이동 계획 생성 실패, 임계값 보정 사용: {e}")
+            plan = None
+        if plan is not None and not plan.moves:
+            plan = None
+        self.plan = plan
+        if plan is not None:
+            print(
+                f"  ✓ 이동 계획: 일몰까지 {len(plan.moves)}회"
+                f" (추가 코사인 손실 최대 {plan.worst_loss * 100:.2f}%)"
+            )
+        return plan
+
+    def _follow_plan(self, plan, now):
+        """계획된 자세를 유지하고 다음 계획 이동 시각에 깨어나도록 예약"""
+        move = plan.active(now.timestamp())
+        if self._deviation(move.azimuth, move.altitude) > CORRECTION_EPSILON:
+            self.servo.move_to_position(move.azimuth, move.altitude)
+            self.parked = False
+        else:
+            print("  보정 생략: 계획된 자세 유지")
+        delay = self.scheduler.follow_plan(plan, now)
+        print(f"  다음 계획 이동: {delay:.0f}초 후")
+
+    def _plan_next_correction(self, latitude, longitude):
+        """태양이 서보 기준으로 임계값만큼 움직이는 시각에 다음 업데이트 예약"""
+        if CORRECTION_THRESHOLD <= 0:
+            return
+        delay = self.scheduler.plan_correction(
+            latitude,
+            longitude,
+            clock.now(),
+            (self.servo.current_az, self.servo.current_alt),
+            self.convert_to_servo,
+            CORRECTION_THRESHOLD,
+        )
+        print(f"  다음 보정 예상: {delay:.0f}초 후")
+
+    def next_update_delay(self):
+        """다음 업데이트까지 대기 시간(초): 낮에는 UPDATE_INTERVAL, 밤에는 야간 주기/일출 직전"""
+        return self.scheduler.next_delay(clock.now(), self.night)
+
     def update(self):
 
         print("\n" + "=" * 60)
         print("🌞 태양 추적 업데이트")
         print("=" * 60)
 
-        gps_ok = self.gps.read_position()
+        clock.maintain()
+        if not self.manual_override_active() and self._night_update(clock.now()):
+            return True
+
+        located = self._locked_location()
+        if located is not None:
+            latitude, longitude, timestamp = located
 
-        if gps_ok:
+        elif self.gps.read_position():
             pos = self.gps.get_position()
             latitude = pos["latitude"]
             longitude = pos["longitude"]
             timestamp = pos["timestamp"]
+            self._site_fix(latitude, longitude, timestamp)
 
         else:
-            print("\n⚠ GPS Fix 실패 → RTC 기반 계산 모드")
+            print("\n⚠ GPS Fix 실패 → RTC/보정 시계 기반 계산 모드")
 
-            timestamp = read_time_ds3231()
-
-            if timestamp is None:
+            if not clock.disciplined():
+                clock.sample_rtc()
+            if not clock.disciplined():
                 print("✗ RTC 시간 없음 → 추적 중단")
                 return False
+            timestamp = clock.now()
 
             if self.gps.cached_position:
                 latitude = self.gps.cached_position["latitude"]
@@ -533,17 +1055,22 @@ class SolarTracker:
             else:
                 print("✗ 위치 정보 없음 → 초기 위치 유지")
                 self.servo.reset_position()
+                self.parked = True
                 env = self._read_environment()
                 power = self._read_power()
                 self._update_latest_status(env, power, mode="error")
                 return False
 
+        self.last_location = (latitude, longitude)
+
         # 수동 제어가 활성화된 경우 위치는 유지하고 센서만 갱신
         if self.manual_override_active():
             print("  상태: 수동 제어 유지 중 → 자동 추적 건너뜀")
             env = self._read_environment()
             power = self._read_power()
-            self._update_latest_status(env, power, latitude, longitude, timestamp, mode="manual")
+            self._update_latest_status(
+                env, power, latitude, longitude, timestamp, mode="manual"
+            )
             return True
 
         # 태양 위치 계산
@@ -552,7 +1079,9 @@ class SolarTracker:
             print("✗ 태양 위치 계산 실패")
             env = self._read_environment()
             power = self._read_power()
-            self._update_latest_status(env, power, latitude, longitude, timestamp, mode="error")
+            self._update_latest_status(
+                env, power, latitude, longitude, timestamp, mode="error"
+            )
             return False
 
         print(f"  태양 방위각: {az:.2f}°")
@@ -560,12 +1089,25 @@ class SolarTracker:
 
         if self.is_daytime(alt):
             print("  상태: 낮")
-            servo_az, servo_alt = self.convert_to_servo(az, alt)
-            self.servo.move_to_position(servo_az, servo_alt)
-            mode = "auto"
+            self.night = False
+            plan = self._move_plan(latitude, longitude, timestamp)
+            if plan is not None:
+                self._follow_plan(plan, timestamp)
+            else:
+                servo_az, servo_alt = self.convert_to_servo(az, alt)
+                if self.needs_correction(servo_az, servo_alt):
+                    self.servo.move_to_position(servo_az, servo_alt)
+                    self.parked = False
+                else:
+                    print(f"  보정 생략: 서보 오차 {CORRECTION_THRESHOLD}° 이내")
+                self._plan_next_correction(latitude, longitude)
+            # 이동 중 수동 명령이 오면 이동이 대체됨 → 수동 제어 상태로 보고
+            mode = "manual" if self.manual_override_active() else "auto"
         else:
             print("  상태: 밤 → 초기 위치로 이동")
-            self.servo.reset_position()
+            self._park()
+            self.night = True
+            self.scheduler.refresh_events(latitude, longitude, clock.now())
             mode = "night"
 
         # ============================================================
@@ -589,21 +1131,34 @@ class SolarTracker:
             print(f"  전류: {power[1]:.3f}A")
             print(f"  전력: {power[2]:.3f}W")
 
-        self._update_latest_status(env, power, latitude, longitude, timestamp, mode=mode)
+        self._update_latest_status(
+            env, power, latitude, longitude, timestamp, mode=mode
+        )
         return True
 
+    def _start_sensor_threads(self):
+        self.dht.start()
+        print(f"✓ DHT11 측정 스레드 시작 ({self.dht.interval:g}초 간격)")
+        if self.power_sampler is not None:
+            self.power_sampler.start()
+            print(f"✓ INA219 샘플링 스레드 시작 ({self.power_sampler.rate_hz:g} Hz)")
+
     def start_background(self):
         """별도 스레드에서 주기적 추적"""
+
         def loop():
             print("백그라운드 추적 스레드 시작")
+            self._start_sensor_threads()
+            self.prepare_sun_path()
             self.servo.reset_position()
+            self.parked = True
             time.sleep(2)
             while True:
                 try:
                     self.update()
                 except Exception as e:
                     print(f"백그라운드 업데이트 오류: {e}")
-                time.sleep(UPDATE_INTERVAL)
+                time.sleep(self.next_update_delay())
 
         thread = threading.Thread(target=loop, daemon=True)
         thread.start()
@@ -614,13 +1169,17 @@ class SolarTracker:
         print("║            🌞 태양 추적 시스템 시작            ║")
         print("╚═══════════════════════════════════════════════╝\n")
 
+        self._start_sensor_threads()
+        self.prepare_sun_path()
         self.servo.reset_position()
+        self.parked = True
         time.sleep(2)
 
         while True:
             self.update()
-            print(f"\n다음 업데이트까지 {UPDATE_INTERVAL}초 대기…")
-            time.sleep(UPDATE_INTERVAL)
+            delay = self.next_update_delay()
+            print(f"\n다음 업데이트까지 {delay:.0f}초 대기…")
+            time.sleep(delay)
 
 
 # ============================================================
@@ -634,6 +1193,7 @@ if __name__ == "__main__":
     gps = GPSReader(GPS_PORT, GPS_BAUD, cache_mgr)
     gps.connect()
     gps.load_cached_position()
+    gps.start_stream()
 
     servo = ServoController(SERVO_AZIMUTH_PIN, SERVO_ALTITUDE_PIN)
     tracker = SolarTracker(gps, servo)
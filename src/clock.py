@@ -0,0 +1,177 @@
+"""Disciplined UTC clock built on ``time.monotonic()``.
+
+GPS fixes and the DS3231 RTC are sampled only occasionally; each sample
+pairs an absolute UTC reading with the monotonic time it was taken. A
+weighted least-squares line through the recent samples gives the offset and
+the drift (rate error of the Pi's oscillator) of the monotonic clock, so
+``now()`` / ``time()`` are a multiply-add on ``time.monotonic()`` with no
+I/O and are immune to the system clock being stepped (e.g. booting without
+network time).
+
+``error_estimate()`` combines the fit residual, the accuracy of the source
+that disciplined the clock, and how far the drift uncertainty has grown since
+the last sample. Until the first sample arrives the clock follows the
+system time and reports no estimate (``None``).
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import numpy as np
+
+GPS_SAMPLE_ERROR = 0.5  # NMEA/UBX time of the fix vs. arrival over 9600 baud, seconds
+RTC_SAMPLE_ERROR = 0.5  # DS3231 registers have 1 s resolution
+GPS_SAMPLE_SPACING = 300.0  # accept at most one GPS sample per this many seconds
+RTC_INTERVAL = 3600.0  # sample the RTC this often while no GPS time arrives
+MIN_DRIFT_SPAN = 600.0  # samples must span this long before the drift is fitted
+MAX_SAMPLES = 48  # with the spacing above: a ~4 h baseline for the drift fit
+UNFITTED_DRIFT_PPM = 50.0  # worst-case rate error assumed before the drift is known
+FITTED_DRIFT_PPM = 1.0  # floor for the fitted rate uncertainty (temperature wander)
+
+
+class ClockService:
+    def __init__(
+        self,
+        rtc_reader: Optional[Callable[[], Optional[datetime]]] = None,
+        rtc_interval: float = RTC_INTERVAL,
+        max_samples: int = MAX_SAMPLES,
+    ):
+        self.rtc_reader = rtc_reader
+        self.rtc_interval = rtc_interval
+        self._samples: deque = deque(
+            maxlen=max_samples
+        )  # (monotonic, utc epoch, error, source)
+        self._lock = threading.Lock()
+        # Fitted model: utc = utc_ref + (monotonic - mono_ref) * rate
+        self._model: Optional[tuple] = None
+        self.source: Optional[str] = None
+        self.drift_ppm: Optional[float] = None  # positive: the Pi's clock runs fast
+        self._drift_error_ppm = UNFITTED_DRIFT_PPM
+        self._fit_error = 0.0
+        self.last_correction: Optional[float] = None  # sample minus prediction, seconds
+        self._last_gps: Optional[float] = None
+        self._last_rtc: Optional[float] = None
+
+    # --- Hot path (no I/O) ---
+    def time(self) -> float:
+        """Disciplined UTC as epoch seconds (system time until disciplined)."""
+        model = self._model
+        if model is None:
+            return time.time()
+        mono_ref, utc_ref, rate = model
+        return utc_ref + (time.monotonic() - mono_ref) * rate
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.time(), timezone.utc)
+
+    def disciplined(self) -> bool:
+        return self._model is not None
+
+    def error_estimate(self) -> Optional[float]:
+        """Estimated absolute error of ``now()`` in seconds (None if undisciplined)."""
+        model = self._model
+        if model is None:
+            return None
+        elapsed = time.monotonic() - model[0]
+        return self._fit_error + elapsed * self._drift_error_ppm * 1e-6
+
+    # --- Discipline ---
+    def add_sample(
+        self, utc: datetime, source: str, error: float, received: Optional[float] = None
+    ) -> None:
+        """Record that the clock read ``utc`` at monotonic time ``received``."""
+        mono = time.monotonic() if received is None else received
+        with self._lock:
+            model = self._model
+            if model is not None:
+                self.last_correction = utc.timestamp() - (
+                    model[1] + (mono - model[0]) * model[2]
+                )
+            self._samples.append((mono, utc.timestamp(), error, source))
+            self._refit()
+
+    def add_gps(
+        self, utc: Optional[datetime], received: Optional[float] = None
+    ) -> bool:
+        """Offer a GPS fix time; only one per ``GPS_SAMPLE_SPACING`` is kept."""
+        if utc is None:
+            return False
+        mono = time.monotonic() if received is None else received
+        if self._last_gps is not None and mono - self._last_gps < GPS_SAMPLE_SPACING:
+            return False
+        self._last_gps = mono
+        self.add_sample(utc, "gps", GPS_SAMPLE_ERROR, mono)
+        return True
+
+    def sample_rtc(self) -> bool:
+        """Read the RTC once (I2C block read) and add it as a sample."""
+        if self.rtc_reader is None:
+            return False
+        self._last_rtc = time.monotonic()
+        utc = self.rtc_reader()
+        if utc is None:
+            return False
+        self.add_sample(utc, "rtc", RTC_SAMPLE_ERROR)
+        return True
+
+    def maintain(self) -> None:
+        """Sample the RTC if GPS time has been missing for ``rtc_interval``.
+
+        Meant for the slow loop (tracker update), never for timestamping.
+        """
+        now = time.monotonic()
+        gps_recent = (
+            self._last_gps is not None and now - self._last_gps < self.rtc_interval
+        )
+        rtc_due = self._last_rtc is None or now - self._last_rtc >= self.rtc_interval
+        if not gps_recent and rtc_due:
+            self.sample_rtc()
+
+    def _refit(self) -> None:
+        # Prefer GPS samples whenever there are any: RTC seconds are coarse and
+        # the RTC itself may have been set from a drifting system clock.
+        samples = [s for s in self._samples if s[3] == "gps"] or list(self._samples)
+        latest = samples[-1]
+        self.source = latest[3]
+        mono = np.array([s[0] for s in samples])
+        utc = np.array([s[1] for s in samples])
+        errors = np.array([s[2] for s in samples])
+
+        if len(samples) >= 3 and mono[-1] - mono[0] >= MIN_DRIFT_SPAN:
+            x = mono - latest[0]
+            slope, intercept = np.polyfit(x, utc - utc[-1] - x, 1, w=1.0 / errors)
+            residual = utc - utc[-1] - x - (intercept + slope * x)
+            rate = 1.0 + slope
+            self.drift_ppm = float(-slope * 1e6)
+            rms = max(
+                float(np.sqrt(np.mean(residual**2))),
+                float(errors.min()) / np.sqrt(len(samples)),
+            )
+            # Standard error of a least-squares slope over evenly spread samples.
+            slope_error = rms * np.sqrt(12.0 / len(samples)) / (mono[-1] - mono[0])
+            self._drift_error_ppm = max(FITTED_DRIFT_PPM, float(slope_error * 1e6))
+            self._fit_error = rms
+            self._model = (float(latest[0]), float(utc[-1] + intercept), float(rate))
+        else:
+            # Too little history for a rate: offset from the latest sample only.
+            self.drift_ppm = None
+            self._drift_error_ppm = UNFITTED_DRIFT_PPM
+            self._fit_error = float(latest[2])
+            self._model = (float(latest[0]), float(latest[1]), 1.0)
+
+    def status(self) -> dict:
+        error = self.error_estimate()
+        return {
+            "source": self.source or "system",
+            "disciplined": self.disciplined(),
+            "offset_from_system": round(self.time() - time.time(), 3),
+            "drift_ppm": None if self.drift_ppm is None else round(self.drift_ppm, 2),
+            "last_correction": (
+                None if self.last_correction is None else round(self.last_correction, 3)
+            ),
+            "error_estimate": None if error is None else round(error, 3),
+            "samples": len(self._samples),
+        }
@@ -2,6 +2,7 @@
 
 import os
 import time
+from datetime import datetime, timezone
 from typing import Dict, Optional
 
 import influxdb_client
@@ -39,12 +40,20 @@ class DataLogger:
             "power",
             "temperature",
             "humidity",
+            "dht_age",
             "latitude",
             "longitude",
+            "clock_error",
+            "energy_wh",
+            "today_wh",
         ):
             value = data.get(key)
-            if value is not None:
+            # Last-known-good values from a sensor that missed the deadline are not
+            # re-logged.
+            if value is not None and not data.get("stale", {}).get(key, False):
                 point.field(key, float(value))
+        if data.get("timestamp") is not None:
+            point.time(datetime.fromtimestamp(data["timestamp"], timezone.utc))
         return point
 
     def run_once(self):
@@ -71,6 +80,8 @@ class DataLogger:
             print(f"Failed to write to InfluxDB: {exc}")
 
     def run_forever(self):
+        # Sensors then run at their own intervals; each write takes the latest values.
+        self.reader.start()
         while True:
             self.run_once()
             time.sleep(self.interval_seconds)
@@ -1,5 +1,6 @@
 """하드웨어 API: 대시보드와 AI가 센서 조회 및 모터 제어에 접근하도록 제공"""
 
+import asyncio
 import os
 from typing import Optional
 from fastapi import FastAPI, HTTPException
@@ -9,7 +10,6 @@ from Motor_GPS import (
     CacheManager,
     GPSReader,
     ServoController,
-    NoOpServoController,
     SolarTracker,
     CACHE_FILE,
     GPS_PORT,
@@ -18,6 +18,8 @@ from Motor_GPS import (
     SERVO_ALTITUDE_PIN,
     MANUAL_HOLD_SECONDS,
 )
+import i2c_bus
+import device_health
 
 app = FastAPI(title="Solar Tracker Hardware API")
 
@@ -41,12 +43,13 @@ def _init_tracker():
     if not gps_reader.connect():
         print("⚠ GPS 연결 실패 (캐시/RTC 모드 대기)")
     gps_reader.load_cached_position()
+    gps_reader.start_stream()
 
     try:
         servo = ServoController(SERVO_AZIMUTH_PIN, SERVO_ALTITUDE_PIN)
     except Exception as e:
-        print(f"⚠ 서보 초기화 실패, 더미 컨트롤러 사용: {e}")
-        servo = NoOpServoController()
+        print(f"⚠ 서보 초기화 실패, 가짜 PWM(fake)으로 대체: {e}")
+        servo = ServoController(SERVO_AZIMUTH_PIN, SERVO_ALTITUDE_PIN, backend="fake")
 
     tracker = SolarTracker(gps_reader, servo)
     tracker.start_background()
@@ -74,9 +77,22 @@ async def control_motor(request: MotorControlRequest):
     if not (0 <= request.y_angle <= 180):
         raise HTTPException(status_code=400, detail="y_angle은 0-180 사이여야 합니다")
 
-    tracker.set_manual_position(
+    moved = tracker.set_manual_position(
         request.x_angle, request.y_angle, hold_seconds=request.hold_seconds
     )
+    # 이동은 서보 스레드에서 진행, 이벤트 루프는 막지 않고 완료만 기다림
+    try:
+        reached = await asyncio.wrap_future(moved)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"모터 제어 실패: {e}")
+    if reached != (request.x_angle, request.y_angle):
+        return {
+            "status": "superseded",
+            "message": "이후 요청된 각도로 이동했습니다",
+            "x_angle": reached[0],
+            "y_angle": reached[1],
+            "hold_seconds": request.hold_seconds,
+        }
     return {
         "status": "success",
         "message": "모터 제어 완료 (수동 모드 유지)",
@@ -96,7 +112,23 @@ async def resume_auto():
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "tracker_ready": tracker is not None}
+    motion = getattr(servo, "motion", None)
+    return {
+        "status": "ok",
+        "tracker_ready": tracker is not None,
+        "i2c": i2c_bus.stats(),
+        "devices": device_health.status(),
+        "motion": motion.stats() if motion is not None else None,
+        "trajectory": (
+            servo.planner.stats() if getattr(servo, "planner", None) else None
+        ),
+        "servo_timing": servo.timing() if servo is not None else None,
+        "move_plan": (
+            tracker.plan.as_dict()
+            if tracker is not None and tracker.plan is not None
+            else None
+        ),
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,566 @@
+"""INA219 register driver on the shared I2C bus (``i2c_bus``).
+
+``read()`` has two modes:
+
+* ``burst=False`` -- the original three ``read_word_data`` calls (bus
+  voltage, current, power), each a separate bus transaction. Values can
+  come from different conversions.
+* ``burst=True`` (default) -- one ``i2c_rdwr`` ioctl holding the bus once:
+  pointer-write/2-byte-read pairs for bus voltage, current and power joined
+  by repeated STARTs. The INA219 has no register auto-increment, so this is
+  as close to a block read as the chip allows; it saves two syscalls and two
+  lock round trips per reading.
+
+In burst mode the bus-voltage register's CNVR bit (set when a conversion
+finishes, cleared by reading the power register) tells whether the values
+are new; a reading without it is counted in ``stale`` and the previous
+coherent reading is returned. When ``read()`` is called faster than the
+chip converts, CNVR is first checked with a lone bus-voltage read, since the
+burst's power read would clear a flag that sets mid-burst and lose that
+conversion. OVF (math overflow) marks current/power as
+invalid. Because the chip computes ``power = current * bus / 5000``, a
+reading whose three registers disagree straddled a conversion boundary and
+is retried once. That only works when a burst is shorter than a conversion
+cycle: at the default 12-bit/532 us setting a burst on the bit-banged bus 3
+(~3 ms) always straddles, so ``samples`` selects ADC averaging (and with it
+the cycle time, ``conversion_time``) long enough for the bus in use.
+
+With ``autorange`` the driver picks the PGA gain (40/80/160/320 mV shunt
+full scale) from the measured current and loads a calibration value whose
+current LSB spans exactly that range, so a few-mA dawn current is resolved
+with the /1 gain instead of wasting the ADC on the 3.2 A /8 range. It steps
+up immediately (on OVF, or above ``RANGE_UP_FRACTION`` of the range) and
+down only after ``RANGE_DOWN_COUNT`` readings below ``RANGE_DOWN_FRACTION``
+of the next lower range, so it does not chatter at a boundary. Every
+reading is a ``Measurement`` carrying the range it was taken in.
+
+Bus errors go to the ``ina219`` circuit breaker (``device_health``) instead
+of being printed per access: after a few consecutive failures reads return
+no data without touching the bus until the reprobe time, and the probe
+re-runs ``connect()`` (calibration and config are lost if the chip lost
+power), so a sensor that was missing at start-up or dropped off the bus is
+picked up again on its own.
+
+``oversample(count, budget)`` takes up to ``count`` new conversions back
+to back, stopping at ``budget`` seconds, and ``summarize`` reduces them to
+one ``Oversampled`` reading: samples further than ``OUTLIER_K`` robust
+sigmas (1.4826 x median absolute deviation) from the per-channel median
+are dropped and the rest averaged, with the sigma as ``spread`` and the
+number kept as ``count``. A glitch or bus error then costs one sample
+instead of defining the value, and ``oversample`` never raises; errors are
+counted (and reported to the breaker). The cost is dominated by waiting
+for conversions: about ``count x conversion_time`` of wall time (16
+samples at 8x averaging: ~150 ms, ~190 ms on the bit-banged bus 3) and one
+burst plus an occasional CNVR poll of bus time per sample (16 samples: ~7
+ms on the 400 kHz bus 1, ~50 ms on bus 3). The bus is released while
+waiting, and the reduction itself takes ~35 us
+(``Test/ina219_oversample_test.py``).
+"""
+
+import statistics
+import time
+from typing import Optional, Sequence, Tuple
+
+try:
+    from . import i2c_bus
+    from . import device_health
+except ImportError:
+    # Allow running as a standalone script (no package parent)
+    import i2c_bus  # type: ignore
+    import device_health  # type: ignore
+
+try:
+    from smbus2 import i2c_msg  # type: ignore
+except ImportError:  # pragma: no cover - hardware dependent
+    i2c_msg = None
+
+REG_CONFIG = 0x00
+REG_SHUNT_VOLTAGE = 0x01
+REG_BUS_VOLTAGE = 0x02
+REG_POWER = 0x03
+REG_CURRENT = 0x04
+REG_CALIBRATION = 0x05
+
+# Config register: 32 V bus range, continuous shunt+bus; PGA bits 12-11.
+CONFIG_BASE = 0x2000 | 0x0007
+PGA_SHIFT = 11
+# Full-scale shunt voltage per PGA code (gain /1, /2, /4, /8).
+SHUNT_RANGES = (0.04, 0.08, 0.16, 0.32)
+RANGE_UP_FRACTION = 0.9  # step up above this share of the active range
+RANGE_DOWN_FRACTION = 0.4  # step down below this share of the next lower range...
+RANGE_DOWN_COUNT = 3  # ...for this many readings in a row
+# ADC setting per averaged sample count and its conversion time (seconds).
+ADC_AVERAGING = {
+    1: (0x3, 0.000532),
+    2: (0x9, 0.00106),
+    4: (0xA, 0.00213),
+    8: (0xB, 0.00426),
+    16: (0xC, 0.00851),
+    32: (0xD, 0.01702),
+    64: (0xE, 0.03405),
+    128: (0xF, 0.06810),
+}
+
+BUS_CNVR = 0x0002
+BUS_OVF = 0x0001
+BUS_LSB_V = 0.004  # 4 mV per bit after dropping the 3 status bits
+
+DEFAULT_ADDRESS = 0x40
+DEFAULT_CALIBRATION = 4096
+DEFAULT_SHUNT_OHMS = 0.1
+DEFAULT_OVERSAMPLE = 16
+DEFAULT_OVERSAMPLE_BUDGET = 0.25  # seconds
+OUTLIER_K = 3.5  # reject samples beyond this many robust sigmas of the median
+MAD_SIGMA = 1.4826  # MAD -> standard deviation for Gaussian noise
+
+Reading = Tuple[Optional[float], Optional[float], Optional[float]]
+
+
+def calibration_for(shunt_range_v: float, shunt_ohms: float) -> Tuple[int, float]:
+    """Calibration register value and current LSB (A) spanning a shunt range."""
+    lsb = shunt_range_v / shunt_ohms / 32767
+    cal = min(int(0.04096 / (lsb * shunt_ohms)), 0xFFFE) & 0xFFFE  # bit 0 is read-only
+    return cal, 0.04096 / (cal * shunt_ohms)
+
+
+class Measurement(tuple):
+    """``(voltage, current, power)`` that also records the range it was taken in.
+
+    Unpacks like the plain tuple ``read()`` always returned; ``range`` is the
+    shared per-range info dict (PGA, full scale, LSB, calibration) and
+    ``overflow`` the OVF bit of that conversion.
+    """
+
+    def __new__(
+        cls, values: Reading, range_info: Optional[dict], overflow: bool = False
+    ):
+        self = tuple.__new__(cls, values)
+        self.range = range_info
+        self.overflow = overflow
+        return self
+
+
+class Oversampled(Measurement):
+    """Robust summary of a burst of readings; unpacks like ``Measurement``.
+
+    ``spread`` is the per-channel robust sigma ``(V, A, W)``, ``count`` the
+    samples averaged, ``rejected`` the outliers dropped and ``errors`` the
+    failed reads skipped. With no usable sample the values are None and
+    ``count`` is 0.
+    """
+
+    def __new__(
+        cls,
+        values: Reading,
+        spread: Reading,
+        count: int,
+        rejected: int = 0,
+        errors: int = 0,
+        range_info: Optional[dict] = None,
+        overflow: bool = False,
+        elapsed: float = 0.0,
+    ):
+        self = Measurement.__new__(cls, values, range_info, overflow)
+        self.spread = spread
+        self.count = count
+        self.rejected = rejected
+        self.errors = errors
+        self.elapsed = elapsed
+        return self
+
+
+def summarize(
+    samples: Sequence[Reading],
+    resolution: Sequence[float] = (0.0, 0.0, 0.0),
+    k: float = OUTLIER_K,
+    **extra,
+) -> Oversampled:
+    """Median/MAD outlier rejection, then the mean of what is left.
+
+    A sample is dropped if any channel lies more than ``k`` robust sigmas
+    from that channel's median. ``resolution`` floors each sigma (one ADC
+    LSB per channel) so quantized, mostly identical samples do not reject
+    a one-LSB step. ``extra`` is passed on to ``Oversampled``.
+    """
+    samples = [s for s in samples if s[0] is not None and s[1] is not None]
+    if not samples:
+        return Oversampled((None, None, None), (None, None, None), 0, **extra)
+    channels = list(zip(*[(v, i, i * v if p is None else p) for v, i, p in samples]))
+    centers = []
+    spread = []
+    for values, floor in zip(channels, resolution):
+        median = statistics.median(values)
+        sigma = MAD_SIGMA * statistics.median([abs(x - median) for x in values])
+        centers.append((median, k * max(sigma, floor)))
+        spread.append(sigma)
+    kept = [
+        n
+        for n in range(len(samples))
+        if all(
+            abs(values[n] - median) <= bound
+            for values, (median, bound) in zip(channels, centers)
+        )
+    ]
+    means = tuple(sum(values[n] for n in kept) / len(kept) for values in channels)
+    return Oversampled(
+        means, tuple(spread), len(kept), len(samples) - len(kept), **extra
+    )
+
+
+def _signed(val):
+    if val is None:
+        return None
+    return val - 65536 if val > 32767 else val
+
+
+def _swap(word: int) -> int:
+    """SMBus words are little-endian; INA219 registers are big-endian."""
+    return ((word & 0xFF) << 8) | (word >> 8)
+
+
+class INA219Reader:
+    """INA219를 smbus(I2C 버스 번호 우선순위)로만 읽어오는 헬퍼"""
+
+    def __init__(
+        self,
+        bus_priority: Sequence[int] = (3, 1),
+        address: int = DEFAULT_ADDRESS,
+        calibration: int = DEFAULT_CALIBRATION,
+        shunt_ohms: float = DEFAULT_SHUNT_OHMS,
+        burst: bool = True,
+        samples: Optional[int] = None,
+        autorange: bool = False,
+    ):
+        self.address = address
+        self.cal_value = calibration
+        self.shunt_ohms = shunt_ohms
+        self.burst = burst and i2c_msg is not None
+        self.mode = None
+        self.device = None  # 공유 I2C 버스 (i2c_bus.I2CBus)
+        self.bus_num = None
+        self.bus_priority = tuple(bus_priority)
+        self.health = device_health.breaker("ina219")
+        self.overflow = False  # last burst had OVF set
+        self.fresh = False  # last read() returned a new conversion
+        self.stale = 0  # burst reads without CNVR (no new conversion yet)
+        self.incoherent = 0  # bursts that straddled a conversion
+        self.errors = 0  # failed reads (bus errors) over the reader's lifetime
+        self.last_error: Optional[str] = None
+        self._last: Reading = (None, None, None)
+        self._messages = None  # prebuilt i2c_rdwr message list for bursts
+        self._reads = ()
+        self.samples = samples
+        # One shunt plus one bus conversion per cycle; None: chip config left as is.
+        self.conversion_time = 2 * ADC_AVERAGING[samples or 1][1]
+        self._last_burst = 0.0  # perf_counter of the last burst
+        self.autorange = autorange
+        self.range_switches = 0
+        self._below = 0  # consecutive readings low enough to step down
+        self._ranges = []
+        for index, full_scale in enumerate(SHUNT_RANGES):
+            cal, lsb = calibration_for(full_scale, shunt_ohms)
+            if not autorange and index == len(SHUNT_RANGES) - 1:
+                cal, lsb = calibration, 0.04096 / (calibration * shunt_ohms)
+            self._ranges.append(
+                {
+                    "pga": 1 << index,
+                    "shunt_range_mv": full_scale * 1000,
+                    "current_range_a": round(full_scale / shunt_ohms, 3),
+                    "current_lsb_ua": round(lsb * 1e6, 3),
+                    "calibration": cal,
+                }
+            )
+        # Start in the widest range; auto-ranging narrows it from the first reading.
+        self.range_index = len(SHUNT_RANGES) - 1
+        self.cal_value = self._ranges[self.range_index]["calibration"]
+        self.connect()
+
+    def connect(self) -> bool:
+        """Find the chip on the first answering bus and load calibration/config."""
+        errors = []
+        for bus_candidate in self.bus_priority:
+            try:
+                bus = i2c_bus.get_bus(bus_candidate)
+                swapped = ((self.cal_value & 0xFF) << 8) | (self.cal_value >> 8)
+                bus.write_word(
+                    "ina219",
+                    self.address,
+                    REG_CALIBRATION,
+                    swapped,
+                    i2c_bus.PRIORITY_CRITICAL,
+                )  # Calibration 강제 설정
+                if self.samples is not None or self.autorange:
+                    config = self._config(self.range_index)
+                    config = ((config & 0xFF) << 8) | (config >> 8)
+                    bus.write_word(
+                        "ina219",
+                        self.address,
+                        REG_CONFIG,
+                        config,
+                        i2c_bus.PRIORITY_CRITICAL,
+                    )
+            except Exception as e:
+                errors.append(f"SMBus {bus_candidate}: {e}")
+                continue
+            first = self.device is None
+            self.device = bus
+            self.bus_num = bus_candidate
+            self.mode = "smbus"
+            self._last_burst = time.perf_counter()
+            self.health.success()
+            if first:
+                print(
+                    f"✓ INA219 SMBus({bus_candidate}) 준비 완료"
+                    f" (cal={self.cal_value}, burst={self.burst})"
+                )
+            return True
+        self.mode = None
+        self.health.failure("; ".join(errors) or "no bus configured")
+        return False
+
+    def _ready(self) -> bool:
+        """True if the bus may be used now; reconnects on a breaker reprobe."""
+        if not self.health.allow():
+            return False
+        if self.mode != "smbus" or self.health.state == device_health.HALF_OPEN:
+            return self.connect()
+        return True
+
+    @property
+    def current_lsb(self) -> float:
+        return 0.04096 / (self.cal_value * self.shunt_ohms)
+
+    @property
+    def resolution(self) -> Reading:
+        """One LSB per channel (bus V, current A, power W), the ``summarize`` floors."""
+        lsb = self.current_lsb
+        return (BUS_LSB_V, lsb, lsb * 20)
+
+    @property
+    def range_info(self) -> dict:
+        return self._ranges[self.range_index]
+
+    def _config(self, range_index: int) -> int:
+        adc = ADC_AVERAGING[self.samples or 1][0]
+        return CONFIG_BASE | (range_index << PGA_SHIFT) | (adc << 7) | (adc << 3)
+
+    def _set_range(self, index: int) -> None:
+        """Switch PGA gain and calibration together (the next conversion uses both)."""
+        cal = self._ranges[index]["calibration"]
+        config = self._config(index)
+        with self.device.transaction("ina219", i2c_bus.PRIORITY_CRITICAL) as handle:
+            handle.write_word_data(
+                self.address, REG_CALIBRATION, ((cal & 0xFF) << 8) | (cal >> 8)
+            )
+            handle.write_word_data(
+                self.address, REG_CONFIG, ((config & 0xFF) << 8) | (config >> 8)
+            )
+        self.range_index = index
+        self.cal_value = cal
+        self.range_switches += 1
+        self._below = 0
+        # Registers still hold the old range's conversion: wait for CNVR.
+        self._last_burst = time.perf_counter()
+
+    def _update_range(self, current: Optional[float], overflow: bool) -> None:
+        index = self.range_index
+        top = len(SHUNT_RANGES) - 1
+        if overflow or current is None:
+            if index < top:
+                self._set_range(top)
+            return
+        shunt = abs(current) * self.shunt_ohms
+        if shunt > RANGE_UP_FRACTION * SHUNT_RANGES[index]:
+            if index < top:
+                fits = [
+                    i
+                    for i in range(index + 1, top + 1)
+                    if shunt <= RANGE_UP_FRACTION * SHUNT_RANGES[i]
+                ]
+                self._set_range(fits[0] if fits else top)
+        elif index > 0 and shunt < RANGE_DOWN_FRACTION * SHUNT_RANGES[index - 1]:
+            self._below += 1
+            if self._below >= RANGE_DOWN_COUNT:
+                self._set_range(index - 1)
+        else:
+            self._below = 0
+
+    def _read_burst_raw(self) -> Tuple[int, int, int]:
+        """Bus voltage, current and power registers in one bus transaction."""
+        if self._messages is None:
+            # Built once: the read messages own their buffers and are reused.
+            self._reads = tuple(i2c_msg.read(self.address, 2) for _ in range(3))
+            self._messages = []
+            for reg, msg in zip((REG_BUS_VOLTAGE, REG_CURRENT, REG_POWER), self._reads):
+                self._messages.append(i2c_msg.write(self.address, [reg]))
+                self._messages.append(msg)
+        with self.device.transaction("ina219", i2c_bus.PRIORITY_CRITICAL) as handle:
+            handle.i2c_rdwr(*self._messages)
+        bus_msg, current_msg, power_msg = self._reads
+        buf = bus_msg.buf
+        bus_raw = (buf[0][0] << 8) | buf[1][0]
+        buf = current_msg.buf
+        current_raw = (buf[0][0] << 8) | buf[1][0]
+        buf = power_msg.buf
+        power_raw = (buf[0][0] << 8) | buf[1][0]
+        return bus_raw, current_raw, power_raw
+
+    @staticmethod
+    def coherent(bus_raw: int, current_raw: int, power_raw: int) -> bool:
+        """True if the power register matches current x bus voltage (one conversion)."""
+        expected = abs(_signed(current_raw)) * (bus_raw >> 3) // 5000
+        return abs(power_raw - expected) <= max(2, expected >> 8)
+
+    def read_burst(self) -> Optional[Measurement]:
+        """One coherent, new conversion, or None if there is none yet.
+
+        Raises on bus errors so callers can tell a failed bus from a stale
+        register set.
+        """
+        now = time.perf_counter()
+        if now - self._last_burst < self.conversion_time:
+            # Polled faster than the chip converts: check CNVR on its own first,
+            # because the burst's power read would clear a flag that sets mid-burst.
+            bus_word = self.device.read_word(
+                "ina219", self.address, REG_BUS_VOLTAGE, i2c_bus.PRIORITY_CRITICAL
+            )
+            if not bus_word & (BUS_CNVR << 8):  # SMBus word is byte-swapped
+                self.stale += 1
+                return None
+        self._last_burst = now
+        bus_raw, current_raw, power_raw = self._read_burst_raw()
+        if not bus_raw & BUS_CNVR:
+            self.stale += 1
+            return None
+        if not bus_raw & BUS_OVF and not self.coherent(bus_raw, current_raw, power_raw):
+            # A conversion landed mid-burst. It has finished now, so a second
+            # read (CNVR already cleared by the first) sees one consistent set.
+            self.incoherent += 1
+            bus_raw, current_raw, power_raw = self._read_burst_raw()
+            if not self.coherent(bus_raw, current_raw, power_raw):
+                return None
+        self.overflow = bool(bus_raw & BUS_OVF)
+        voltage = (bus_raw >> 3) * BUS_LSB_V
+        if self.overflow:
+            return Measurement((voltage, None, None), self.range_info, True)
+        lsb = self.current_lsb
+        return Measurement(
+            (voltage, _signed(current_raw) * lsb, power_raw * lsb * 20), self.range_info
+        )
+
+    def _autorange(self, reading: Measurement) -> None:
+        try:
+            self._update_range(reading[1], reading.overflow)
+        except Exception as e:
+            self._record_error(e)
+
+    def _read_single(self) -> Optional[Measurement]:
+        """One reading in the configured mode; raises on bus errors."""
+        if self.burst:
+            return self.read_burst()
+        bus_voltage_raw, current_raw, power_raw = (
+            _swap(
+                self.device.read_word(
+                    "ina219", self.address, reg, i2c_bus.PRIORITY_CRITICAL
+                )
+            )
+            for reg in (REG_BUS_VOLTAGE, REG_CURRENT, REG_POWER)
+        )
+        overflow = bool(bus_voltage_raw & BUS_OVF)
+        voltage = (bus_voltage_raw >> 3) * BUS_LSB_V  # 4 mV per bit
+        current_lsb = self.current_lsb
+        current = _signed(current_raw) * current_lsb  # A
+        power = power_raw * current_lsb * 20  # Power LSB = 20 * current LSB
+        return Measurement((voltage, current, power), self.range_info, overflow)
+
+    def _record_error(self, exc: Exception) -> None:
+        self.errors += 1
+        self.last_error = str(exc)
+        self.health.failure(exc)
+
+    def read(self):
+        """전압(V), 전류(A), 전력(W) 튜플 반환 (``Measurement``: 측정 범위 정보 포함)"""
+        self.fresh = False
+        if not self._ready():
+            return None, None, None
+        try:
+            reading = self._read_single()
+        except Exception as e:
+            self._record_error(e)
+            return None, None, None
+        self.health.success()
+        self.fresh = reading is not None
+        if reading is None:
+            return self._last
+        self.overflow = reading.overflow
+        if self.burst:
+            self._last = reading
+        if self.autorange:
+            self._autorange(reading)
+        return reading
+
+    def read_new(self) -> Optional[Measurement]:
+        """Like ``read``, but None instead of a cached reading without a new conversion.
+
+        For samplers that store every reading: a repeated conversion is not a
+        new sample.
+        """
+        reading = self.read()
+        return reading if self.fresh else None
+
+    def oversample(
+        self, count: int = DEFAULT_OVERSAMPLE, budget: float = DEFAULT_OVERSAMPLE_BUDGET
+    ) -> Oversampled:
+        """Up to ``count`` new conversions in ``budget`` seconds, robustly summarized.
+
+        Does not raise: failed reads are skipped and counted in the result's
+        ``errors`` (and in ``self.errors``/``self.last_error``); it gives up
+        early once more than half of ``count`` reads have failed or the
+        breaker opens.
+        Overflowed conversions are not averaged but set ``overflow``.
+        """
+        started = time.perf_counter()
+        deadline = started + budget
+        samples = []
+        errors = 0
+        overflow = False
+        while len(samples) < count and self._ready():
+            try:
+                reading = self._read_single()
+            except Exception as e:
+                self._record_error(e)
+                errors += 1
+                reading = None
+            else:
+                self.health.success()
+            if reading is not None:
+                self.overflow = reading.overflow
+                if reading.overflow:
+                    overflow = True
+                else:
+                    samples.append(reading)
+                if self.burst:
+                    self._last = reading
+                if self.autorange:
+                    self._autorange(reading)
+            now = time.perf_counter()
+            if (
+                now >= deadline or errors > count // 2
+            ):  # past budget, or the bus is down
+                break
+            # Wait for the next conversion with the bus released; poll a
+            # little faster when this one was not ready yet.
+            wait = (
+                self.conversion_time
+                if reading is not None
+                else self.conversion_time / 4
+            )
+            time.sleep(min(wait, deadline - now))
+        return summarize(
+            samples,
+            self.resolution,
+            errors=errors,
+            range_info=self.range_info,
+            overflow=overflow,
+            elapsed=time.perf_counter() - started,
+        )
@@ -0,0 +1,184 @@
+"""Servo motion on its own thread, with superseded targets coalesced.
+
+Moving the panel used to block the caller for the whole move (each axis
+in turn, 0.4 s apiece), which stalled the FastAPI event loop on every
+``/api/v1/control/motor`` call. ``MotionExecutor`` owns the servos: one
+thread runs ``drive(azimuth, altitude)`` -- both axes together -- and
+``submit()`` only records the target and returns a
+``concurrent.futures.Future``.
+
+There is one pending slot, not a queue. A target submitted while another
+is still waiting replaces it, so a dragged dashboard slider (dozens of
+requests a second) produces the move in progress plus one move to the last
+position, not one move per request. Every future submitted for a coalesced
+target completes with the target that was actually driven to; compare it
+with what was asked for to tell a superseded request. A future cancelled
+before its move starts is dropped, and a move whose futures were all
+cancelled is skipped.
+
+A drive that can stop part-way (the trajectory follower of
+``motion_planner``) sleeps between steps with ``preempted(seconds)``,
+which returns True as soon as a new target is pending, and returns False
+itself when it gave up. Its futures do not join the new target's: they
+complete with the pose the servos stopped at (``position()``, or None
+without it), so a caller blocked on its own move is not told it reached
+somebody else's target.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+Target = Tuple[float, float]  # azimuth, altitude (servo degrees)
+
+
+class MotionExecutor:
+    def __init__(
+        self,
+        drive: Callable[[float, float], Any],
+        name: str = "servo-motion",
+        position: Optional[Callable[[], Target]] = None,
+    ):
+        self._drive = drive
+        self._position = position
+        self.name = name
+        self._cond = threading.Condition()
+        self._pending: Optional[Target] = None
+        self._waiters: List[Future] = []
+        self._busy = False
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.target: Optional[Target] = None  # last requested
+        self.requests = 0
+        self.moves = 0
+        self.coalesced = 0  # targets replaced before they were driven
+        self.interrupted = 0  # moves abandoned mid-flight for a newer target
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    # --- Thread ---
+    def start(self) -> None:
+        with self._cond:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop = False
+            self._thread = threading.Thread(
+                target=self._run, name=self.name, daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Finish the move in progress, cancel what is still pending."""
+        with self._cond:
+            self._stop = True
+            waiters, self._waiters, self._pending = self._waiters, [], None
+            self._cond.notify_all()
+        for future in waiters:
+            future.cancel()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return
+                target, waiters = self._pending, self._waiters
+                self._pending, self._waiters = None, []
+                self._busy = True
+            try:
+                self._move(target, waiters)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _move(self, target: Target, waiters: List[Future]) -> None:
+        # Futures carried over when a drive gave up with nothing newer are already
+        # running.
+        waiters = [
+            f for f in waiters if f.running() or f.set_running_or_notify_cancel()
+        ]
+        if not waiters:
+            return
+        try:
+            reached = self._drive(*target)
+        except Exception as exc:
+            self.errors += 1
+            self.last_error = str(exc)
+            for future in waiters:
+                future.set_exception(exc)
+            return
+        if reached is False:
+            self.interrupted += 1
+            with self._cond:
+                stopped = self._stop
+                if not stopped and self._pending is None:
+                    self._pending = target  # nothing newer after all: finish this one
+                    self._waiters[:0] = waiters
+                    return
+            if stopped:
+                for future in waiters:
+                    future.set_exception(RuntimeError(f"{self.name} stopped"))
+                return
+            # Superseded: report where the servos stopped, not the newer target.
+            stopped_at = self._position() if self._position is not None else None
+            for future in waiters:
+                future.set_result(stopped_at)
+            return
+        self.moves += 1
+        for future in waiters:
+            future.set_result(target)
+
+    def preempted(self, timeout: float = 0.0) -> bool:
+        """For drives: wait up to ``timeout``; True once a new target or stop is set."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._pending is not None or self._stop, timeout
+            )
+
+    # --- Commands ---
+    def submit(self, azimuth: float, altitude: float) -> Future:
+        """Queue a move to ``(azimuth, altitude)``, replacing one not yet started."""
+        future: Future = Future()
+        with self._cond:
+            if self._stop:
+                raise RuntimeError(f"{self.name} stopped")
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = self.target = (azimuth, altitude)
+            self._waiters.append(future)
+            self.requests += 1
+            self._cond.notify_all()
+        if not self.running():
+            self.start()
+        return future
+
+    def idle(self) -> bool:
+        with self._cond:
+            return self._pending is None and not self._busy
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is pending or moving; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._pending is None and not self._busy, timeout
+            )
+
+    def stats(self) -> dict:
+        return {
+            "target": self.target,
+            "busy": not self.idle(),
+            "requests": self.requests,
+            "moves": self.moves,
+            "coalesced": self.coalesced,
+            "interrupted": self.interrupted,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,221 @@
+"""Background INA219 sampler with a ring buffer and running energy totals.
+
+The tracker loop only wakes once a minute, so integrating its single
+readings gives a poor energy figure. ``PowerSampler`` reads the sensor at
+``rate_hz`` on its own thread into preallocated NumPy arrays (timestamp,
+voltage, current, power) and integrates power and current with the
+trapezoidal rule as samples arrive. Nothing is allocated per sample beyond
+what the reader itself returns; window statistics are computed on demand
+from the ring (``stats()``), not per sample.
+
+Gaps longer than ``max_gap`` (sensor errors, a stalled bus) are not
+integrated across; their total is reported as ``gap_seconds`` so a low
+energy figure can be told apart from missing data. Daily totals roll over at
+local midnight.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_RATE_HZ = 20.0
+DEFAULT_WINDOW_SECONDS = 60.0
+DEFAULT_MAX_GAP = 2.0  # seconds; longer gaps are not integrated across
+
+Reading = Tuple[Optional[float], Optional[float], Optional[float]]
+
+
+def _next_midnight(now: float) -> float:
+    today = datetime.fromtimestamp(now).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    return (today + timedelta(days=1)).timestamp()
+
+
+class PowerSampler:
+    def __init__(
+        self,
+        read: Callable[[], Optional[Reading]],
+        rate_hz: float = DEFAULT_RATE_HZ,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        max_gap: float = DEFAULT_MAX_GAP,
+    ):
+        self._read = read
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.window_seconds = window_seconds
+        self.max_gap = max_gap
+
+        capacity = max(2, int(round(rate_hz * window_seconds)))
+        self._t = np.zeros(capacity)  # monotonic seconds
+        self._v = np.zeros(capacity)
+        self._i = np.zeros(capacity)
+        self._p = np.zeros(capacity)
+        self._index = 0  # next slot to write
+        self._filled = 0
+        self._lock = threading.Lock()
+
+        self.samples = 0
+        self.errors = 0
+        self.energy_wh = 0.0  # since start
+        self.charge_ah = 0.0
+        self.today_wh = 0.0
+        self.today_ah = 0.0
+        self.yesterday_wh: Optional[float] = None
+        self.gap_seconds = 0.0
+        self._last: Optional[Tuple[float, float, float, float]] = None  # t, v, i, p
+        self._midnight = _next_midnight(time.time())
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Thread ---
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="power-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            self.sample_once()
+            deadline += self.period
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                deadline = (
+                    time.monotonic()
+                )  # fell behind (slow bus): don't burst to catch up
+
+    # --- Sampling ---
+    def sample_once(self) -> bool:
+        try:
+            reading = self._read()
+        except Exception:
+            reading = None
+        now = time.monotonic()
+        if not reading or reading[0] is None or reading[1] is None:
+            self.errors += 1
+            return False
+        voltage, current, power = reading
+        if power is None:
+            power = voltage * current
+        self.add(now, voltage, current, power)
+        return True
+
+    def add(self, t: float, voltage: float, current: float, power: float) -> None:
+        """Store one sample taken at monotonic time ``t`` and integrate it."""
+        with self._lock:
+            k = self._index
+            self._t[k] = t
+            self._v[k] = voltage
+            self._i[k] = current
+            self._p[k] = power
+            self._index = (k + 1) % len(self._t)
+            self._filled = min(self._filled + 1, len(self._t))
+            self.samples += 1
+
+            last = self._last
+            if last is not None:
+                dt = t - last[0]
+                if 0 < dt <= self.max_gap:
+                    wh = (last[3] + power) * 0.5 * dt / 3600.0
+                    ah = (last[2] + current) * 0.5 * dt / 3600.0
+                    self.energy_wh += wh
+                    self.charge_ah += ah
+                    self.today_wh += wh
+                    self.today_ah += ah
+                else:
+                    self.gap_seconds += max(dt, 0.0)
+            self._last = (t, voltage, current, power)
+
+            if time.time() >= self._midnight:
+                self.yesterday_wh = self.today_wh
+                self.today_wh = self.today_ah = 0.0
+                self._midnight = _next_midnight(time.time())
+
+    # --- Queries ---
+    def latest(self) -> Reading:
+        last = self._last
+        if last is None:
+            return None, None, None
+        return last[1], last[2], last[3]
+
+    def age(self) -> Optional[float]:
+        last = self._last
+        return None if last is None else time.monotonic() - last[0]
+
+    def recent(self, count: int) -> List[Reading]:
+        """The last ``count`` samples, oldest first (for ``ina219.summarize``)."""
+        with self._lock:
+            n = min(count, self._filled)
+            order = np.arange(self._index - n, self._index) % len(self._t)
+            return list(
+                zip(
+                    self._v[order].tolist(),
+                    self._i[order].tolist(),
+                    self._p[order].tolist(),
+                )
+            )
+
+    def _window(self, seconds: float):
+        """Views of the samples from the last ``seconds`` in time order."""
+        n = self._filled
+        if n == 0:
+            return None
+        order = np.arange(self._index - n, self._index) % len(self._t)
+        t = self._t[order]
+        keep = t >= time.monotonic() - seconds
+        return t[keep], self._v[order][keep], self._i[order][keep], self._p[order][keep]
+
+    def stats(self, seconds: Optional[float] = None) -> dict:
+        """Window statistics plus running totals (for ``get_latest_status``)."""
+        seconds = self.window_seconds if seconds is None else seconds
+        with self._lock:
+            window = self._window(seconds)
+            totals = {
+                "energy_wh": round(self.energy_wh, 5),
+                "charge_ah": round(self.charge_ah, 6),
+                "today_wh": round(self.today_wh, 5),
+                "today_ah": round(self.today_ah, 6),
+                "yesterday_wh": (
+                    None if self.yesterday_wh is None else round(self.yesterday_wh, 5)
+                ),
+                "samples": self.samples,
+                "errors": self.errors,
+                "gap_seconds": round(self.gap_seconds, 1),
+                "rate_hz": self.rate_hz,
+            }
+        if window is None or len(window[0]) == 0:
+            totals["window"] = None
+            return totals
+        t, v, i, p = window
+        totals["window"] = {
+            "seconds": round(float(t[-1] - t[0]), 2),
+            "count": int(len(t)),
+            "voltage_mean": round(float(v.mean()), 4),
+            "current_mean": round(float(i.mean()), 5),
+            "current_min": round(float(i.min()), 5),
+            "current_max": round(float(i.max()), 5),
+            "power_mean": round(float(p.mean()), 4),
+            "power_min": round(float(p.min()), 4),
+            "power_max": round(float(p.max()), 4),
+            "power_std": round(float(p.std()), 5),
+        }
+        return totals
@@ -3,12 +3,52 @@
 This module attempts to read real sensors (GPS, INA219, DHT11/22) when
 available and falls back to lightweight mock data if hardware or drivers are
 missing. Photodiodes are intentionally excluded.
+
+``read_all()`` never waits longer than ``SENSOR_READ_DEADLINE``: the reads
+run concurrently and a sensor that has not answered in time (a GPS
+``readline`` waiting out its timeout, a stuck bus) is reported with its
+last good value. Each field comes with the time it was sampled
+(``sample_time``) and a ``stale`` flag. A read that overruns keeps running
+and its result is used, as new, by the next call; no second read of that
+sensor is started meanwhile. The DHT is read from ``DhtService``'s cache,
+so its sample time is when the service measured it (``dht_age`` earlier),
+and it is stale once that is more than one sensor interval plus the
+deadline ago, however recently the cache was read.
 """
 
 import os
 import random
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Set
+
+try:
+    from . import nmea, ubx
+    from .clock import ClockService
+    from .power_sampler import PowerSampler
+    from . import ina219
+    from . import dht_service
+    from . import hardware_config
+    from .sensor_scheduler import LatestTable, Sample, SensorScheduler
+except ImportError:
+    # Allow running as a standalone script (no package parent)
+    import nmea  # type: ignore
+    import ubx  # type: ignore
+    from clock import ClockService  # type: ignore
+    from power_sampler import PowerSampler  # type: ignore
+    import ina219  # type: ignore
+    import dht_service  # type: ignore
+    import hardware_config  # type: ignore
+    from sensor_scheduler import LatestTable, Sample, SensorScheduler  # type: ignore
+
+# Fields each sensor read provides; the first one decides whether a read produced data.
+SENSOR_FIELDS = {
+    "ina219": ("voltage", "current", "power"),
+    "dht11": ("temperature", "humidity"),
+    "gps": ("latitude", "longitude"),
+}
+# Readings served from a driver cache: the field holding how old the value already was.
+AGE_FIELDS = {"dht11": "dht_age"}
 
 
 class SensorReader:
@@ -16,15 +56,50 @@ class SensorReader:
         self.mock_mode = os.getenv("USE_SENSOR_MOCK") == "1"
         self.gps_port = os.getenv("GPS_PORT", "/dev/ttyAMA0")
         self.gps_baud = int(os.getenv("GPS_BAUD", "9600"))
+        self.gps_configure = os.getenv("GPS_CONFIGURE", "1") == "1"
         self.dht_pin_name = os.getenv("DHT_PIN", "D17")  # board pin name
+        self.dht_kind = os.getenv("DHT_SENSOR", "DHT11")
         self.i2c_bus_num = int(os.getenv("I2C_BUS", "3"))  # default to bus 3
+        # Background INA219 sampling for energy totals; 0 reads once per read_all().
+        self.ina_sample_hz = float(os.getenv("INA219_SAMPLE_HZ", "20"))
+        self.ina_shunt_ohms = float(os.getenv("INA219_SHUNT_OHMS", "0.1"))
+        self.ina_samples = int(os.getenv("INA219_SAMPLES", "8"))
+        # Pick PGA gain and calibration from the measured current instead of a fixed
+        # 32V/2A setup.
+        self.ina_autorange = os.getenv("INA219_AUTORANGE", "1") == "1"
+        # Without the sampler each read_all() takes this many outlier-filtered samples.
+        self.ina_oversample = int(os.getenv("INA219_OVERSAMPLE", "16"))
+        self.ina_oversample_budget = float(
+            os.getenv("INA219_OVERSAMPLE_BUDGET", "0.25")
+        )
+        self._power_sampler = None
         self._gps_serial = None
+        # GPS RMC times discipline the timestamps; system time until the first fix.
+        self.clock = ClockService()
         self._ina = None
         self._dht = None
-
-        # Cache for last known good values
-        self._last_ina_data = {"voltage": None, "current": None, "power": None}
-        self._last_dht_data = {"temperature": None, "humidity": None}
+        # Per-sensor cadence once start() runs the scheduler (photodiodes are not
+        # read here).
+        self.ina_interval = float(
+            hardware_config.setting("sensors.ina219.sample_interval", 1)
+        )
+        self.dht_interval = float(
+            hardware_config.setting(
+                "sensors.dht11.sample_interval", dht_service.DEFAULT_INTERVAL
+            )
+        )
+        self.gps_interval = float(os.getenv("GPS_SAMPLE_INTERVAL", "1"))
+        self.scheduler: Optional[SensorScheduler] = None
+        # Last good reading per sensor, shared with the scheduler.
+        self.table = LatestTable()
+        self.read_deadline = float(
+            os.getenv("SENSOR_READ_DEADLINE", "0.5")
+        )  # seconds for all of read_all()
+        self._read_pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Any] = {}  # sensor -> Future of a read still in flight
+        self._last_read_all: Optional[float] = (
+            None  # monotonic time the previous read_all() collected
+        )
 
         if not self.mock_mode:
             self._setup_hardware()
@@ -34,58 +109,40 @@ class SensorReader:
         self._setup_gps()
         self._setup_ina219()
         self._setup_dht()
+        if self._ina and self.ina_sample_hz > 0:
+            self._power_sampler = PowerSampler(self._sample_ina219, self.ina_sample_hz)
+            self._power_sampler.start()
 
     def _setup_gps(self):
         try:
             import serial  # type: ignore
 
-            self._gps_serial = serial.Serial(
-                self.gps_port, self.gps_baud, timeout=1
-            )
+            self._gps_serial = serial.Serial(self.gps_port, self.gps_baud, timeout=1)
+            if self.gps_configure:
+                ubx.configure(self._gps_serial)
         except Exception as exc:  # pragma: no cover - hardware dependent
             print(f"GPS unavailable: {exc}")
             self._gps_serial = None
 
     def _setup_ina219(self):
         try:
-            from adafruit_ina219 import INA219  # type: ignore
-
-            i2c = None
-            # Prefer explicitly configured bus (default 3). Requires adafruit_extended_bus.
-            if self.i2c_bus_num:
-                try:
-                    import adafruit_extended_bus as exbus  # type: ignore
-
-                    i2c = exbus.ExtendedI2C(self.i2c_bus_num)
-                except Exception as exc:  # pragma: no cover - hardware dependent
-                    print(f"INA219 unavailable on I2C bus {self.i2c_bus_num}: {exc}")
-                    self._ina = None
-                    return
-            else:
-                import board  # type: ignore
-                import busio  # type: ignore
-
-                i2c = busio.I2C(board.SCL, board.SDA)
-
-            self._ina = INA219(i2c)
-            # This is a critical step for current measurement.
-            # The INA219 needs to be calibrated based on the shunt resistor
-            # and the expected current range. Using a common default.
-            self._ina.set_calibration_32V_2A()
+            # Configured bus (default 3) or the board's bus 1, shared through i2c_bus.
+            # Kept even if the chip is not found yet: its breaker reprobes the bus.
+            self._ina = ina219.INA219Reader(
+                (self.i2c_bus_num or 1,),
+                shunt_ohms=self.ina_shunt_ohms,
+                samples=self.ina_samples,
+                autorange=self.ina_autorange,
+            )
         except Exception as exc:  # pragma: no cover - hardware dependent
             print(f"INA219 unavailable: {exc}")
             self._ina = None
 
     def _setup_dht(self):
-        try:
-            import board  # type: ignore
-            import adafruit_dht  # type: ignore
-
-            pin = getattr(board, self.dht_pin_name)
-            self._dht = adafruit_dht.DHT11(pin)
-        except Exception as exc:  # pragma: no cover - hardware dependent
-            print(f"DHT unavailable: {exc}")
-            self._dht = None
+        # One device per process, read on the service thread at
+        # sensors.dht11.sample_interval.
+        self._dht = dht_service.get_service(self.dht_pin_name, self.dht_kind)
+        self._dht.start()
 
     # --- Reading helpers ---
     def _read_gps(self) -> Dict[str, Optional[float]]:
@@ -97,42 +154,27 @@ class SensorReader:
         if not self._gps_serial:
             return {"latitude": None, "longitude": None}
         try:
-            line = self._gps_serial.readline().decode(errors="ignore").strip()
-            return self._parse_nmea(line)
+            return self._parse_nmea(self._gps_serial.readline(), self.clock)
         except Exception:
             return {"latitude": None, "longitude": None}
 
     @staticmethod
-    def _parse_nmea(line: str) -> Dict[str, Optional[float]]:
-        if not line.startswith("$GPGGA") and not line.startswith("$GPRMC"):
+    def _parse_nmea(
+        line, clock: Optional[ClockService] = None
+    ) -> Dict[str, Optional[float]]:
+        """Position from a checksum-valid RMC/GGA sentence of any talker."""
+        fix = nmea.parse(line, ("RMC", "GGA"))
+        if (
+            clock is not None
+            and fix is not None
+            and fix.kind == "RMC"
+            and fix.valid
+            and fix.date is not None
+        ):
+            clock.add_gps(fix.timestamp())
+        if fix is None or fix.kind not in ("RMC", "GGA") or not fix.valid:
             return {"latitude": None, "longitude": None}
-
-        parts = line.split(",")
-        if line.startswith("$GPGGA") and len(parts) > 5:
-            lat_raw, lat_dir, lon_raw, lon_dir = parts[2], parts[3], parts[4], parts[5]
-        elif line.startswith("$GPRMC") and len(parts) > 6:
-            lat_raw, lat_dir, lon_raw, lon_dir = parts[3], parts[4], parts[5], parts[6]
-        else:
-            return {"latitude": None, "longitude": None}
-
-        def to_decimal(raw: str, direction: str) -> Optional[float]:
-            if not raw or not direction:
-                return None
-            try:
-                deg_len = 2 if direction in ("N", "S") else 3
-                degrees = float(raw[:deg_len])
-                minutes = float(raw[deg_len:])
-                value = degrees + minutes / 60.0
-                if direction in ("S", "W"):
-                    value *= -1
-                return value
-            except Exception:
-                return None
-
-        return {
-            "latitude": to_decimal(lat_raw, lat_dir),
-            "longitude": to_decimal(lon_raw, lon_dir),
-        }
+        return {"latitude": fix.latitude, "longitude": fix.longitude}
 
     def _read_ina219(self) -> Dict[str, Optional[float]]:
         if self.mock_mode:
@@ -142,41 +184,196 @@ class SensorReader:
             return {"voltage": voltage, "current": current, "power": power}
 
         if not self._ina:
-            return self._last_ina_data
-        try:
-            voltage = float(self._ina.bus_voltage)
-            current = float(self._ina.current) / 1000.0  # mA -> A
-            power = voltage * current
-            self._last_ina_data = {"voltage": voltage, "current": current, "power": power}
-            return self._last_ina_data
-        except Exception:
-            return self._last_ina_data
+            return {"voltage": None, "current": None, "power": None}
+        if self._power_sampler is not None:
+            return self._sampled_ina219() or {
+                "voltage": None,
+                "current": None,
+                "power": None,
+            }
+        voltage, current, power = self._ina.oversample(
+            self.ina_oversample, self.ina_oversample_budget
+        )
+        if voltage is None or current is None:
+            return {"voltage": None, "current": None, "power": None}
+        return {"voltage": voltage, "current": current, "power": power}
+
+    def _sample_ina219(self):
+        return self._ina.read()
+
+    def _sampled_ina219(self) -> Optional[Dict[str, Optional[float]]]:
+        """Latest sampler values plus energy totals (None if the sampler stalled)."""
+        sampler = self._power_sampler
+        age = sampler.age()
+        if age is None or age > sampler.max_gap:
+            return None
+        voltage, current, power = sampler.latest()
+        return {
+            "voltage": voltage,
+            "current": current,
+            "power": power,
+            "energy_wh": sampler.energy_wh,
+            "today_wh": sampler.today_wh,
+        }
 
     def _read_dht(self) -> Dict[str, Optional[float]]:
         if self.mock_mode:
             return {
                 "temperature": round(25.0 + random.uniform(-2, 2), 1),
                 "humidity": round(50.0 + random.uniform(-5, 5), 1),
+                "dht_age": 0.0,
             }
         if not self._dht:
-            return self._last_dht_data
+            return {"temperature": None, "humidity": None, "dht_age": None}
+        temperature, humidity, age = self._dht.latest()
+        return {"temperature": temperature, "humidity": humidity, "dht_age": age}
+
+    def _poll_gps(self) -> Optional[Dict[str, Optional[float]]]:
+        """Newest fix among the buffered sentences, or None (scheduler task)."""
+        fix = None
+        while True:
+            reading = self._read_gps()
+            if reading["latitude"] is not None:
+                fix = reading
+            if not self._gps_serial or not self._gps_serial.in_waiting:
+                return fix
+
+    def _readers(self) -> Dict[str, Callable[[], Optional[Dict[str, Any]]]]:
+        return {
+            "ina219": self._read_ina219,
+            "dht11": self._read_dht,
+            "gps": self._read_gps,
+        }
+
+    @staticmethod
+    def _usable(name: str, value: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """The reading if it carries data, else None (keeps the last good value)."""
+        if not value or value.get(SENSOR_FIELDS[name][0]) is None:
+            return None
+        return value
+
+    @staticmethod
+    def _age(name: str, value: Dict[str, Any]) -> float:
+        """Seconds a reading was already old when it was read (0 for direct reads)."""
+        field = AGE_FIELDS.get(name)
+        return (value.get(field) or 0.0) if field else 0.0
+
+    def _intervals(self) -> Dict[str, float]:
+        return {
+            "ina219": self.ina_interval,
+            "dht11": self.dht_interval,
+            "gps": self.gps_interval,
+        }
+
+    def _fetch(self, name: str, read: Callable[[], Optional[Dict[str, Any]]]) -> bool:
+        """Read and publish one sensor, dated when measured; True if it had data."""
+        started = time.monotonic()
+        timestamp = self.clock.time()
         try:
-            self._last_dht_data = {
-                "temperature": float(self._dht.temperature),
-                "humidity": float(self._dht.humidity),
-            }
-            return self._last_dht_data
+            value = self._usable(name, read())
         except Exception:
-            return self._last_dht_data
+            value = None
+        if value is None:
+            return False
+        age = self._age(name, value)
+        self.table.publish(
+            name,
+            Sample(
+                value, started - age, timestamp - age, time.monotonic() - started + age
+            ),
+        )
+        return True
+
+    def _read_concurrently(self) -> Set[str]:
+        """Fan out the reads and wait up to ``read_deadline``; returns who delivered."""
+        if self._read_pool is None:
+            self._read_pool = ThreadPoolExecutor(
+                max_workers=len(SENSOR_FIELDS), thread_name_prefix="read_all"
+            )
+        futures = {}
+        for name, read in self._readers().items():
+            pending = self._pending.get(name)
+            if pending is not None and not pending.done():
+                continue  # previous read overran; don't stack another
+            futures[name] = self._pending[name] = self._read_pool.submit(
+                self._fetch, name, read
+            )
+        done, _ = wait(futures.values(), timeout=self.read_deadline)
+        return {
+            name
+            for name, future in futures.items()
+            if future in done and future.result()
+        }
 
     # --- Public API ---
+    def start(self) -> SensorScheduler:
+        """Read each sensor at its own interval in the background.
+
+        ``read_all()`` then returns the latest published values without
+        touching the hardware; ``scheduler.stats()`` reports missed
+        deadlines and jitter per sensor.
+        """
+        if self.scheduler is None:
+            scheduler = SensorScheduler(self.table, clock=self.clock.time)
+            scheduler.add(
+                "ina219",
+                self.ina_interval,
+                lambda: self._usable("ina219", self._read_ina219()),
+            )
+            scheduler.add(
+                "dht11",
+                self.dht_interval,
+                lambda: self._usable("dht11", self._read_dht()),
+                age=lambda value: self._age("dht11", value),
+            )
+            scheduler.add("gps", self.gps_interval, self._poll_gps)
+            self.scheduler = scheduler
+        self.scheduler.start()
+        return self.scheduler
+
+    def stop(self) -> None:
+        if self.scheduler is not None:
+            self.scheduler.stop()
+
     def read_all(self) -> Dict[str, Any]:
         data: Dict[str, Any] = {
-            "timestamp": time.time(),
+            "timestamp": self.clock.time(),
+            "clock_error": self.clock.error_estimate(),
         }
-        data.update(self._read_ina219())
-        data.update(self._read_dht())
-        data.update(self._read_gps())
+        scheduled = self.scheduler is not None and self.scheduler.running()
+        intervals = self._intervals()
+        if not scheduled:
+            fresh = self._read_concurrently()
+        now = time.monotonic()
+        previous, self._last_read_all = self._last_read_all, now
+        sample_time: Dict[str, Optional[float]] = {}
+        stale: Dict[str, bool] = {}
+        for name, fields in SENSOR_FIELDS.items():
+            sample = self.table.get(name)
+            if sample is None:
+                data.update(dict.fromkeys(fields))
+                sample_time.update(dict.fromkeys(fields))
+                stale.update(dict.fromkeys(fields, True))
+                continue
+            data.update(sample.value)
+            if scheduled:
+                is_stale = now - sample.monotonic > 2 * intervals[name]  # missed a slot
+            else:
+                # New if read now or finished (after overrunning) since the previous
+                # call.
+                is_stale = name not in fresh and (
+                    previous is None or sample.monotonic + sample.duration < previous
+                )
+                if name in AGE_FIELDS:
+                    # A cached value is only as new as its measurement.
+                    is_stale = (
+                        is_stale
+                        or now - sample.monotonic > intervals[name] + self.read_deadline
+                    )
+            sample_time.update(dict.fromkeys(sample.value, sample.timestamp))
+            stale.update(dict.fromkeys(sample.value, is_stale))
+        data["sample_time"] = sample_time
+        data["stale"] = stale
         return data
 
 
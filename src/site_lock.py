@@ -0,0 +1,160 @@
+"""Stationary-site position lock for a tracker that never moves.
+
+The panel is bolted down, so after enough fixes there is nothing left to
+learn from the GPS position. ``StationarySite`` collects fixes (at most one
+per ``sample_spacing`` seconds so consecutive, strongly correlated fixes do
+not dominate), takes their component-wise median and locks once the median
+distance of the samples from it -- a CEP50 estimate that ignores outliers --
+is below ``max_spread_m``. The lock is persisted alongside the regular cache
+entry so a restart does not have to re-learn it.
+
+While locked the tracker uses the stored position and only consults the GPS
+every ``check_interval`` seconds. The check fix doubles as a time sample for
+``clock.ClockService``; if it lands more than ``drift_limit_m`` away the lock
+is dropped and collection starts over.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_MIN_FIXES = 60
+DEFAULT_MAX_SPREAD_M = 5.0
+DEFAULT_SAMPLE_SPACING = 10.0  # seconds between fixes that enter the median
+DEFAULT_CHECK_INTERVAL = 6 * 3600  # seconds between GPS checks once locked
+DEFAULT_DRIFT_LIMIT_M = 100.0  # a check fix farther than this means the site moved
+METERS_PER_DEGREE = 111_320.0
+
+
+def distance_m(lat0: float, lon0: float, lat1: float, lon1: float) -> float:
+    """Equirectangular distance; exact enough at tracker scales (< a few km)."""
+    dy = (lat1 - lat0) * METERS_PER_DEGREE
+    dx = (lon1 - lon0) * METERS_PER_DEGREE * math.cos(math.radians(lat0))
+    return math.hypot(dx, dy)
+
+
+class StationarySite:
+    def __init__(
+        self,
+        min_fixes: int = DEFAULT_MIN_FIXES,
+        max_spread_m: float = DEFAULT_MAX_SPREAD_M,
+        sample_spacing: float = DEFAULT_SAMPLE_SPACING,
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+        drift_limit_m: float = DEFAULT_DRIFT_LIMIT_M,
+    ):
+        self.min_fixes = min_fixes
+        self.max_spread_m = max_spread_m
+        self.sample_spacing = sample_spacing
+        self.check_interval = check_interval
+        self.drift_limit_m = drift_limit_m
+
+        self._lock = threading.Lock()
+        self._lats: deque = deque(maxlen=min_fixes * 2)
+        self._lons: deque = deque(maxlen=min_fixes * 2)
+        self._last_sample: Optional[float] = None
+        self.locked = False
+        self.latitude: Optional[float] = None
+        self.longitude: Optional[float] = None
+        self.spread_m: Optional[float] = None
+        self.last_check: Optional[float] = None  # monotonic
+        self.last_drift_m: Optional[float] = None
+
+    # --- Collection ---
+    def add_fix(self, latitude: float, longitude: float) -> bool:
+        """Offer one GPS fix; returns True when this fix completed the lock.
+
+        Safe to call from the GPS streaming thread.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.locked:
+                return False
+            if (
+                self._last_sample is not None
+                and now - self._last_sample < self.sample_spacing
+            ):
+                return False
+            self._last_sample = now
+            self._lats.append(latitude)
+            self._lons.append(longitude)
+            if len(self._lats) < self.min_fixes:
+                return False
+
+            lats = np.fromiter(self._lats, dtype=float)
+            lons = np.fromiter(self._lons, dtype=float)
+            lat, lon = float(np.median(lats)), float(np.median(lons))
+            dy = (lats - lat) * METERS_PER_DEGREE
+            dx = (lons - lon) * METERS_PER_DEGREE * math.cos(math.radians(lat))
+            spread = float(np.median(np.hypot(dx, dy)))
+            self.spread_m = spread
+            if spread > self.max_spread_m:
+                return False
+
+            self.latitude, self.longitude = lat, lon
+            self.locked = True
+            self.last_check = now
+        print(
+            f"✓ 고정 설치 위치 확정: lat={lat:.6f}, lon={lon:.6f}"
+            f" (CEP50 {spread:.1f} m, {len(lats)}개 Fix)"
+        )
+        return True
+
+    def sample_count(self) -> int:
+        return len(self._lats)
+
+    # --- Locked operation ---
+    def needs_check(self) -> bool:
+        return self.locked and (
+            self.last_check is None
+            or time.monotonic() - self.last_check >= self.check_interval
+        )
+
+    def check(self, latitude: float, longitude: float) -> bool:
+        """Compare a fresh fix with the lock; False (and unlocked) if the site moved."""
+        self.last_check = time.monotonic()
+        self.last_drift_m = distance_m(
+            self.latitude, self.longitude, latitude, longitude
+        )
+        if self.last_drift_m <= self.drift_limit_m:
+            print(f"  위치 점검: 고정 위치와 편차 {self.last_drift_m:.1f} m")
+            return True
+        print(
+            f"⚠ 설치 위치가 {self.last_drift_m:.0f} m 이동 → 위치 고정 해제, 다시 수집"
+        )
+        self.unlock()
+        return False
+
+    def unlock(self) -> None:
+        with self._lock:
+            self.locked = False
+            self.latitude = self.longitude = self.spread_m = None
+            self._lats.clear()
+            self._lons.clear()
+            self._last_sample = None
+
+    # --- Persistence (through CacheManager) ---
+    def cache_fields(self) -> dict:
+        return {
+            "locked": True,
+            "spread_m": round(self.spread_m, 2),
+            "fixes": len(self._lats),
+        }
+
+    def restore(self, cache: Optional[dict]) -> bool:
+        """Resume a lock saved by a previous run."""
+        if not cache or not cache.get("locked"):
+            return False
+        with self._lock:
+            self.latitude = cache["latitude"]
+            self.longitude = cache["longitude"]
+            self.spread_m = cache.get("spread_m")
+            self.locked = True
+            self.last_check = None  # verify against the GPS once after a restart
+        print(
+            f"✓ 고정 설치 위치 사용 (캐시): lat={self.latitude:.6f}, lon={self.longitude:.6f}"
+        )
+        return True
@@ -0,0 +1,168 @@
+"""Precomputed daily sun-path table for a fixed site.
+
+The tracker site does not move, so instead of evaluating the ephemeris on
+every update we compute one UTC day of positions in a single vectorized pass
+(``solar_position``), persist it next to the GPS cache file and answer
+lookups by linear interpolation between samples. A lookup is a couple of
+float operations on Python lists (a few microseconds); with the default
+60 s step the interpolation error stays below 0.002 degree, and rounding the
+site to ``KEY_PRECISION`` decimals adds at most about 0.01 degree.
+
+``position()`` rebuilds the table when the UTC date rolls over and falls back
+to direct computation (then rebuilds) when the requested location is no
+longer within ``LOCATION_TOLERANCE_DEG`` of the table's site.
+"""
+
+import json
+import math
+import os
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from .solar_position import solar_position, solar_position_at
+except ImportError:
+    # Allow running as a standalone script (no package parent)
+    from solar_position import solar_position, solar_position_at  # type: ignore
+
+DEFAULT_STEP_SECONDS = 60
+KEY_PRECISION = 2  # decimal places of lat/lon used as the table key (~1 km)
+LOCATION_TOLERANCE_DEG = 0.01
+
+
+def default_table_path(cache_file: str) -> str:
+    """Place the table next to the tracker cache file."""
+    return os.path.join(os.path.dirname(cache_file) or ".", "sun_path_cache.json")
+
+
+def _day_start(when: datetime) -> datetime:
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+class SunPathTable:
+    def __init__(
+        self, table_file: Optional[str] = None, step_seconds: int = DEFAULT_STEP_SECONDS
+    ):
+        self.table_file = table_file
+        self.step_seconds = step_seconds
+        self.latitude: Optional[float] = None
+        self.longitude: Optional[float] = None
+        self.date: Optional[str] = None
+        self._t0 = 0.0
+        self._azimuth: list = []
+        self._altitude: list = []
+
+    # --- Table management ---
+    def matches(self, latitude: float, longitude: float) -> bool:
+        return (
+            self.latitude is not None
+            and abs(latitude - self.latitude) <= LOCATION_TOLERANCE_DEG
+            and abs(longitude - self.longitude) <= LOCATION_TOLERANCE_DEG
+        )
+
+    def build(self, latitude: float, longitude: float, when: datetime) -> None:
+        """Compute the full UTC day containing ``when`` for the rounded site."""
+        lat = round(latitude, KEY_PRECISION)
+        lon = round(longitude, KEY_PRECISION)
+        start = _day_start(when)
+        t0 = start.timestamp()
+        stamps = t0 + np.arange(
+            0, 86400 + self.step_seconds, self.step_seconds, dtype=float
+        )
+        azimuth, altitude = solar_position(stamps, lat, lon)
+
+        self.latitude, self.longitude = lat, lon
+        self.date = start.date().isoformat()
+        self._t0 = t0
+        # Unwrap azimuth so interpolation never crosses the 360 -> 0 seam.
+        self._azimuth = np.degrees(np.unwrap(np.radians(azimuth))).tolist()
+        self._altitude = altitude.tolist()
+        print(f"✓ 태양 궤적 테이블 생성 ({self.date}, lat={lat}, lon={lon})")
+        self.save()
+
+    def ensure(self, latitude: float, longitude: float, when: datetime) -> None:
+        """Load or build the table for ``when``'s date if it is not current."""
+        date = _day_start(when).date().isoformat()
+        if self.date == date and self.matches(latitude, longitude):
+            return
+        if self.load() and self.date == date and self.matches(latitude, longitude):
+            return
+        self.build(latitude, longitude, when)
+
+    # --- Persistence ---
+    def save(self) -> None:
+        if not self.table_file:
+            return
+        data = {
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "date": self.date,
+            "t0": self._t0,
+            "step_seconds": self.step_seconds,
+            "azimuth": [round(v, 5) for v in self._azimuth],
+            "altitude": [round(v, 5) for v in self._altitude],
+        }
+        try:
+            with open(self.table_file, "w") as f:
+                json.dump(data, f)
+        except Exception as exc:
+            print(f"⚠ 태양 궤적 테이블 저장 실패: {exc}")
+
+    def load(self) -> bool:
+        if not self.table_file or not os.path.exists(self.table_file):
+            return False
+        try:
+            with open(self.table_file, "r") as f:
+                data = json.load(f)
+            if data["step_seconds"] != self.step_seconds:
+                return False
+            self.latitude = data["latitude"]
+            self.longitude = data["longitude"]
+            self.date = data["date"]
+            self._t0 = data["t0"]
+            self._azimuth = data["azimuth"]
+            self._altitude = data["altitude"]
+            return True
+        except Exception as exc:
+            print(f"⚠ 태양 궤적 테이블 읽기 실패: {exc}")
+            return False
+
+    # --- Lookups ---
+    def lookup(
+        self, latitude: float, longitude: float, when: datetime
+    ) -> Optional[Tuple[float, float]]:
+        """Interpolated ``(azimuth, altitude)`` or None if outside this table."""
+        if not self.matches(latitude, longitude):
+            return None
+        offset = (when.timestamp() - self._t0) / self.step_seconds
+        index = math.floor(offset)
+        if index < 0 or index >= len(self._altitude) - 1:
+            return None
+        frac = offset - index
+        az0, az1 = self._azimuth[index], self._azimuth[index + 1]
+        alt0, alt1 = self._altitude[index], self._altitude[index + 1]
+        return (az0 + (az1 - az0) * frac) % 360.0, alt0 + (alt1 - alt0) * frac
+
+    def position(
+        self, latitude: float, longitude: float, when: datetime
+    ) -> Tuple[float, float]:
+        """Table lookup with midnight rollover and direct-computation fallback."""
+        result = self.lookup(latitude, longitude, when)
+        if result is not None:
+            return result
+        if self.matches(latitude, longitude):
+            # Same site, new day (midnight rollover or startup).
+            self.ensure(latitude, longitude, when)
+            result = self.lookup(latitude, longitude, when)
+            if result is not None:
+                return result
+        # Location changed: answer directly, then rebuild for the new site.
+        result = solar_position_at(latitude, longitude, when)
+        self.ensure(latitude, longitude, when)
+        return result
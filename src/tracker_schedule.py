@@ -0,0 +1,141 @@
+"""Wake-up scheduling for the solar tracker loop.
+
+Instead of polling every ``UPDATE_INTERVAL`` around the clock, the tracker
+asks ``TrackerScheduler`` how long to sleep. During the day the regular
+interval applies; after sunset the panel is parked once and the loop only
+wakes at the (configurable) night cadence for sensor sampling, or straight
+through to shortly before the next sunrise when night sampling is disabled.
+
+With a correction threshold configured, daytime wake-ups are not fixed
+either: ``plan_correction`` predicts when the sun's servo-space position will
+drift more than the threshold away from the current servo angles and the
+loop sleeps until exactly then (capped by ``max_interval``). With a daily
+move plan (``move_plan``) the loop sleeps until the next planned move
+instead (``follow_plan``).
+"""
+
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .solar_position import solar_position, sun_events
+except ImportError:
+    # Allow running as a standalone script (no package parent)
+    from solar_position import solar_position, sun_events  # type: ignore
+
+DEFAULT_NIGHT_INTERVAL = 1800  # seconds between night-time sensor samples (0 = none)
+DEFAULT_DAWN_LEAD = 600  # wake this many seconds before sunrise
+DEFAULT_MAX_INTERVAL = 1800  # longest daytime sleep even if the sun barely moves
+MIN_CORRECTION_DELAY = 5.0
+PREDICTION_STEP = 30  # seconds between predicted sun positions
+
+
+class TrackerScheduler:
+    def __init__(
+        self,
+        day_interval: float,
+        night_interval: float = DEFAULT_NIGHT_INTERVAL,
+        dawn_lead: float = DEFAULT_DAWN_LEAD,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+    ):
+        self.day_interval = day_interval
+        self.night_interval = night_interval
+        self.dawn_lead = dawn_lead
+        self.next_sunrise: Optional[datetime] = None
+        self.next_sunset: Optional[datetime] = None
+        self.max_interval = max_interval
+        self.correction_delay: Optional[float] = None
+
+    def refresh_events(self, latitude: float, longitude: float, now: datetime) -> None:
+        """Recompute sunrise/sunset once the cached sunrise has passed."""
+        if self.next_sunrise is not None and self.next_sunrise > now:
+            return
+        self.next_sunrise, self.next_sunset = sun_events(latitude, longitude, now)
+        if self.next_sunrise is not None:
+            print(
+                f"  다음 일출(UTC): {self.next_sunrise.isoformat(timespec='seconds')}"
+            )
+
+    def wake_time(self) -> Optional[datetime]:
+        if self.next_sunrise is None:
+            return None
+        return self.next_sunrise - timedelta(seconds=self.dawn_lead)
+
+    def night_delay(self, now: datetime) -> float:
+        """Seconds to sleep during the night (bounded by the pre-dawn wake-up)."""
+        wake = self.wake_time()
+        if wake is None:
+            # Polar night or unknown sunrise: fall back to the night cadence.
+            return self.night_interval or self.day_interval
+        until_dawn = (wake - now).total_seconds()
+        if until_dawn <= 0:
+            return self.day_interval
+        if self.night_interval > 0:
+            return min(self.night_interval, until_dawn)
+        return until_dawn
+
+    def plan_correction(
+        self,
+        latitude: float,
+        longitude: float,
+        now: datetime,
+        current: Tuple[float, float],
+        to_servo: Callable[[float, float], Tuple[float, float]],
+        threshold: float,
+    ) -> float:
+        """Predict when the servo-space sun leaves ``threshold`` of ``current``.
+
+        Sun positions for the next ``max_interval`` seconds come from one
+        vectorized ephemeris call and the crossing is interpolated between
+        samples. Sunset also ends the window so the night logic takes over.
+        """
+        offsets = np.arange(
+            0, self.max_interval + PREDICTION_STEP, PREDICTION_STEP, dtype=float
+        )
+        azimuth, altitude = solar_position(
+            now.timestamp() + offsets, latitude, longitude
+        )
+        cur_az, cur_alt = current
+
+        delay = float(self.max_interval)
+        prev_offset, prev_dev = 0.0, None
+        for offset, az, alt in zip(
+            offsets.tolist(), azimuth.tolist(), altitude.tolist()
+        ):
+            if alt <= 0:
+                delay = offset
+                break
+            servo_az, servo_alt = to_servo(az, alt)
+            deviation = max(abs(servo_az - cur_az), abs(servo_alt - cur_alt))
+            if deviation > threshold:
+                if prev_dev is None:
+                    delay = 0.0
+                else:
+                    frac = (threshold - prev_dev) / (deviation - prev_dev)
+                    delay = prev_offset + frac * (offset - prev_offset)
+                break
+            prev_offset, prev_dev = offset, deviation
+
+        self.correction_delay = max(MIN_CORRECTION_DELAY, min(delay, self.max_interval))
+        return self.correction_delay
+
+    def follow_plan(self, plan, now: datetime) -> float:
+        """Sleep until the plan's next move or its end, at most ``max_interval``."""
+        when = now.timestamp()
+        target = plan.next_time(when)
+        if target is None:
+            target = plan.end
+        delay = target - when
+        self.correction_delay = max(MIN_CORRECTION_DELAY, min(delay, self.max_interval))
+        return self.correction_delay
+
+    def next_delay(self, now: datetime, night: bool) -> float:
+        if night:
+            self.correction_delay = None
+            return self.night_delay(now)
+        if self.correction_delay is not None:
+            delay, self.correction_delay = self.correction_delay, None
+            return delay
+        return self.day_interval